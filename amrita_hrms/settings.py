@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -17,14 +18,18 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'hospital_hr',
+    'hrms',
 ]
 
 MIDDLEWARE = [
+    'hospital_hr.middleware.QueryProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'hospital_hr.middleware.PrincipalMiddleware',
+    'hospital_hr.middleware.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -42,6 +47,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'hospital_hr.context_processors.query_profile',
             ],
         },
     },
@@ -56,6 +62,35 @@ DATABASES = {
     }
 }
 
+# Use a shared cache in production so invalidation reaches every process: set
+# CACHE_URL (e.g. redis://127.0.0.1:6379/1, needs the redis package). Without it
+# each process has its own local-memory cache.
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'amrita-hrms',
+            # The default of 300 culls invalidation keys (e.g. principal:generation) under load
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Public careers pages (see hospital_hr/page_cache.py)
+CAREERS_CACHE_TIMEOUT = 300
+CAREERS_STATE_CACHE_TIMEOUT = 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -88,6 +123,14 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Stream every upload to disk and enforce limits while the body is read (hospital_hr/uploads.py)
+FILE_UPLOAD_HANDLERS = ['hospital_hr.uploads.LimitedTemporaryFileUploadHandler']
+UPLOAD_LIMITS = {
+    'resume': {'max_size': 5 * 1024 * 1024, 'extensions': ['pdf', 'doc', 'docx']},
+    'employee_file': {'max_size': 20 * 1024 * 1024, 'extensions': ['csv', 'xlsx']},
+    'default': {'max_size': 10 * 1024 * 1024},
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = 'hospital_hr:login'
@@ -96,7 +139,74 @@ LOGOUT_REDIRECT_URL = 'hospital_hr:landing'
 
 AUTH_USER_MODEL = 'hospital_hr.User'
 
+# Flash messages travel in a signed cookie. With a shared cache (CACHE_URL),
+# sessions and the logged-in user are also served from it without touching the
+# database on most requests (see hospital_hr/session_auth.py). They rely on the
+# cache being invalidated on logout, password change and deactivation, so with
+# per-process local-memory caches they stay on the database: otherwise a session
+# logged out in one worker would stay valid in the others until it expires.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+if SHARED_CACHE:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    AUTHENTICATION_BACKENDS = ['hospital_hr.session_auth.CachedModelBackend']
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+AUTH_USER_CACHE_TIMEOUT = 300
+
 # Groq API Configuration (for AI Assistant)
 # Set your Groq API key as environment variable GROQ_API_KEY
 import os
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
+
+TESTING = 'test' in sys.argv or 'pytest' in sys.modules
+
+# Query profiling (see hospital_hr/middleware.py and decorators.query_budget);
+# off under the test runner, where it would log a line for every request
+QUERY_PROFILING_ENABLED = DEBUG and not TESTING
+# Views that exceed their @query_budget raise during tests, and only log elsewhere
+QUERY_BUDGET_STRICT = TESTING
+
+# Seconds between in-process employee status transition runs (see
+# hospital_hr/status_scheduler.py); None leaves it to the
+# apply_status_transitions command
+STATUS_SCHEDULER_INTERVAL = None
+
+# Seconds a user's resolved role/department scope stays cached (see hospital_hr/principal.py)
+PRINCIPAL_CACHE_TIMEOUT = 300
+
+# Audit log retention (see hospital_hr/audit.py and the compact_audit_log command)
+AUDIT_LOG = {
+    'retention_days': 730,
+    'compact_after_days': 90,
+}
+
+# Online SQLite backups (see hospital_hr/db_backup.py and the backup_database command)
+DATABASE_BACKUPS = {
+    'directory': BASE_DIR / 'backups',
+    'keep_daily': 7,
+    'keep_weekly': 4,
+    'keep_monthly': 6,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'hospital_hr.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO' if DEBUG and not TESTING else 'WARNING',
+            'propagate': False,
+        },
+        'hospital_hr.status_scheduler': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Department, Employee, Job, Application, LeaveRequest, Attendance
+from .models import (
+    User, Department, Employee, Job, Application, LeaveRequest, Attendance, Holiday,
+    LeaveLedger, LeaveBalance, ShiftAssignment, ShiftDefinition, PayrollRun, Payslip,
+)
 
 
 @admin.register(User)
@@ -171,12 +174,97 @@ class LeaveRequestAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(LeaveLedger)
+class LeaveLedgerAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'employee', 'leave_type', 'entry_type', 'days', 'reference']
+    list_filter = ['entry_type', 'leave_type', 'created_at']
+    search_fields = ['employee__employee_id', 'employee__user__first_name', 'employee__user__last_name', 'reference']
+    list_select_related = ['employee']
+    raw_id_fields = ['employee', 'leave_request']
+    
+    # Entries are posted through hospital_hr.leave_ledger so balances stay in step
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LeaveBalance)
+class LeaveBalanceAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'leave_type', 'accrued', 'consumed', 'balance', 'updated_at']
+    list_filter = ['leave_type']
+    search_fields = ['employee__employee_id', 'employee__user__first_name', 'employee__user__last_name']
+    list_select_related = ['employee']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PayrollRun)
+class PayrollRunAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'employee_count', 'total_gross', 'total_deductions', 'total_net', 'created_by', 'created_at']
+    list_filter = ['status', 'year']
+    
+    # Runs are produced by hospital_hr.payroll (run_payroll command)
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Payslip)
+class PayslipAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'run', 'department', 'payable_days', 'gross_pay', 'deductions', 'net_pay']
+    list_filter = ['run', 'department']
+    search_fields = ['employee__employee_id', 'employee__user__first_name', 'employee__user__last_name']
+    list_select_related = ['employee__user', 'run', 'department']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ['date', 'name', 'department']
+    list_filter = ['department', 'date']
+    search_fields = ['name']
+    date_hierarchy = 'date'
+
+
+@admin.register(ShiftAssignment)
+class ShiftAssignmentAdmin(admin.ModelAdmin):
+    list_display = ['date', 'employee', 'department', 'shift', 'source']
+    list_filter = ['shift', 'source', 'department', 'date']
+    search_fields = ['employee__employee_id', 'employee__user__first_name', 'employee__user__last_name']
+    list_select_related = ['employee__user', 'department']
+    raw_id_fields = ['employee']
+    date_hierarchy = 'date'
+
+
+@admin.register(ShiftDefinition)
+class ShiftDefinitionAdmin(admin.ModelAdmin):
+    list_display = ['code', 'start_time', 'end_time', 'crosses_midnight', 'grace_minutes', 'half_day_minutes', 'is_active']
+    list_filter = ['is_active']
+    readonly_fields = ['crosses_midnight', 'updated_at']
+
+
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
-    list_display = ['date', 'employee', 'department', 'shift', 'status', 'check_in_time', 'check_out_time', 'marked_by']
+    list_display = ['date', 'employee', 'department', 'shift', 'status', 'check_in_time', 'check_out_time', 'late_minutes', 'marked_by']
     list_filter = ['status', 'shift', 'department', 'date']
     search_fields = ['employee__user__first_name', 'employee__user__last_name', 'employee__employee_id']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['late_minutes', 'early_leave_minutes', 'overtime_minutes', 'created_at', 'updated_at']
     date_hierarchy = 'date'
     
     fieldsets = (
@@ -186,6 +274,9 @@ class AttendanceAdmin(admin.ModelAdmin):
         ('Attendance Details', {
             'fields': ('shift', 'status', 'check_in_time', 'check_out_time'),
         }),
+        ('Shift Compliance', {
+            'fields': ('late_minutes', 'early_leave_minutes', 'overtime_minutes'),
+        }),
         ('Additional Info', {
             'fields': ('notes', 'marked_by'),
         }),
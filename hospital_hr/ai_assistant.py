@@ -9,7 +9,8 @@ from datetime import date, datetime, timedelta
 from django.db.models import Count, Q, Avg, Sum
 from django.conf import settings
 
-from .models import Employee, Department, Attendance, LeaveRequest, Job, Application
+from .models import Employee, Department, Attendance, LeaveRequest, LeaveBalance, LeaveDay, Job, Application
+from .leave_calendar import leave_days_on
 
 
 class HRQueryProcessor:
@@ -20,6 +21,10 @@ class HRQueryProcessor:
     
     # Query patterns to identify intent
     QUERY_PATTERNS = {
+        'leave_balance': [
+            r'leave balance', r'balance.*leave', r'days left',
+            r'remaining leave', r'leaves? remaining'
+        ],
         'leave_today': [
             r'on leave today', r'leave today', r'employees.*leave.*today',
             r'who.*on leave', r'how many.*leave'
@@ -106,7 +111,9 @@ class HRQueryProcessor:
     def _fetch_data(self, query_type: str, query: str) -> dict:
         """Fetch relevant data from database based on query type."""
         
-        if query_type == 'leave_today':
+        if query_type == 'leave_balance':
+            return self._get_leave_balance(query)
+        elif query_type == 'leave_today':
             return self._get_leave_today_data()
         elif query_type == 'absent_today':
             return self._get_absent_today_data()
@@ -135,19 +142,16 @@ class HRQueryProcessor:
     
     def _get_leave_today_data(self) -> dict:
         """Get employees on leave today."""
-        leaves = LeaveRequest.objects.filter(
-            status='approved',
-            start_date__lte=self.today,
-            end_date__gte=self.today
-        ).select_related('employee', 'employee__department', 'employee__user')
+        leave_days = leave_days_on(self.today)
         
         leave_list = []
-        for leave in leaves:
+        for leave_day in leave_days:
+            leave = leave_day.leave_request
             leave_list.append({
-                'employee_name': leave.employee.get_full_name(),
-                'employee_id': leave.employee.employee_id,
-                'department': leave.employee.department.name if leave.employee.department else 'N/A',
-                'leave_type': leave.get_leave_type_display(),
+                'employee_name': leave_day.employee.get_full_name(),
+                'employee_id': leave_day.employee.employee_id,
+                'department': leave_day.employee.department.name if leave_day.employee.department else 'N/A',
+                'leave_type': leave_day.get_leave_type_display(),
                 'start_date': leave.start_date.strftime('%Y-%m-%d'),
                 'end_date': leave.end_date.strftime('%Y-%m-%d'),
             })
@@ -155,7 +159,8 @@ class HRQueryProcessor:
         return {
             'type': 'leave_today',
             'date': self.today.strftime('%Y-%m-%d'),
-            'total_on_leave': len(leave_list),
+            # Distinct employees: one employee can have overlapping approved leaves
+            'total_on_leave': len({leave_day.employee_id for leave_day in leave_days}),
             'employees': leave_list
         }
     
@@ -432,6 +437,52 @@ class HRQueryProcessor:
             'available_departments': [d.name for d in departments]
         }
     
+    def _get_leave_balance(self, query: str) -> dict:
+        """Get leave balances from the materialized LeaveBalance table."""
+        employee = None
+        for token in re.findall(r'\b[a-z]+\d+\b', query):
+            employee = Employee.objects.filter(employee_id__iexact=token).select_related('user').first()
+            if employee:
+                break
+        if employee is None and re.search(r'\bmy\b|\bi\b', query):
+            employee = Employee.objects.filter(user=self.user).select_related('user').first()
+        
+        if employee:
+            balances = LeaveBalance.objects.filter(employee=employee)
+            return {
+                'type': 'leave_balance',
+                'employee': employee.get_full_name(),
+                'employee_id': employee.employee_id,
+                'balances': [
+                    {
+                        'leave_type': balance.get_leave_type_display(),
+                        'accrued': float(balance.accrued),
+                        'consumed': float(balance.consumed),
+                        'balance': float(balance.balance),
+                    }
+                    for balance in balances
+                ],
+            }
+        
+        by_type = LeaveBalance.objects.values('leave_type').annotate(
+            employees=Count('id'),
+            total_balance=Sum('balance'),
+            average_balance=Avg('balance'),
+        ).order_by('leave_type')
+        leave_types = dict(LeaveRequest.LEAVE_TYPE_CHOICES)
+        return {
+            'type': 'leave_balance',
+            'summary': [
+                {
+                    'leave_type': leave_types.get(row['leave_type'], row['leave_type']),
+                    'employees': row['employees'],
+                    'total_balance': float(row['total_balance'] or 0),
+                    'average_balance': round(float(row['average_balance'] or 0), 2),
+                }
+                for row in by_type
+            ],
+        }
+    
     def _get_nursing_staff(self) -> dict:
         """Get nursing staff information."""
         nurses = Employee.objects.filter(
@@ -542,11 +593,7 @@ class HRQueryProcessor:
                 'pending': LeaveRequest.objects.filter(status='pending').count(),
                 'approved': LeaveRequest.objects.filter(status='approved').count(),
                 'rejected': LeaveRequest.objects.filter(status='rejected').count(),
-                'on_leave_today': LeaveRequest.objects.filter(
-                    status='approved',
-                    start_date__lte=self.today,
-                    end_date__gte=self.today
-                ).count(),
+                'on_leave_today': LeaveDay.objects.filter(date=self.today).values('employee_id').distinct().count(),
             },
             'recruitment': {
                 'open_positions': Job.objects.filter(status='open').count(),
@@ -638,7 +685,21 @@ Please provide a helpful, accurate response based ONLY on the above data."""
         """
         context_type = context.get('type', 'general')
         
-        if context_type == 'leave_today':
+        if context_type == 'leave_balance':
+            if context.get('employee'):
+                response = f"**Leave balance for {context['employee']}** ({context['employee_id']}):\n\n"
+                if not context.get('balances'):
+                    return response + "No leave balance recorded yet."
+                for balance in context['balances']:
+                    response += f"- {balance['leave_type']}: **{balance['balance']:g}** days ({balance['accrued']:g} accrued, {balance['consumed']:g} used)\n"
+                return response
+            
+            response = "**Leave Balances (all employees):**\n\n"
+            for row in context.get('summary', []):
+                response += f"- {row['leave_type']}: average **{row['average_balance']:g}** days across {row['employees']} employees\n"
+            return response
+        
+        elif context_type == 'leave_today':
             total = context.get('total_on_leave', 0)
             employees = context.get('employees', [])
             if total == 0:
@@ -1,3 +1,6 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
@@ -7,3 +10,17 @@ class HospitalHrConfig(AppConfig):
     
     def ready(self):
         import hospital_hr.signals
+        
+        if self._is_serving_process():
+            from .status_scheduler import start_ticker
+            start_ticker()
+    
+    @staticmethod
+    def _is_serving_process():
+        # Only run the status ticker where requests are served, not in migrate,
+        # shell or other management commands (nor in runserver's reloader parent)
+        if not sys.argv[0].endswith('manage.py'):
+            return True
+        if sys.argv[1:2] != ['runserver']:
+            return False
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
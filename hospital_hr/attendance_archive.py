@@ -0,0 +1,152 @@
+"""
+Yearly attendance archive for Amrita Hospital HRMS
+
+Attendance grows by headcount x 365 rows a year. Closed years are moved out of
+the live table into ArchivedAttendance (same columns, same ids) with one
+INSERT ... SELECT and one DELETE, so day-to-day queries only scan the open
+years. Each archived year has an AttendanceArchive row holding its row count
+and a sha256 checksum of its rows in id order. The checksum is compared before
+the live rows are deleted, and `verify` recomputes it at any time.
+
+Reports, exports and payroll read through attendance_sources(), which adds the
+archive only when the requested range reaches an archived year. Archiving is
+not a delete: no signals fire, so the change feed, audit log and live boards
+are untouched.
+
+Attendance can still be written for an archived date (a late correction, a
+check-in, a generator run). Such a live row is newer than its archived
+counterpart for the same (employee, date), so it wins everywhere: reports
+skip the archived row, archiving the year again replaces it, and restoring
+the year keeps the live row.
+
+Run from `manage.py archive_attendance`.
+"""
+
+import hashlib
+import heapq
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ArchivedAttendance, Attendance, AttendanceArchive
+
+
+FIELDS = [field.attname for field in ArchivedAttendance._meta.concrete_fields]
+COLUMNS = [field.column for field in ArchivedAttendance._meta.concrete_fields]
+
+
+def _year_range(year):
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _rows(queryset):
+    return queryset.order_by('id').values_list(*FIELDS).iterator(chunk_size=5000)
+
+
+def checksum(rows):
+    """sha256 hex digest of value tuples (already in id order)."""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update('\x1f'.join('' if value is None else str(value) for value in row).encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def archived_years():
+    return set(AttendanceArchive.objects.values_list('year', flat=True))
+
+
+def _superseded():
+    """Matches archived rows that have a live row for the same employee and date."""
+    return Exists(Attendance.objects.filter(employee_id=OuterRef('employee_id'), date=OuterRef('date')))
+
+
+def attendance_sources(start, end):
+    """
+    Querysets covering the dates start..end, oldest first: ArchivedAttendance
+    when the range reaches an archived year, then Attendance. Archived rows
+    superseded by a live row are left out, so no day is counted twice. Archived
+    years are always closed years, so ranges within the current year cost no lookup.
+    """
+    live = Attendance.objects.filter(date__gte=start, date__lte=end)
+    if start.year >= timezone.localdate().year:
+        return [live]
+    if not any(start.year <= year <= end.year for year in archived_years()):
+        return [live]
+    archived = ArchivedAttendance.objects.filter(date__gte=start, date__lte=end).exclude(_superseded())
+    return [archived, live]
+
+
+def _move(source, target, start, end):
+    table = connection.ops.quote_name
+    columns = ', '.join(table(column) for column in COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table(target._meta.db_table)} ({columns}) '
+            f'SELECT {columns} FROM {table(source._meta.db_table)} WHERE date >= %s AND date <= %s',
+            [start, end],
+        )
+        # A raw DELETE on purpose: archiving must not look like deletion to the signal handlers
+        cursor.execute(f'DELETE FROM {table(source._meta.db_table)} WHERE date >= %s AND date <= %s', [start, end])
+        return cursor.rowcount
+
+
+@transaction.atomic
+def archive_year(year):
+    """
+    Move the attendance of a closed `year` into the archive. Returns its
+    AttendanceArchive. Raises ValueError for open years or a checksum mismatch.
+    """
+    if year >= timezone.localdate().year:
+        raise ValueError(f'{year} is not closed yet; only past years can be archived.')
+    start, end = _year_range(year)
+    live = Attendance.objects.filter(date__gte=start, date__lte=end)
+    archived = ArchivedAttendance.objects.filter(date__gte=start, date__lte=end)
+
+    # Live rows written after an earlier run replace their archived version
+    archived.filter(_superseded()).delete()
+    # Rows already archived (from an earlier run) and the live rows, merged in id order
+    expected = checksum(heapq.merge(_rows(archived), _rows(live), key=lambda row: row[0]))
+    moved = _move(Attendance, ArchivedAttendance, start, end)
+    actual = checksum(_rows(archived))
+    if actual != expected:
+        raise ValueError(f'Checksum mismatch while archiving {year}; nothing was moved.')
+
+    archive, _ = AttendanceArchive.objects.update_or_create(year=year, defaults={
+        'row_count': archived.count(),
+        'checksum': actual,
+        'archived_at': timezone.now(),
+        'verified_at': timezone.now(),
+    })
+    archive.moved = moved
+    return archive
+
+
+def verify(year):
+    """Recompute the checksum of an archived year. Returns (ok, archive); raises ValueError if not archived."""
+    archive = AttendanceArchive.objects.filter(year=year).first()
+    if archive is None:
+        raise ValueError(f'{year} is not archived.')
+    start, end = _year_range(year)
+    archived = ArchivedAttendance.objects.filter(date__gte=start, date__lte=end)
+    ok = checksum(_rows(archived)) == archive.checksum and archived.count() == archive.row_count
+    if ok:
+        archive.verified_at = timezone.now()
+        archive.save(update_fields=['verified_at'])
+    return ok, archive
+
+
+@transaction.atomic
+def restore_year(year):
+    """Move an archived year back into the live table. Returns the number of rows restored."""
+    ok, archive = verify(year)
+    if not ok:
+        raise ValueError(f'The archive of {year} does not match its checksum; restore it from a backup.')
+    start, end = _year_range(year)
+    # Live rows written since archiving are newer than the archived ones they collide with
+    ArchivedAttendance.objects.filter(date__gte=start, date__lte=end).filter(_superseded()).delete()
+    restored = _move(ArchivedAttendance, Attendance, start, end)
+    archive.delete()
+    return restored
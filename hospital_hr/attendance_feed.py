@@ -0,0 +1,149 @@
+"""
+Live attendance feed for Amrita Hospital HRMS
+
+Every Attendance change is appended to AttendanceEvent (from the model signals,
+or explicitly by bulk writers). Live boards subscribe to a server-sent events
+stream that replays events after a cursor (the browser's Last-Event-ID) and then
+follows new ones, so pages patch their rows in place instead of reloading.
+
+New events wake waiting streams through the in-process broker; the event table
+itself is the source of truth, so streams in other processes still catch up on
+their next poll.
+"""
+
+import json
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Attendance, AttendanceEvent
+from .pubsub import broker
+
+
+TOPIC = 'attendance'
+
+STATUS_LABELS = dict(Attendance.STATUS_CHOICES)
+SHIFT_LABELS = dict(Attendance.SHIFT_CHOICES)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _event_for(attendance, deleted=False):
+    return AttendanceEvent(
+        employee_id=attendance.employee_id,
+        department_id=attendance.department_id,
+        date=attendance.date,
+        status='' if deleted else attendance.status,
+        shift='' if deleted else attendance.shift,
+        check_in_time=None if deleted else attendance.check_in_time,
+        check_out_time=None if deleted else attendance.check_out_time,
+        deleted=deleted,
+    )
+
+
+def record_changes(attendances, deleted=False):
+    """Append change events for the given Attendance rows and wake live streams."""
+    events = AttendanceEvent.objects.bulk_create([_event_for(attendance, deleted) for attendance in attendances])
+    if events:
+        broker.publish(TOPIC, events[-1].pk)
+    return events
+
+
+def latest_cursor():
+    return AttendanceEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def events_after(cursor, day, department_id=None, limit=500):
+    events = AttendanceEvent.objects.filter(id__gt=cursor, date=day)
+    if department_id:
+        events = events.filter(department_id=department_id)
+    return list(events.order_by('id')[:limit])
+
+
+def serialize(event):
+    return {
+        'cursor': event.pk,
+        'employee_id': event.employee_id,
+        'department_id': event.department_id,
+        'date': event.date.isoformat(),
+        'status': event.status,
+        'status_display': STATUS_LABELS.get(event.status, ''),
+        'shift': event.shift,
+        'shift_display': SHIFT_LABELS.get(event.shift, ''),
+        'check_in': event.check_in_time.strftime('%H:%M') if event.check_in_time else None,
+        'check_out': event.check_out_time.strftime('%H:%M') if event.check_out_time else None,
+        'deleted': event.deleted,
+    }
+
+
+def format_sse(event):
+    return f"id: {event.pk}\nevent: attendance\ndata: {json.dumps(serialize(event))}\n\n"
+
+
+def prune_events(days=7):
+    """Drop change events older than `days`; boards only ever replay recent ones."""
+    deleted, _ = AttendanceEvent.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
+
+
+class AttendanceStream:
+    """
+    One client's SSE stream for a date (and optionally a department), starting
+    after `cursor`. Iterate it synchronously under WSGI or asynchronously under
+    ASGI; either way it ends after SSE_STREAM_MAX_SECONDS and the browser
+    reconnects with Last-Event-ID.
+    """
+
+    def __init__(self, day, department_id=None, cursor=None):
+        self.day = day
+        self.department_id = department_id
+        self.cursor = latest_cursor() if cursor is None else cursor
+        self.poll_interval = _setting('SSE_POLL_INTERVAL', 2)
+        self.heartbeat = _setting('SSE_HEARTBEAT_SECONDS', 15)
+        self.max_seconds = _setting('SSE_STREAM_MAX_SECONDS', 300)
+
+    def _drain(self):
+        chunks = []
+        while True:
+            events = events_after(self.cursor, self.day, self.department_id)
+            if not events:
+                return chunks
+            chunks.extend(format_sse(event) for event in events)
+            self.cursor = events[-1].pk
+
+    def __iter__(self):
+        deadline = time.monotonic() + self.max_seconds
+        last_sent = time.monotonic()
+        yield 'retry: 3000\n\n'
+        with broker.subscribe(TOPIC, maxsize=1) as subscription:
+            while time.monotonic() < deadline:
+                chunks = self._drain()
+                if chunks:
+                    yield ''.join(chunks)
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= self.heartbeat:
+                    yield ': keep-alive\n\n'
+                    last_sent = time.monotonic()
+                subscription.get(timeout=self.poll_interval)
+
+    async def __aiter__(self):
+        deadline = time.monotonic() + self.max_seconds
+        last_sent = time.monotonic()
+        drain = sync_to_async(self._drain)
+        yield 'retry: 3000\n\n'
+        with broker.subscribe(TOPIC, maxsize=1) as subscription:
+            wait = sync_to_async(subscription.get, thread_sensitive=False)
+            while time.monotonic() < deadline:
+                chunks = await drain()
+                if chunks:
+                    yield ''.join(chunks)
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= self.heartbeat:
+                    yield ': keep-alive\n\n'
+                    last_sent = time.monotonic()
+                await wait(timeout=self.poll_interval)
@@ -0,0 +1,195 @@
+"""
+Audit log for Amrita Hospital HRMS
+
+Field-level history of sensitive HR records: employee pay and placement,
+leave decisions and attendance corrections. Instances keep the values they
+were loaded with (models.AuditedModel.from_db); post_save and post_delete
+compare against them and record {field: [old, new]} for what changed. The
+comparison only happens on save, so loading rows that are never saved (exports,
+reports) pays nothing for it.
+
+Records are not written one INSERT at a time. Inside a request they collect in
+a per-request buffer that AuditMiddleware flushes with a single bulk_create
+when the response is ready, stamped with the requesting user and path.
+Commands can use audit_context() the same way; outside either, records are
+written as they come. Records are queued on transaction commit, so changes
+that roll back leave no trace.
+
+Only save() and delete() are seen. Bulk writers that change audited fields
+(e.g. leave_decisions.decide_leaves) call capture() for each instance.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, AuditLog, Employee, LeaveRequest
+
+
+DEFAULT_AUDIT_LOG = {
+    # Records older than this are deleted by compact_audit_log
+    'retention_days': 730,
+    # Updates older than this are merged into one record per object, user and day
+    'compact_after_days': 90,
+}
+
+AUDITED_FIELDS = {
+    Employee: (
+        'department', 'category', 'designation', 'shift', 'salary', 'status', 'date_of_joining',
+    ),
+    LeaveRequest: (
+        'leave_type', 'start_date', 'end_date', 'total_days', 'status', 'approved_by', 'approval_date',
+        'rejection_reason',
+    ),
+    Attendance: (
+        'shift', 'status', 'check_in_time', 'check_out_time', 'notes', 'marked_by',
+    ),
+}
+
+# Model -> [(field name, attribute name)]; foreign keys are recorded by id
+_ATTNAMES = {
+    model: [(name, model._meta.get_field(name).attname) for name in fields]
+    for model, fields in AUDITED_FIELDS.items()
+}
+
+_MISSING = object()
+
+_buffer = contextvars.ContextVar('audit_buffer', default=None)
+
+
+def audit_settings():
+    return {**DEFAULT_AUDIT_LOG, **getattr(settings, 'AUDIT_LOG', {})}
+
+
+def _values(instance):
+    # Read __dict__ directly so deferred fields are skipped rather than fetched
+    state = instance.__dict__
+    return {name: state.get(attname, _MISSING) for name, attname in _ATTNAMES[type(instance)]}
+
+
+def snapshot(instance):
+    """Remember the audited values of a just saved instance."""
+    instance._audit_snapshot = _values(instance)
+
+
+def _previous(instance):
+    """Audited values as of the last save, or else as loaded from the database."""
+    state = instance.__dict__
+    if '_audit_snapshot' in state:
+        return state['_audit_snapshot']
+    if '_loaded_values' not in state:
+        return {}
+    loaded = dict(zip(*state['_loaded_values']))
+    return {name: loaded.get(attname, _MISSING) for name, attname in _ATTNAMES[type(instance)]}
+
+
+def capture(instance, action='update'):
+    """Record what changed on `instance` since its snapshot; a no-op when nothing did."""
+    current = _values(instance)
+    if action == 'create':
+        changes = {name: [None, new] for name, new in current.items() if new is not _MISSING and new not in (None, '')}
+    elif action == 'delete':
+        changes = {name: [old, None] for name, old in current.items() if old is not _MISSING}
+    else:
+        previous = _previous(instance)
+        changes = {
+            name: [previous[name], new]
+            for name, new in current.items()
+            if new is not _MISSING and previous.get(name, _MISSING) is not _MISSING and previous[name] != new
+        }
+        if not changes:
+            return
+    snapshot(instance)
+
+    record = AuditLog(
+        model=instance._meta.model_name,
+        object_id=instance.pk,
+        action=action,
+        changes=changes,
+        timestamp=timezone.now(),
+    )
+    transaction.on_commit(lambda: _enqueue(record))
+
+
+def _enqueue(record):
+    buffer = _buffer.get()
+    if buffer is None:
+        AuditLog.objects.bulk_create([record])
+    else:
+        buffer.append(record)
+
+
+def flush(records, user=None, path=''):
+    """Write buffered records with one bulk_create."""
+    if not records:
+        return
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    for record in records:
+        record.user_id = user_id
+        record.path = path[:255]
+    AuditLog.objects.bulk_create(records, batch_size=500)
+
+
+@contextmanager
+def audit_context(user=None, path=''):
+    """Buffer the audit records of a block and write them together at its end."""
+    records = []
+    token = _buffer.set(records)
+    try:
+        yield records
+    finally:
+        _buffer.reset(token)
+        flush(records, user, path)
+
+
+def compact(retention_days=None, compact_after_days=None, now=None):
+    """
+    Delete records past the retention period, and merge older updates into one
+    record per object, user and day (first old value, last new value per field).
+    A day whose changes cancel out leaves no record. The periods default to settings.AUDIT_LOG. Returns (records deleted, records merged away).
+    """
+    options = audit_settings()
+    retention_days = retention_days or options['retention_days']
+    compact_after_days = compact_after_days or options['compact_after_days']
+    now = now or timezone.now()
+    deleted, _ = AuditLog.objects.filter(timestamp__lt=now - timedelta(days=retention_days)).delete()
+
+    updates = AuditLog.objects.filter(
+        action='update', timestamp__lt=now - timedelta(days=compact_after_days)
+    ).order_by('model', 'object_id', 'timestamp', 'id')
+    merged, redundant, group, key = [], [], [], None
+    for record in updates.iterator(chunk_size=2000):
+        record_key = (record.model, record.object_id, record.user_id, timezone.localdate(record.timestamp))
+        if record_key != key and group:
+            _merge(group, merged, redundant)
+            group = []
+        key = record_key
+        group.append(record)
+    if group:
+        _merge(group, merged, redundant)
+
+    with transaction.atomic():
+        AuditLog.objects.bulk_update(merged, ['changes'], batch_size=500)
+        for offset in range(0, len(redundant), 900):
+            AuditLog.objects.filter(id__in=redundant[offset:offset + 900]).delete()
+    return deleted, len(redundant)
+
+
+def _merge(group, merged, redundant):
+    if len(group) == 1:
+        return
+    changes = {}
+    for record in group:
+        for field, (old, new) in record.changes.items():
+            changes[field] = [changes[field][0] if field in changes else old, new]
+    last = group[-1]
+    last.changes = {field: values for field, values in changes.items() if values[0] != values[1]}
+    if last.changes:
+        merged.append(last)
+        redundant.extend(record.pk for record in group[:-1])
+    else:
+        redundant.extend(record.pk for record in group)
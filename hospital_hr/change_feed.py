@@ -0,0 +1,152 @@
+"""
+Incremental change feed for Amrita Hospital HRMS
+
+Downstream systems (payroll, badge access, the canteen) poll
+/api/changes/<entity>/?cursor=... and get the rows of one entity changed since
+their cursor, oldest first, plus the ids deleted since then:
+
+    {"changes": [...], "deleted": [{"id": 7, "deleted_at": "..."}],
+     "cursor": "...", "has_more": false}
+
+Rows are paged by the (updated_at, id) keyset and deletes by the
+(deleted_at, id) keyset of Tombstone rows written by the post_delete signals.
+Both sides are index range scans, so an idle poll costs two cheap queries.
+The cursor is opaque to clients: they store the one they were given and send
+it back. An empty cursor starts from the beginning.
+
+Rows changed within the last few seconds (settings.CHANGE_FEED['lag_seconds'])
+are held back until the next poll: a transaction that set updated_at before
+the previous page was read, but committed after it, would otherwise be skipped
+for good. Writers that bypass save() (queryset updates, bulk_update) must set
+updated_at themselves for their rows to appear.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Application, Attendance, Department, Employee, LeaveRequest, Tombstone
+
+
+DEFAULT_CHANGE_FEED = {
+    'lag_seconds': 2,
+    'page_size': 500,
+    'max_page_size': 2000,
+}
+
+# Entity name -> (model, fields returned for each changed row)
+ENTITIES = {
+    'departments': (Department, (
+        'id', 'name', 'code', 'location', 'head_id', 'phone', 'email', 'total_beds', 'is_active',
+        'created_at', 'updated_at',
+    )),
+    'employees': (Employee, (
+        'id', 'employee_id', 'user_id', 'user__username', 'user__first_name', 'user__last_name',
+        'user__email', 'department_id', 'category', 'designation', 'shift', 'status',
+        'date_of_joining', 'salary', 'created_at', 'updated_at',
+    )),
+    'applications': (Application, (
+        'id', 'job_id', 'applicant_name', 'email', 'phone', 'qualification', 'experience_years',
+        'status', 'interview_date', 'reviewed_by_id', 'applied_date', 'updated_at',
+    )),
+    'leave_requests': (LeaveRequest, (
+        'id', 'employee_id', 'leave_type', 'start_date', 'end_date', 'total_days', 'status',
+        'approved_by_id', 'approval_date', 'created_at', 'updated_at',
+    )),
+    'attendance': (Attendance, (
+        'id', 'employee_id', 'department_id', 'date', 'shift', 'status', 'check_in_time',
+        'check_out_time', 'late_minutes', 'early_leave_minutes', 'overtime_minutes',
+        'worked_minutes', 'updated_at',
+    )),
+}
+
+ENTITY_FOR_MODEL = {model: name for name, (model, _) in ENTITIES.items()}
+
+
+def feed_settings():
+    return {**DEFAULT_CHANGE_FEED, **getattr(settings, 'CHANGE_FEED', {})}
+
+
+class Cursor:
+    """Position in one entity's feed: the last (updated_at, id) row and (deleted_at, id) tombstone returned."""
+
+    def __init__(self, changed_at=None, changed_id=0, deleted_at=None, deleted_id=0):
+        self.changed_at = changed_at
+        self.changed_id = changed_id
+        self.deleted_at = deleted_at
+        self.deleted_id = deleted_id
+
+    def encode(self):
+        data = [
+            self.changed_at.isoformat() if self.changed_at else None, self.changed_id,
+            self.deleted_at.isoformat() if self.deleted_at else None, self.deleted_id,
+        ]
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, value):
+        """Parse a cursor handed out earlier; raises ValueError for anything else."""
+        if not value:
+            return cls()
+        try:
+            raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+            changed_at, changed_id, deleted_at, deleted_id = json.loads(raw)
+            return cls(
+                datetime.fromisoformat(changed_at) if changed_at else None, int(changed_id),
+                datetime.fromisoformat(deleted_at) if deleted_at else None, int(deleted_id),
+            )
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise ValueError('Invalid cursor.')
+
+
+def _after(queryset, field, at, pk):
+    if at is None:
+        return queryset
+    return queryset.filter(Q(**{f'{field}__gt': at}) | Q(**{field: at, 'id__gt': pk}))
+
+
+def changes_since(entity, cursor=None, limit=None):
+    """
+    One page of the feed for `entity` after `cursor` (a Cursor or an encoded
+    string). Raises KeyError for an unknown entity and ValueError for a bad cursor.
+    """
+    model, fields = ENTITIES[entity]
+    options = feed_settings()
+    if not isinstance(cursor, Cursor):
+        cursor = Cursor.decode(cursor)
+    limit = min(limit or options['page_size'], options['max_page_size'])
+    horizon = timezone.now() - timedelta(seconds=options['lag_seconds'])
+
+    rows = list(
+        _after(model.objects.filter(updated_at__lte=horizon), 'updated_at', cursor.changed_at, cursor.changed_id)
+        .order_by('updated_at', 'id').values(*fields)[:limit + 1]
+    )
+    tombstones = list(
+        _after(Tombstone.objects.filter(entity=entity, deleted_at__lte=horizon), 'deleted_at',
+               cursor.deleted_at, cursor.deleted_id)
+        .order_by('deleted_at', 'id').values('id', 'object_id', 'deleted_at')[:limit + 1]
+    )
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+
+    if rows:
+        cursor.changed_at, cursor.changed_id = rows[-1]['updated_at'], rows[-1]['id']
+    if tombstones:
+        cursor.deleted_at, cursor.deleted_id = tombstones[-1]['deleted_at'], tombstones[-1]['id']
+    return {
+        'entity': entity,
+        'changes': rows,
+        'deleted': [{'id': t['object_id'], 'deleted_at': t['deleted_at']} for t in tombstones],
+        'cursor': cursor.encode(),
+        'has_more': has_more,
+    }
+
+
+def record_tombstone(instance):
+    """Called from the post_delete signals of the feed models."""
+    Tombstone.objects.create(entity=ENTITY_FOR_MODEL[type(instance)], object_id=instance.pk)
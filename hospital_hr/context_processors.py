@@ -0,0 +1,8 @@
+import time
+
+
+def query_profile(request):
+    """Mark the start of template rendering for QueryProfilingMiddleware."""
+    if not hasattr(request, '_profiling_render_start'):
+        request._profiling_render_start = time.perf_counter()
+    return {}
@@ -0,0 +1,216 @@
+"""
+Live staffing coverage for Amrita Hospital HRMS
+
+For each department, today's "on the floor" staff (checked in or marked present,
+late or half day, and not yet checked out) are kept in the cache as
+{employee_id: [category, shift]}. Attendance signals update a single employee's
+entry as punches arrive, so reading coverage never rescans the attendance table;
+the state is only rebuilt (one query) when it is missing from the cache.
+
+Each change bumps the department's version with an atomic cache.incr on a key of
+its own, seeded from the clock so that a counter that expired and is seeded again
+still moves forward. A cached state remembers the version it was written at; one
+that is behind the counter (two punches raced on the read-modify-write of the
+state) is rebuilt from the database instead of being served.
+
+Required staffing per category and shift comes from the roster engine's
+bed-based ratios. Every change is published on the in-process broker under
+coverage_topic(department_id) for dashboards waiting on updates.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Attendance, Department, Employee
+from .pubsub import broker
+from .roster import SHIFT_HOURS, WARD_SHIFTS, coverage_requirements
+
+
+ON_FLOOR_STATUSES = ('present', 'late', 'half_day')
+
+
+def coverage_topic(department_id):
+    return f'coverage:{department_id}'
+
+
+def _cache_key(department_id, day):
+    return f'coverage:{department_id}:{day.isoformat()}'
+
+
+def _version_key(department_id, day):
+    return f'coverage-version:{department_id}:{day.isoformat()}'
+
+
+def _timeout():
+    return getattr(settings, 'COVERAGE_CACHE_TIMEOUT', 300)
+
+
+# The version key covers a single day; keep it for the day plus some slack
+VERSION_TIMEOUT = 2 * 24 * 60 * 60
+
+
+def _version_seed():
+    return int(time.time() * 1000)
+
+
+def current_version(department_id, day):
+    key = _version_key(department_id, day)
+    cache.add(key, _version_seed(), VERSION_TIMEOUT)
+    version = cache.get(key)
+    return _version_seed() if version is None else version
+
+
+def _next_version(department_id, day):
+    key = _version_key(department_id, day)
+    cache.add(key, _version_seed(), VERSION_TIMEOUT)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        version = _version_seed()
+        cache.set(key, version, VERSION_TIMEOUT)
+        return version
+
+
+def is_on_floor(attendance):
+    return attendance.status in ON_FLOOR_STATUSES and not attendance.check_out_time
+
+
+def current_shifts(moment=None):
+    """Shifts whose window contains the given (local) time."""
+    moment = timezone.localtime(moment)
+    hour = moment.hour + moment.minute / 60
+    return [
+        shift for shift, (start, end) in SHIFT_HOURS.items()
+        if start <= hour < end or start <= hour + 24 < end
+    ]
+
+
+def _build_state(department, day, version=None):
+    # Read the version before the rows so a change made meanwhile leaves the state behind, not ahead
+    if version is None:
+        version = current_version(department.pk, day)
+    headcounts = dict(Employee.objects.filter(
+        department=department, status__in=['active', 'on_leave']
+    ).values('category').annotate(count=Count('id')).values_list('category', 'count'))
+    on_floor = {
+        str(employee_id): [category, shift]
+        for employee_id, category, shift in Attendance.objects.filter(
+            department=department, date=day, status__in=ON_FLOOR_STATUSES, check_out_time__isnull=True,
+        ).values_list('employee_id', 'employee__category', 'shift')
+    }
+    requirements = coverage_requirements(department, headcounts)
+    return {
+        'version': version,
+        'total_beds': department.total_beds,
+        'requirements': [[category, shift, count] for (category, shift), count in requirements.items()],
+        'on_floor': on_floor,
+    }
+
+
+def _get_state(department, day):
+    key = _cache_key(department.pk, day)
+    state = cache.get(key)
+    if state is None or state['version'] != current_version(department.pk, day):
+        state = _build_state(department, day)
+        cache.set(key, state, _timeout())
+    return state
+
+
+def snapshot(state, department_id, day, moment=None):
+    """Turn a cached state into the per-shift coverage rows shown on dashboards."""
+    counts = {}
+    for category, shift in state['on_floor'].values():
+        counts[(category, shift)] = counts.get((category, shift), 0) + 1
+    active = current_shifts(moment)
+
+    rows = []
+    required = {(category, shift): count for category, shift, count in state['requirements']}
+    for category, shift in sorted(set(required) | set(counts), key=lambda key: (key[0], _shift_order(key[1]))):
+        on_floor = counts.get((category, shift), 0)
+        needed = required.get((category, shift), 0)
+        rows.append({
+            'category': category,
+            'category_label': dict(Employee.CATEGORY_CHOICES).get(category, category),
+            'shift': shift,
+            'on_floor': on_floor,
+            'required': needed,
+            'gap': max(needed - on_floor, 0),
+            'is_current': shift in active,
+        })
+    return {
+        'department_id': department_id,
+        'date': day.isoformat(),
+        'version': state['version'],
+        'total_beds': state['total_beds'],
+        'rows': rows,
+    }
+
+
+def _shift_order(shift):
+    order = list(WARD_SHIFTS[1:]) + [WARD_SHIFTS[0]]
+    return order.index(shift) if shift in order else len(order)
+
+
+def department_coverage(department, day=None):
+    day = day or timezone.localdate()
+    return snapshot(_get_state(department, day), department.pk, day)
+
+
+def record_attendance(attendance, deleted=False):
+    """Apply one Attendance change to the cached coverage (today only) and publish it."""
+    day = timezone.localdate()
+    if attendance.date != day or not attendance.department_id:
+        return None
+
+    key = _cache_key(attendance.department_id, day)
+    version = _next_version(attendance.department_id, day)
+    state = cache.get(key)
+    if state is None or state['version'] != version - 1:
+        # Nothing cached yet, or another change landed in between: build from the
+        # database, which already includes this change
+        department = Department.objects.filter(pk=attendance.department_id).first()
+        if department is None:
+            # Deleted along with its department: nothing left to cover
+            cache.delete(key)
+            return None
+        state = _build_state(department, day, version)
+    else:
+        entry = str(attendance.employee_id)
+        if not deleted and is_on_floor(attendance):
+            category = Employee.objects.filter(pk=attendance.employee_id).values_list('category', flat=True).first()
+            state['on_floor'][entry] = [category, attendance.shift]
+        else:
+            state['on_floor'].pop(entry, None)
+        state['version'] = version
+    cache.set(key, state, _timeout())
+
+    message = snapshot(state, attendance.department_id, day)
+    broker.publish(coverage_topic(attendance.department_id), message)
+    return message
+
+
+def wait_for_coverage(department, since_version, timeout=25):
+    """
+    Long-poll helper: return the department's coverage as soon as its version is
+    newer than since_version, or the current coverage after timeout seconds.
+
+    A since_version ahead of the current version (the client saw a counter that
+    has since been dropped from the cache) is stale as well and answered at once.
+    """
+    with broker.subscribe(coverage_topic(department.pk)) as subscription:
+        current = department_coverage(department)
+        if current['version'] != since_version:
+            return current
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return department_coverage(department)
+            message = subscription.get(timeout=remaining)
+            if message is not None and message['version'] != since_version:
+                return message
@@ -0,0 +1,286 @@
+"""
+Online SQLite backups for Amrita Hospital HRMS
+
+Snapshots are taken with SQLite's online backup API, a few thousand pages per
+step with a short pause in between, so the app keeps reading and writing while
+a backup runs (copying db.sqlite3 with cp can capture a half-written file and
+is not safe while the app is up).
+
+In WAL journal mode (see enable_wal) the copy holds one read transaction, so
+it sees a single consistent version of the database while writers carry on.
+In the default rollback-journal mode a write between steps makes SQLite
+restart the copy from the first page; after `max_restarts` restarts the copy
+is done in one step instead, which makes writers wait until it finishes.
+
+Each snapshot is checked with PRAGMA quick_check, gzip-compressed and stored
+next to a sha256sum-compatible .sha256 file:
+
+    backups/hrms-20261019-021500.sqlite3.gz
+    backups/hrms-20261019-021500.sqlite3.gz.sha256
+
+Rotation keeps the newest snapshot of each of the last N days, weeks and
+months (settings.DATABASE_BACKUPS). verify_snapshot() checks the checksum,
+restores the snapshot to a temporary file and runs a full integrity check,
+i.e. proves the backup can actually be restored.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections
+
+
+DEFAULT_DATABASE_BACKUPS = {
+    'directory': os.path.join(settings.BASE_DIR, 'backups'),
+    'pages_per_step': 4096,
+    # Seconds between steps, so writers get the database in between
+    'pause': 0.005,
+    # Rollback-journal mode only: restarts before falling back to a single-step copy
+    'max_restarts': 10,
+    'compress_level': 1,
+    'keep_daily': 7,
+    'keep_weekly': 4,
+    'keep_monthly': 6,
+}
+
+PREFIX = 'hrms-'
+SUFFIX = '.sqlite3.gz'
+STAMP = '%Y%m%d-%H%M%S'
+COPY_BUFFER = 4 * 1024 * 1024
+
+
+def backup_settings():
+    return {**DEFAULT_DATABASE_BACKUPS, **getattr(settings, 'DATABASE_BACKUPS', {})}
+
+
+def database_path(alias='default'):
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        raise ValueError(f"Database '{alias}' is {connection.vendor}, not SQLite; use that server's backup tools.")
+    return str(connection.settings_dict['NAME'])
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(COPY_BUFFER), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def journal_mode(alias='default'):
+    database_path(alias)
+    with connections[alias].cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        return cursor.fetchone()[0]
+
+
+def enable_wal(alias='default'):
+    """Switch the database to WAL journal mode (persistent); returns the resulting mode."""
+    database_path(alias)
+    with connections[alias].cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        return cursor.fetchone()[0]
+
+
+class Snapshot:
+    """A finished backup: paths, sizes, checksum and per-phase timings (seconds)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.mode = None
+        self.checksum = None
+        self.database_size = 0
+        self.size = 0
+        self.pages = 0
+        self.steps = 0
+        self.restarts = 0
+        self.timings = {}
+
+
+def create_snapshot(alias='default', directory=None, pages_per_step=None, pause=None, progress=None, now=None):
+    """
+    Back up the database into `directory`. `progress(remaining, total)` is called
+    after every step. Returns a Snapshot; raises ValueError if the copy fails its check.
+    """
+    options = backup_settings()
+    directory = directory or options['directory']
+    pages_per_step = pages_per_step or options['pages_per_step']
+    pause = options['pause'] if pause is None else pause
+    max_restarts = options['max_restarts']
+    os.makedirs(directory, exist_ok=True)
+
+    name = f"{PREFIX}{(now or datetime.now()).strftime(STAMP)}{SUFFIX}"
+    snapshot = Snapshot(os.path.join(directory, name))
+    source_path = database_path(alias)
+    snapshot.database_size = os.path.getsize(source_path)
+
+    fd, raw_path = tempfile.mkstemp(prefix='hrms-backup-', suffix='.sqlite3', dir=directory)
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        last_remaining = None
+
+        def step(status, remaining, total):
+            nonlocal last_remaining
+            snapshot.steps += 1
+            snapshot.pages = total
+            # The copy starts over when another connection writes between steps
+            if last_remaining is not None and remaining >= last_remaining:
+                snapshot.restarts += 1
+                if snapshot.restarts > max_restarts:
+                    raise _TooManyRestarts
+            last_remaining = remaining
+            if progress:
+                progress(remaining, total)
+            if pause:
+                time.sleep(pause)
+
+        source = sqlite3.connect(f'file:{source_path}?mode=ro', uri=True, isolation_level=None)
+        target = sqlite3.connect(raw_path)
+        try:
+            if source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+                # Pin one WAL snapshot for the whole copy: no restarts, and writers are not held up
+                source.execute('BEGIN')
+                source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+                snapshot.mode = 'WAL snapshot, stepped'
+            else:
+                snapshot.mode = 'stepped'
+            try:
+                source.backup(target, pages=pages_per_step, progress=step)
+            except _TooManyRestarts:
+                snapshot.mode = f'single step after {max_restarts} restarts'
+                source.backup(target, pages=-1)
+            snapshot.timings['backup'] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            result = target.execute('PRAGMA quick_check').fetchone()[0]
+            snapshot.timings['check'] = time.perf_counter() - started
+        finally:
+            target.close()
+            source.close()
+        if result != 'ok':
+            raise ValueError(f'The snapshot failed its integrity check: {result}')
+
+        started = time.perf_counter()
+        part = snapshot.path + '.part'
+        with open(raw_path, 'rb') as raw, gzip.open(part, 'wb', compresslevel=options['compress_level']) as compressed:
+            shutil.copyfileobj(raw, compressed, COPY_BUFFER)
+        snapshot.timings['compress'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        snapshot.checksum = sha256_file(part)
+        os.replace(part, snapshot.path)
+        with open(snapshot.path + '.sha256', 'w') as sidecar:
+            sidecar.write(f'{snapshot.checksum}  {name}\n')
+        snapshot.timings['checksum'] = time.perf_counter() - started
+        snapshot.size = os.path.getsize(snapshot.path)
+    finally:
+        for path in (raw_path, snapshot.path + '.part'):
+            if os.path.exists(path):
+                os.remove(path)
+    return snapshot
+
+
+def list_snapshots(directory=None):
+    """(taken_at, path) of every snapshot in `directory`, newest first."""
+    directory = directory or backup_settings()['directory']
+    if not os.path.isdir(directory):
+        return []
+    snapshots = []
+    for name in os.listdir(directory):
+        if not (name.startswith(PREFIX) and name.endswith(SUFFIX)):
+            continue
+        try:
+            taken_at = datetime.strptime(name[len(PREFIX):-len(SUFFIX)], STAMP)
+        except ValueError:
+            continue
+        snapshots.append((taken_at, os.path.join(directory, name)))
+    return sorted(snapshots, reverse=True)
+
+
+def rotate(directory=None, keep_daily=None, keep_weekly=None, keep_monthly=None):
+    """
+    Delete snapshots outside the retention schedule: the newest snapshot of each
+    of the last `keep_daily` days, `keep_weekly` ISO weeks and `keep_monthly`
+    months is kept. Returns the deleted paths.
+    """
+    options = backup_settings()
+    schedule = [
+        (lambda taken: taken.date(), options['keep_daily'] if keep_daily is None else keep_daily),
+        (lambda taken: taken.isocalendar()[:2], options['keep_weekly'] if keep_weekly is None else keep_weekly),
+        (lambda taken: (taken.year, taken.month), options['keep_monthly'] if keep_monthly is None else keep_monthly),
+    ]
+    snapshots = list_snapshots(directory)
+    keep = set()
+    for period, count in schedule:
+        seen = []
+        for taken_at, path in snapshots:
+            key = period(taken_at)
+            if key not in seen:
+                if len(seen) >= count:
+                    break
+                seen.append(key)
+                keep.add(path)
+
+    deleted = []
+    for _, path in snapshots:
+        if path not in keep:
+            for stale in (path, path + '.sha256'):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            deleted.append(path)
+    return deleted
+
+
+def verify_snapshot(path):
+    """
+    Check a snapshot end to end: its sha256 against the .sha256 file, then
+    decompress it to a temporary file and run PRAGMA integrity_check. Returns
+    {'checksum_ok', 'integrity', 'tables', 'timings'}; 'tables' maps table name
+    to row count.
+    """
+    report = {'checksum_ok': None, 'integrity': None, 'tables': {}, 'timings': {}}
+
+    started = time.perf_counter()
+    sidecar = path + '.sha256'
+    if os.path.exists(sidecar):
+        with open(sidecar) as handle:
+            expected = handle.read().split()[0]
+        report['checksum_ok'] = sha256_file(path) == expected
+    report['timings']['checksum'] = time.perf_counter() - started
+
+    fd, restored = tempfile.mkstemp(prefix='hrms-verify-', suffix='.sqlite3')
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        with gzip.open(path, 'rb') as compressed, open(restored, 'wb') as raw:
+            shutil.copyfileobj(compressed, raw, COPY_BUFFER)
+        report['timings']['restore'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        database = sqlite3.connect(restored)
+        try:
+            report['integrity'] = database.execute('PRAGMA integrity_check').fetchone()[0]
+            tables = [row[0] for row in database.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )]
+            for table in tables:
+                report['tables'][table] = database.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        finally:
+            database.close()
+        report['timings']['integrity'] = time.perf_counter() - started
+    finally:
+        os.remove(restored)
+    return report
@@ -1,7 +1,15 @@
+import logging
+
+from django.conf import settings
 from django.contrib.auth.decorators import user_passes_test
 from django.shortcuts import redirect
 from functools import wraps
 
+from .profiling import QueryBudgetExceeded, QueryRecorder
+
+
+logger = logging.getLogger('hospital_hr.profiling')
+
 
 def role_required(*roles):
     def decorator(view_func):
@@ -19,6 +27,36 @@ def role_required(*roles):
     return decorator
 
 
+def query_budget(max_queries, max_duplicates=None):
+    """
+    Declare the maximum number of queries (and optionally duplicate queries) a view may run.
+    Exceeding the budget raises QueryBudgetExceeded when settings.QUERY_BUDGET_STRICT is
+    set (as it is under the test runner), otherwise a warning is logged.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            with QueryRecorder() as recorder:
+                response = view_func(request, *args, **kwargs)
+            
+            problems = []
+            if recorder.count > max_queries:
+                problems.append(f'{recorder.count} queries (budget {max_queries})')
+            if max_duplicates is not None and recorder.duplicate_count > max_duplicates:
+                problems.append(f'{recorder.duplicate_count} duplicate queries (budget {max_duplicates})')
+            
+            if problems:
+                message = f"{view_func.__name__} exceeded its query budget: {', '.join(problems)}"
+                if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        
+        _wrapped_view.query_budget = (max_queries, max_duplicates)
+        return _wrapped_view
+    return decorator
+
+
 def admin_required(view_func):
     return role_required('admin')(view_func)
 
@@ -0,0 +1,142 @@
+"""
+Staff directory export for Amrita Hospital HRMS
+
+Streams Employee joined with User and Department as CSV, JSON Lines or columnar
+JSON. Rows are read with .values().iterator(), so memory stays flat for any
+headcount. The filters are the same ones the employee list uses.
+
+The columnar format writes one JSON object per row group of ROW_GROUP_SIZE
+employees, holding one array per column, e.g.
+    {"row_group": 0, "rows": 5000, "columns": {"employee_id": [...], "email": [...]}}
+so consumers can load a column at a time without parsing every record.
+"""
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .models import Employee
+
+
+# Export column -> ORM lookup
+EXPORT_COLUMNS = {
+    'employee_id': 'employee_id',
+    'first_name': 'user__first_name',
+    'last_name': 'user__last_name',
+    'email': 'user__email',
+    'username': 'user__username',
+    'role': 'user__role',
+    'phone': 'user__phone',
+    'department': 'department__name',
+    'department_code': 'department__code',
+    'category': 'category',
+    'designation': 'designation',
+    'shift': 'shift',
+    'status': 'status',
+    'date_of_joining': 'date_of_joining',
+    'date_of_birth': 'date_of_birth',
+    'qualification': 'qualification',
+    'specialization': 'specialization',
+    'experience_years': 'experience_years',
+    'salary': 'salary',
+    'emergency_contact_name': 'emergency_contact_name',
+    'emergency_contact_phone': 'emergency_contact_phone',
+    'emergency_contact_relation': 'emergency_contact_relation',
+}
+
+DEFAULT_COLUMNS = [
+    'employee_id', 'first_name', 'last_name', 'email', 'department', 'category', 'designation',
+    'shift', 'status', 'date_of_joining',
+]
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'columnar': ('application/x-ndjson', 'columnar.jsonl'),
+}
+
+ROW_GROUP_SIZE = 5000
+
+# Rows buffered into each chunk handed to the response
+CHUNK_ROWS = 500
+
+
+def filter_employees(employees, params):
+    """Apply the employee list filters (category, department, status, search) from a GET-style mapping."""
+    category = params.get('category')
+    department = params.get('department')
+    status = params.get('status')
+    search = params.get('search')
+
+    if category:
+        employees = employees.filter(category=category)
+    if department:
+        employees = employees.filter(department_id=department)
+    if status:
+        employees = employees.filter(status=status)
+    if search:
+        employees = employees.filter(
+            Q(employee_id__icontains=search) |
+            Q(user__first_name__icontains=search) |
+            Q(user__last_name__icontains=search) |
+            Q(designation__icontains=search)
+        )
+    return employees
+
+
+def parse_columns(value):
+    """Columns from a comma-separated string (or list); raises ValueError for unknown names."""
+    if not value:
+        return list(DEFAULT_COLUMNS)
+    names = value.split(',') if isinstance(value, str) else [n for item in value for n in item.split(',')]
+    columns = [name.strip() for name in names if name.strip()]
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(EXPORT_COLUMNS)}.")
+    return columns
+
+
+def directory_rows(params, columns, chunk_size=2000):
+    """Value tuples for the filtered directory, in employee_id order, read in chunks."""
+    employees = filter_employees(Employee.objects.all(), params)
+    return employees.order_by('employee_id').values_list(
+        *[EXPORT_COLUMNS[column] for column in columns]
+    ).iterator(chunk_size=chunk_size)
+
+
+class _Echo:
+    """File-like object whose write() hands the line back, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_chunks(rows, columns, fmt):
+    """Encode value tuples as text chunks in the given format."""
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for batch in _batched(rows, CHUNK_ROWS):
+            yield ''.join(writer.writerow(row) for row in batch)
+    elif fmt == 'jsonl':
+        for batch in _batched(rows, CHUNK_ROWS):
+            yield ''.join(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n' for row in batch)
+    elif fmt == 'columnar':
+        for index, batch in enumerate(_batched(rows, ROW_GROUP_SIZE)):
+            group = {'row_group': index, 'rows': len(batch), 'columns': dict(zip(columns, map(list, zip(*batch))))}
+            yield json.dumps(group, cls=DjangoJSONEncoder) + '\n'
+    else:
+        raise ValueError(f'Unknown export format {fmt!r}')
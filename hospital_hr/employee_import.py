@@ -0,0 +1,266 @@
+"""
+Bulk employee import for Amrita Hospital HRMS
+
+Reads a CSV or Excel (.xlsx) file row by row, validates rows in chunks and
+creates a User and an Employee for every valid row:
+
+- each row goes through EmployeeImportRowForm (formats, choices, required
+  fields); uniqueness and department codes are checked once per chunk with
+  a few IN queries, plus duplicates within the file itself;
+- passwords given in the file are hashed; the import_employees command spreads
+  that over a process pool, the web import hashes in-process and accepts at
+  most WEB_MAX_PASSWORDS of them (forking a threaded server process is not
+  safe). Rows without one get an unusable password and must be given one
+  from the employee edit page;
+- all Users and Employees are written with bulk_create in one transaction.
+
+Invalid rows are skipped and reported with their row number (the header is
+row 1). Excel support needs the optional openpyxl package.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connections, transaction
+
+from .forms import EmployeeImportRowForm
+from .models import Department, Employee, User
+
+
+COLUMNS = list(EmployeeImportRowForm.base_fields)
+REQUIRED_COLUMNS = [name for name, field in EmployeeImportRowForm.base_fields.items() if field.required]
+
+USER_FIELDS = ('username', 'email', 'first_name', 'last_name', 'phone')
+EMPLOYEE_FIELDS = (
+    'employee_id', 'category', 'designation', 'date_of_birth', 'date_of_joining', 'qualification',
+    'specialization', 'salary', 'emergency_contact_name', 'emergency_contact_phone',
+    'emergency_contact_relation', 'address',
+)
+
+CHUNK_SIZE = 1000
+MAX_IMPORT_ROWS = 20000
+
+# Below this many passwords a process pool costs more than it saves
+POOL_THRESHOLD = 8
+
+# Passwords hashed within one web request (about a quarter second each)
+WEB_MAX_PASSWORDS = 100
+
+
+class ImportResult:
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.total = 0
+        self.created = 0
+        self.valid = 0
+        self.without_password = 0
+        self.errors = []
+
+    def add_error(self, row_number, raw, messages):
+        self.errors.append({
+            'row': row_number,
+            'employee_id': str(raw.get('employee_id') or ''),
+            'messages': messages,
+        })
+
+
+def _normalise_header(header):
+    return [str(name or '').strip().lower().replace(' ', '_') for name in header]
+
+
+def _check_header(header):
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}.")
+
+
+def read_rows(upload, file_name):
+    """Yield (row_number, {column: value}) for every non-empty data row of a CSV or XLSX file."""
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension == '.xlsx':
+        rows = _xlsx_rows(upload)
+    elif extension == '.csv':
+        rows = csv.reader(io.TextIOWrapper(upload, encoding='utf-8-sig', newline=''))
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'. Use .csv or .xlsx.")
+
+    header = None
+    for row_number, values in enumerate(rows, start=1):
+        if header is None:
+            header = _normalise_header(values)
+            _check_header(header)
+            continue
+        if not any(value not in (None, '') for value in values):
+            continue
+        yield row_number, {
+            column: value.strip() if isinstance(value, str) else value
+            for column, value in zip(header, values) if column in COLUMNS
+        }
+    if header is None:
+        raise ValueError('The file is empty.')
+
+
+def _xlsx_rows(upload):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError('Excel files need the openpyxl package; upload a CSV instead.')
+    workbook = load_workbook(upload, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+class _ChunkValidator:
+    """Validates rows chunk by chunk, remembering keys already taken earlier in the file."""
+
+    def __init__(self, result):
+        self.result = result
+        self.departments = {code.upper(): pk for code, pk in Department.objects.values_list('code', 'id')}
+        self.seen = {'username': set(), 'employee_id': set()}
+        self.valid = []
+
+    def validate(self, chunk):
+        cleaned_rows = []
+        for row_number, raw in chunk:
+            form = EmployeeImportRowForm(data={column: '' if value is None else value for column, value in raw.items()})
+            if not form.is_valid():
+                messages = [
+                    f'{field}: {" ".join(errors)}' if field != '__all__' else ' '.join(errors)
+                    for field, errors in form.errors.items()
+                ]
+                self.result.add_error(row_number, raw, messages)
+                continue
+            cleaned_rows.append((row_number, raw, form.cleaned_data))
+
+        usernames = [data['username'] for _, _, data in cleaned_rows]
+        employee_ids = [data['employee_id'] for _, _, data in cleaned_rows]
+        taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_ids = set(Employee.objects.filter(employee_id__in=employee_ids).values_list('employee_id', flat=True))
+        taken_ids |= set(User.objects.filter(employee_id__in=employee_ids).values_list('employee_id', flat=True))
+
+        for row_number, raw, data in cleaned_rows:
+            messages = []
+            if data['username'] in taken_usernames:
+                messages.append('username: A user with that username already exists.')
+            elif data['username'] in self.seen['username']:
+                messages.append('username: Appears more than once in the file.')
+            if data['employee_id'] in taken_ids:
+                messages.append('employee_id: An employee with this ID already exists.')
+            elif data['employee_id'] in self.seen['employee_id']:
+                messages.append('employee_id: Appears more than once in the file.')
+            department_code = data['department'].upper()
+            if department_code and department_code not in self.departments:
+                messages.append(f"department: No department with code '{data['department']}'.")
+
+            self.seen['username'].add(data['username'])
+            self.seen['employee_id'].add(data['employee_id'])
+            if messages:
+                self.result.add_error(row_number, raw, messages)
+            else:
+                data['department_id'] = self.departments.get(department_code)
+                self.valid.append(data)
+
+
+def _hash_passwords(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, workers=1, chunk_size=50):
+    """
+    Hash passwords in order. With workers other than 1 (None: one per CPU) the
+    deliberately slow work is spread over a forked process pool; only do that
+    from a management command, never inside a web server process.
+    """
+    if workers == 1 or len(passwords) < POOL_THRESHOLD:
+        return _hash_passwords(passwords)
+    chunks = [passwords[offset:offset + chunk_size] for offset in range(0, len(passwords), chunk_size)]
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return [hashed for chunk in executor.map(_hash_passwords, chunks) for hashed in chunk]
+
+
+def import_employees(upload, file_name, dry_run=False, workers=1, chunk_size=CHUNK_SIZE, max_passwords=None):
+    """
+    Validate and import an employee file. Returns an ImportResult; raises
+    ValueError for problems with the file as a whole (type, header, size, or
+    more than `max_passwords` passwords). `workers` is passed to hash_passwords.
+    """
+    result = ImportResult(dry_run)
+    validator = _ChunkValidator(result)
+    chunk = []
+    for row in read_rows(upload, file_name):
+        result.total += 1
+        if result.total > MAX_IMPORT_ROWS:
+            raise ValueError(f'Files are limited to {MAX_IMPORT_ROWS} rows; split the file and import each part.')
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            validator.validate(chunk)
+            chunk = []
+    if chunk:
+        validator.validate(chunk)
+
+    rows = validator.valid
+    result.valid = len(rows)
+    result.errors.sort(key=lambda error: error['row'])
+    with_password = [i for i, data in enumerate(rows) if data['password']]
+    if max_passwords is not None and len(with_password) > max_passwords:
+        raise ValueError(
+            f'The file sets {len(with_password)} passwords; at most {max_passwords} can be hashed here. '
+            'Import it with `manage.py import_employees`, or leave the password column empty.'
+        )
+    if dry_run or not rows:
+        return result
+
+    hashes = dict(zip(with_password, hash_passwords([rows[i]['password'] for i in with_password], workers)))
+    result.without_password = len(rows) - len(with_password)
+
+    users = [
+        User(
+            **{field: data[field] for field in USER_FIELDS},
+            role=data['role'] or 'staff',
+            employee_id=data['employee_id'],
+            password=hashes.get(i) or make_password(None),
+        )
+        for i, data in enumerate(rows)
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=500)
+            if any(user.pk is None for user in users):
+                # Backends without RETURNING support: look the new ids up by username
+                ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+                for user in users:
+                    user.pk = ids[user.username]
+            Employee.objects.bulk_create([
+                Employee(
+                    **{field: data[field] for field in EMPLOYEE_FIELDS},
+                    user=user,
+                    department_id=data['department_id'],
+                    shift=data['shift'] or 'general',
+                    experience_years=data['experience_years'] or 0,
+                    status=data['status'] or 'active',
+                )
+                for user, data in zip(users, rows)
+            ], batch_size=500)
+    except IntegrityError as exc:
+        raise ValueError(f'Nothing was imported: another change conflicted with this file ({exc}). Please retry.')
+    result.created = len(users)
+    return result
+
+
+def error_report_csv(result):
+    """The per-row error report as CSV text (row, employee_id, error)."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['Row', 'Employee ID', 'Error'])
+    for error in result.errors:
+        for message in error['messages']:
+            writer.writerow([error['row'], error['employee_id'], message])
+    return output.getvalue()
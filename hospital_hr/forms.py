@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from .models import User, Department, Employee, Job, Application, LeaveRequest, Attendance
+from .uploads import check_upload_size, check_upload_type
+from .leave_engine import LeaveCheck
 
 
 class UserRegistrationForm(UserCreationForm):
@@ -150,9 +152,83 @@ class ApplicationForm(forms.ModelForm):
             'experience_years': forms.NumberInput(attrs={'class': 'form-control'}),
             'current_employer': forms.TextInput(attrs={'class': 'form-control'}),
             'current_designation': forms.TextInput(attrs={'class': 'form-control'}),
-            'resume': forms.FileInput(attrs={'class': 'form-control'}),
+            'resume': forms.FileInput(attrs={'class': 'form-control', 'accept': '.pdf,.doc,.docx'}),
             'cover_letter': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
         }
+    
+    def __init__(self, *args, **kwargs):
+        # Files rejected by the upload handler never reach the form, only their error does
+        self.upload_errors = kwargs.pop('upload_errors', {})
+        super().__init__(*args, **kwargs)
+        if 'resume' in self.upload_errors:
+            self.fields['resume'].required = False
+    
+    def clean_resume(self):
+        resume = self.cleaned_data.get('resume')
+        if 'resume' in self.upload_errors:
+            raise forms.ValidationError(self.upload_errors['resume'])
+        if resume:
+            error = check_upload_type('resume', resume.name) or check_upload_size('resume', resume.size)
+            if error:
+                raise forms.ValidationError(error)
+        return resume
+
+
+class EmployeeImportForm(forms.Form):
+    employee_file = forms.FileField(
+        label='Employee file',
+        help_text='CSV or Excel (.xlsx) with a header row',
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'})
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        label='Validate only',
+        help_text='Check every row and report errors without creating anyone',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    
+    def __init__(self, *args, **kwargs):
+        self.upload_errors = kwargs.pop('upload_errors', {})
+        super().__init__(*args, **kwargs)
+        if 'employee_file' in self.upload_errors:
+            self.fields['employee_file'].required = False
+    
+    def clean_employee_file(self):
+        upload = self.cleaned_data.get('employee_file')
+        if 'employee_file' in self.upload_errors:
+            raise forms.ValidationError(self.upload_errors['employee_file'])
+        if upload:
+            error = check_upload_type('employee_file', upload.name) or check_upload_size('employee_file', upload.size)
+            if error:
+                raise forms.ValidationError(error)
+        return upload
+
+
+class EmployeeImportRowForm(forms.Form):
+    """One row of a bulk employee import; database checks happen per chunk in hospital_hr.employee_import."""
+    employee_id = forms.CharField(max_length=20)
+    username = forms.CharField(max_length=150, validators=[User.username_validator])
+    email = forms.EmailField()
+    first_name = forms.CharField(max_length=150)
+    last_name = forms.CharField(max_length=150)
+    role = forms.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    password = forms.CharField(required=False)
+    phone = forms.CharField(max_length=15, required=False)
+    department = forms.CharField(required=False, help_text='Department code')
+    category = forms.ChoiceField(choices=Employee.CATEGORY_CHOICES)
+    designation = forms.CharField(max_length=100)
+    shift = forms.ChoiceField(choices=Employee.SHIFT_CHOICES, required=False)
+    date_of_birth = forms.DateField(required=False)
+    date_of_joining = forms.DateField()
+    qualification = forms.CharField(max_length=200, required=False)
+    specialization = forms.CharField(max_length=200, required=False)
+    experience_years = forms.IntegerField(min_value=0, required=False)
+    salary = forms.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    emergency_contact_name = forms.CharField(max_length=100, required=False)
+    emergency_contact_phone = forms.CharField(max_length=15, required=False)
+    emergency_contact_relation = forms.CharField(max_length=50, required=False)
+    address = forms.CharField(required=False)
+    status = forms.ChoiceField(choices=Employee.STATUS_CHOICES, required=False)
 
 
 class ApplicationReviewForm(forms.ModelForm):
@@ -169,14 +245,41 @@ class ApplicationReviewForm(forms.ModelForm):
 class LeaveRequestForm(forms.ModelForm):
     class Meta:
         model = LeaveRequest
-        fields = ['leave_type', 'start_date', 'end_date', 'total_days', 'reason']
+        fields = ['leave_type', 'start_date', 'end_date', 'reason']
         widgets = {
             'leave_type': forms.Select(attrs={'class': 'form-control'}),
             'start_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'end_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-            'total_days': forms.NumberInput(attrs={'class': 'form-control'}),
             'reason': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
+    
+    def __init__(self, *args, **kwargs):
+        self.employee = kwargs.pop('employee', None)
+        super().__init__(*args, **kwargs)
+        self.leave_check = None
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        end_date = cleaned_data.get('end_date')
+        if not start_date or not end_date or self.employee is None:
+            return cleaned_data
+        
+        if end_date < start_date:
+            raise forms.ValidationError('End date cannot be before the start date.')
+        
+        self.leave_check = LeaveCheck(self.employee, start_date, end_date, exclude_pk=self.instance.pk)
+        if self.leave_check.overlaps:
+            overlap = self.leave_check.overlaps[0]
+            raise forms.ValidationError(
+                f'You already have a {overlap.get_status_display().lower()} {overlap.get_leave_type_display().lower()} '
+                f'from {overlap.start_date:%b %d, %Y} to {overlap.end_date:%b %d, %Y} that overlaps these dates.'
+            )
+        if self.leave_check.working_days == 0:
+            raise forms.ValidationError('The selected dates contain no working days for your shift.')
+        
+        self.instance.total_days = self.leave_check.working_days
+        return cleaned_data
 
 
 class LeaveApprovalForm(forms.ModelForm):
@@ -0,0 +1,125 @@
+"""
+Leave calendar index for Amrita Hospital HRMS
+
+LeaveDay holds one row per employee per day of approved leave. It is rebuilt for
+a leave request whenever the request is saved (see signals.py) or decided in bulk,
+so date lookups and department month calendars are single indexed queries. Month
+calendars are additionally cached per (department, month) and invalidated for
+the months a changed leave touches, before and after the change.
+"""
+
+import calendar
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Min
+
+from .models import Employee, LeaveDay
+
+
+def _calendar_key(department_id, year, month):
+    return f'leave_calendar:{department_id or "all"}:{year:04d}-{month:02d}'
+
+
+def _months(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _invalidate_ranges(ranges):
+    """Drop cached month calendars for (employee_id, first_day, last_day) ranges."""
+    departments = dict(Employee.objects.filter(
+        id__in={employee_id for employee_id, _, _ in ranges}
+    ).values_list('id', 'department_id'))
+    keys = set()
+    for employee_id, first_day, last_day in ranges:
+        for year, month in _months(first_day, last_day):
+            keys.add(_calendar_key(departments.get(employee_id), year, month))
+            keys.add(_calendar_key(None, year, month))
+    cache.delete_many(list(keys))
+
+
+def invalidate_calendar(leave_requests):
+    """Drop cached month calendars for every department and month the leaves touch."""
+    _invalidate_ranges([(leave.employee_id, leave.start_date, leave.end_date) for leave in leave_requests])
+
+
+@transaction.atomic
+def sync_leave_days(leave_requests):
+    """Rebuild the LeaveDay rows of the given leave requests from their current state."""
+    leave_requests = list(leave_requests)
+    if not leave_requests:
+        return 0
+    previous = LeaveDay.objects.filter(leave_request__in=[leave.pk for leave in leave_requests])
+    # Months the leaves covered before this change (their dates may have been edited)
+    previous_ranges = list(previous.values('leave_request_id', 'employee_id').annotate(
+        first_day=Min('date'), last_day=Max('date'),
+    ).values_list('employee_id', 'first_day', 'last_day'))
+    previous.delete()
+
+    days = []
+    for leave in leave_requests:
+        if leave.status != 'approved':
+            continue
+        for offset in range((leave.end_date - leave.start_date).days + 1):
+            days.append(LeaveDay(
+                leave_request_id=leave.pk,
+                employee_id=leave.employee_id,
+                leave_type=leave.leave_type,
+                date=leave.start_date + timedelta(days=offset),
+            ))
+    LeaveDay.objects.bulk_create(days, batch_size=2000)
+
+    _invalidate_ranges(previous_ranges + [
+        (leave.employee_id, leave.start_date, leave.end_date) for leave in leave_requests
+    ])
+    return len(days)
+
+
+def leave_days_on(day, department_id=None):
+    """LeaveDay rows for one date (with employee, user and department loaded), one query."""
+    days = LeaveDay.objects.filter(date=day).select_related(
+        'employee__user', 'employee__department', 'leave_request'
+    )
+    if department_id:
+        days = days.filter(employee__department_id=department_id)
+    return days
+
+
+def department_month(department_id, year, month):
+    """
+    Return the leave calendar of a department (or the whole hospital when
+    department_id is None) for one month as a list of weeks, each a list of
+    {'date', 'in_month', 'leaves'} cells. Cached per (department, month).
+    """
+    key = _calendar_key(department_id, year, month)
+    weeks = cache.get(key)
+    if weeks is not None:
+        return weeks
+
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    days = LeaveDay.objects.filter(date__gte=first, date__lte=last)
+    if department_id:
+        days = days.filter(employee__department_id=department_id)
+
+    by_date = {}
+    for day, employee_id, name_first, name_last, leave_type in days.values_list(
+        'date', 'employee__employee_id', 'employee__user__first_name', 'employee__user__last_name', 'leave_type'
+    ).order_by('date', 'employee__user__first_name'):
+        by_date.setdefault(day, []).append({
+            'employee_id': employee_id,
+            'name': f'{name_first} {name_last}'.strip(),
+            'leave_type': leave_type,
+        })
+
+    weeks = [
+        [{'date': day, 'in_month': day.month == month, 'leaves': by_date.get(day, [])} for day in week]
+        for week in calendar.Calendar(firstweekday=0).monthdatescalendar(year, month)
+    ]
+    cache.set(key, weeks, getattr(settings, 'LEAVE_CALENDAR_CACHE_TIMEOUT', 3600))
+    return weeks
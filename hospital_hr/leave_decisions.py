@@ -0,0 +1,76 @@
+"""
+Bulk leave decisions for Amrita Hospital HRMS
+
+Approves or rejects many pending leave requests in one transaction: the requests
+are written with a single bulk_update, approved leaves are debited from the
+leave ledger in one batch, and employee statuses are reconciled with one
+set-based pass of the status scheduler. Each request gets its own outcome, so
+requests that were already decided (e.g. by another HR user) are reported rather
+than failing the whole batch.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import audit
+from .leave_calendar import sync_leave_days
+from .leave_ledger import post_entries, settlement_entries
+from .models import LeaveRequest
+from .status_scheduler import apply_transitions
+
+
+DECISIONS = ('approved', 'rejected')
+
+# Upper bound on the number of requests decided in one call
+MAX_BULK_DECISIONS = 1000
+
+
+@transaction.atomic
+def decide_leaves(leave_ids, decision, user, rejection_reason=''):
+    """
+    Apply `decision` ('approved' or 'rejected') to the given pending leave requests.
+    Returns one {'id', 'ok', 'status', 'error'} dict per requested id, in order.
+    """
+    if decision not in DECISIONS:
+        raise ValueError(f'Unknown decision {decision!r}')
+
+    leaves = LeaveRequest.objects.select_for_update().filter(pk__in=leave_ids)
+    leaves = {leave.pk: leave for leave in leaves}
+
+    now = timezone.now()
+    outcomes, decided = [], []
+    for leave_id in leave_ids:
+        leave = leaves.get(leave_id)
+        if leave is None:
+            outcomes.append({'id': leave_id, 'ok': False, 'status': None, 'error': 'Leave request not found.'})
+            continue
+        if leave.status != 'pending':
+            outcomes.append({
+                'id': leave_id, 'ok': False, 'status': leave.status,
+                'error': f'Already {leave.get_status_display().lower()}.',
+            })
+            continue
+
+        leave.status = decision
+        leave.approved_by = user
+        leave.approval_date = now
+        leave.updated_at = now
+        if decision == 'rejected':
+            leave.rejection_reason = rejection_reason
+        decided.append(leave)
+        outcomes.append({'id': leave_id, 'ok': True, 'status': decision, 'error': None})
+
+    if decided:
+        LeaveRequest.objects.bulk_update(
+            decided, ['status', 'approved_by', 'approval_date', 'rejection_reason', 'updated_at'], batch_size=500
+        )
+        # bulk_update sends no post_save either, so record the decisions in the audit log here
+        for leave in decided:
+            audit.capture(leave)
+        approved = [leave for leave in decided if leave.status == 'approved']
+        post_entries(settlement_entries(approved, user))
+        # bulk_update sends no post_save, so index the approved days here
+        sync_leave_days(approved)
+        apply_transitions(employee_ids={leave.employee_id for leave in approved})
+
+    return outcomes
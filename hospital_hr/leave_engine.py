@@ -0,0 +1,146 @@
+"""
+Leave interval engine for Amrita Hospital HRMS
+
+Validates leave requests against the employee's existing leaves, computes the
+number of working days from shift and holiday calendars, and detects department
+coverage conflicts (too many staff of one category off on the same day).
+All checks use indexed range queries on LeaveRequest (see its Meta.indexes),
+so they stay cheap with hundreds of thousands of historical leave rows.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Employee, Holiday, LeaveRequest
+
+
+# Leaves in these states block the dates for new requests
+BLOCKING_STATUSES = ('pending', 'approved')
+
+# Which days each shift works. General shift staff are off on Sundays and on
+# holidays; ward shifts run round the clock, every day of the year.
+SHIFT_CALENDARS = {
+    'general': {'weekly_off': {6}, 'observes_holidays': True},
+}
+DEFAULT_SHIFT_CALENDAR = {'weekly_off': set(), 'observes_holidays': False}
+
+# Maximum share of a department's active staff of one category that may be on
+# leave on the same day
+DEFAULT_COVERAGE_RATIOS = {
+    'medical': 0.25,
+    'nursing': 0.2,
+    'paramedical': 0.25,
+    'admin_support': 0.34,
+}
+
+
+def daterange(start, end):
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def holiday_dates(start, end, department_id=None):
+    """Hospital-wide holidays plus the department's own holidays within [start, end]."""
+    scope = Q(department__isnull=True)
+    if department_id:
+        scope |= Q(department_id=department_id)
+    holidays = Holiday.objects.filter(scope, date__gte=start, date__lte=end)
+    return set(holidays.values_list('date', flat=True))
+
+
+def working_days(employee, start, end, holidays=None):
+    """Count the days in [start, end] the employee would otherwise be working."""
+    calendar = SHIFT_CALENDARS.get(employee.shift, DEFAULT_SHIFT_CALENDAR)
+    if calendar['observes_holidays'] and holidays is None:
+        holidays = holiday_dates(start, end, employee.department_id)
+    holidays = holidays if calendar['observes_holidays'] else set()
+    return sum(
+        1 for day in daterange(start, end)
+        if day.weekday() not in calendar['weekly_off'] and day not in holidays
+    )
+
+
+def overlapping_leaves(employee, start, end, exclude_pk=None):
+    """Pending or approved leaves of the employee that intersect [start, end]."""
+    leaves = LeaveRequest.objects.filter(
+        employee=employee,
+        status__in=BLOCKING_STATUSES,
+        start_date__lte=end,
+        end_date__gte=start,
+    )
+    if exclude_pk:
+        leaves = leaves.exclude(pk=exclude_pk)
+    return list(leaves.order_by('start_date'))
+
+
+def coverage_conflicts(employee, start, end, exclude_pk=None):
+    """
+    Return the days in [start, end] on which adding this employee's leave would take
+    their department/category above the allowed share of staff on leave, as a list of
+    {'date', 'on_leave', 'allowed', 'staff'} dicts.
+    """
+    if not employee.department_id:
+        return []
+
+    ratios = {**DEFAULT_COVERAGE_RATIOS, **getattr(settings, 'LEAVE_COVERAGE_RATIOS', {})}
+    staff = Employee.objects.filter(
+        department_id=employee.department_id,
+        category=employee.category,
+        status__in=['active', 'on_leave'],
+    ).count()
+    allowed = max(1, int(staff * ratios.get(employee.category, 0.25)))
+
+    others = LeaveRequest.objects.filter(
+        employee__department_id=employee.department_id,
+        employee__category=employee.category,
+        status__in=BLOCKING_STATUSES,
+        start_date__lte=end,
+        end_date__gte=start,
+    ).exclude(employee=employee)
+    if exclude_pk:
+        others = others.exclude(pk=exclude_pk)
+
+    # Sweep the window once, collecting distinct employees off per day
+    off_by_day = [set() for _ in range((end - start).days + 1)]
+    for employee_id, leave_start, leave_end in others.values_list('employee_id', 'start_date', 'end_date'):
+        first = (max(leave_start, start) - start).days
+        last = (min(leave_end, end) - start).days
+        for index in range(first, last + 1):
+            off_by_day[index].add(employee_id)
+
+    conflicts = []
+    for index, employees_off in enumerate(off_by_day):
+        on_leave = len(employees_off) + 1
+        if on_leave > allowed:
+            conflicts.append({
+                'date': start + timedelta(days=index),
+                'on_leave': on_leave,
+                'allowed': allowed,
+                'staff': staff,
+            })
+    return conflicts
+
+
+class LeaveCheck:
+    """Result of checking a proposed leave for one employee."""
+
+    def __init__(self, employee, start, end, exclude_pk=None):
+        self.employee = employee
+        self.start = start
+        self.end = end
+        self.working_days = working_days(employee, start, end)
+        self.overlaps = overlapping_leaves(employee, start, end, exclude_pk)
+        self.conflicts = coverage_conflicts(employee, start, end, exclude_pk)
+
+    @property
+    def conflict_summary(self):
+        if not self.conflicts:
+            return ''
+        worst = max(self.conflicts, key=lambda conflict: conflict['on_leave'])
+        return (
+            f"{len(self.conflicts)} day(s) exceed the department's leave limit for "
+            f"{self.employee.get_category_display()} (up to {worst['on_leave']} of {worst['staff']} "
+            f"off on {worst['date']:%b %d}, limit {worst['allowed']})."
+        )
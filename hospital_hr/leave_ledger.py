@@ -0,0 +1,212 @@
+"""
+Leave ledger service for Amrita Hospital HRMS
+
+Every balance change is an append-only LeaveLedger entry; LeaveBalance holds the
+running totals so balances can be read with a single indexed lookup instead of
+aggregating an employee's leave history. Entries and balance updates are always
+written together in one transaction.
+
+A balance's `consumed` column is the net of the entries posted for leave
+requests (consumptions, and the adjustments that reverse them when a leave is
+rejected or cancelled); `accrued` only ever grows from the other entries
+(accruals, manual credits). post_entries and rebuild_balances split entries
+the same way, so a rebuild matches the incrementally maintained totals.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Employee, LeaveBalance, LeaveLedger
+
+
+# Annual entitlement in days per leave type; other leave types are tracked
+# (consumption only) but never accrue
+DEFAULT_ENTITLEMENTS = {
+    'casual': 12,
+    'sick': 12,
+    'earned': 18,
+}
+
+
+# Entries that debit or credit back a leave request (see consumption_entry and
+# settlement_entries); their references start with 'leave:'
+LEAVE_ENTRIES = Q(entry_type='consumption') | Q(reference__startswith='leave:')
+
+
+def get_entitlements():
+    return {**DEFAULT_ENTITLEMENTS, **getattr(settings, 'LEAVE_ENTITLEMENTS', {})}
+
+
+def _for_leave(entry):
+    return entry.entry_type == 'consumption' or entry.reference.startswith('leave:')
+
+
+@transaction.atomic
+def post_entries(entries):
+    """
+    Append ledger entries (unsaved LeaveLedger instances) and apply them to the
+    materialized balances. Returns the created entries.
+    """
+    if not entries:
+        return []
+    LeaveLedger.objects.bulk_create(entries)
+
+    deltas = defaultdict(lambda: [Decimal('0'), Decimal('0')])
+    for entry in entries:
+        days = Decimal(entry.days)
+        key = (entry.employee_id, entry.leave_type)
+        if days >= 0 and not _for_leave(entry):
+            deltas[key][0] += days
+        else:
+            # A credit back of a leave lowers `consumed` rather than raising `accrued`
+            deltas[key][1] -= days
+
+    # Make sure every balance row exists, then apply the deltas in place
+    LeaveBalance.objects.bulk_create(
+        [LeaveBalance(employee_id=employee_id, leave_type=leave_type) for employee_id, leave_type in deltas],
+        ignore_conflicts=True,
+    )
+    now = timezone.now()
+    for (employee_id, leave_type), (credit, debit) in deltas.items():
+        LeaveBalance.objects.filter(employee_id=employee_id, leave_type=leave_type).update(
+            accrued=F('accrued') + credit,
+            consumed=F('consumed') + debit,
+            balance=F('balance') + credit - debit,
+            updated_at=now,
+        )
+    return entries
+
+
+def consumption_entry(leave_request, user=None):
+    return LeaveLedger(
+        employee_id=leave_request.employee_id,
+        leave_type=leave_request.leave_type,
+        entry_type='consumption',
+        days=-Decimal(leave_request.total_days),
+        leave_request=leave_request,
+        reference=f'leave:{leave_request.pk}',
+        note=f'{leave_request.start_date} to {leave_request.end_date}',
+        created_by=user,
+    )
+
+
+def record_consumption(leave_request, user=None):
+    """Debit an approved leave from the employee's balance."""
+    return post_entries([consumption_entry(leave_request, user)])
+
+
+def settlement_entries(leave_requests, user=None):
+    """
+    Unsaved entries that bring the ledger in line with each leave's current
+    status: an approved leave is debited its total_days once, and a leave that
+    is no longer approved (rejected, cancelled, back to pending) is credited
+    back with a reversing adjustment. Leaves already in line get no entries,
+    so this is safe to call after every status change.
+    """
+    leave_requests = list(leave_requests)
+    posted = defaultdict(dict)
+    for row in LeaveLedger.objects.filter(leave_request__in=[leave.pk for leave in leave_requests]).values(
+        'leave_request_id', 'leave_type',
+    ).annotate(net=Sum('days'), entries=Count('id')):
+        posted[row['leave_request_id']][row['leave_type']] = (row['net'], row['entries'])
+
+    entries = []
+    for leave in leave_requests:
+        by_type = posted.get(leave.pk, {})
+        sequence = sum(count for _, count in by_type.values())
+        if not sequence and leave.status == 'approved':
+            entries.append(consumption_entry(leave, user))
+            continue
+        # Debits of another leave type (the type was edited) are reversed in full
+        targets = {leave_type: Decimal('0') for leave_type in by_type}
+        if leave.status == 'approved':
+            targets[leave.leave_type] = -Decimal(leave.total_days)
+        for leave_type, target in targets.items():
+            delta = target - by_type.get(leave_type, (Decimal('0'), 0))[0]
+            if not delta:
+                continue
+            entries.append(LeaveLedger(
+                employee_id=leave.employee_id,
+                leave_type=leave_type,
+                entry_type='adjustment',
+                days=delta,
+                leave_request=leave,
+                reference=f'leave:{leave.pk}:{sequence}',
+                note=f'Leave {leave.get_status_display().lower()}: {leave.start_date} to {leave.end_date}',
+                created_by=user,
+            ))
+            sequence += 1
+    return entries
+
+
+def settle_leave(leave_request, user=None):
+    """Debit or credit back one leave after its status changed (see settlement_entries)."""
+    return post_entries(settlement_entries([leave_request], user))
+
+
+def accrue_month(year, month, employees=None, user=None):
+    """
+    Credit one month of entitlement to every active employee. Idempotent: the
+    reference 'accrual:YYYY-MM' is only ever posted once per employee and type.
+    """
+    reference = f'accrual:{year:04d}-{month:02d}'
+    employees = employees if employees is not None else Employee.objects.filter(status__in=['active', 'on_leave'])
+    employee_ids = list(employees.values_list('id', flat=True))
+
+    entries = []
+    for leave_type, annual_days in get_entitlements().items():
+        already_posted = set(LeaveLedger.objects.filter(
+            reference=reference, leave_type=leave_type, employee_id__in=employee_ids
+        ).values_list('employee_id', flat=True))
+        monthly = (Decimal(annual_days) / 12).quantize(Decimal('0.01'))
+        entries.extend(
+            LeaveLedger(
+                employee_id=employee_id,
+                leave_type=leave_type,
+                entry_type='accrual',
+                days=monthly,
+                reference=reference,
+                note=f'Monthly accrual {year:04d}-{month:02d}',
+                created_by=user,
+            )
+            for employee_id in employee_ids if employee_id not in already_posted
+        )
+    return post_entries(entries)
+
+
+def get_balances(employee):
+    """Return {leave_type: LeaveBalance} for the employee (one query)."""
+    return {balance.leave_type: balance for balance in LeaveBalance.objects.filter(employee=employee)}
+
+
+@transaction.atomic
+def rebuild_balances(employees=None):
+    """Recompute materialized balances from the ledger, e.g. after manual data fixes."""
+    entries = LeaveLedger.objects.all()
+    balances = LeaveBalance.objects.all()
+    if employees is not None:
+        entries = entries.filter(employee__in=employees)
+        balances = balances.filter(employee__in=employees)
+
+    totals = list(entries.values('employee_id', 'leave_type').annotate(
+        credit=Sum('days', filter=Q(days__gte=0) & ~LEAVE_ENTRIES),
+        debit=Sum('days', filter=Q(days__lt=0) | LEAVE_ENTRIES),
+    ))
+    balances.delete()
+    LeaveBalance.objects.bulk_create([
+        LeaveBalance(
+            employee_id=row['employee_id'],
+            leave_type=row['leave_type'],
+            accrued=row['credit'] or 0,
+            consumed=-(row['debit'] or 0),
+            balance=(row['credit'] or 0) + (row['debit'] or 0),
+        )
+        for row in totals
+    ], batch_size=1000)
+    return len(totals)
+
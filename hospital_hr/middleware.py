@@ -0,0 +1,91 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .audit import audit_context, flush
+from .principal import get_principal
+from .profiling import QueryRecorder
+
+
+logger = logging.getLogger('hospital_hr.profiling')
+
+
+class QueryProfilingMiddleware:
+    """
+    Records query count, DB time, duplicate queries and render time per request.
+    Results are exposed via the Server-Timing header and a structured log line.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_PROFILING_ENABLED', False):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        # Set by the query_profile context processor when a template starts rendering
+        render_start = getattr(request, '_profiling_render_start', None)
+        render_ms = (time.perf_counter() - render_start) * 1000 if render_start else 0
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={recorder.duration_ms};desc="{recorder.count} queries"',
+            f'dup;desc="{recorder.duplicate_count} duplicate queries"',
+            f'render;dur={render_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        logger.info(json.dumps({
+            'event': 'request_profile',
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': recorder.duration_ms,
+            'render_ms': round(render_ms, 2),
+            'total_ms': round(total_ms, 2),
+            'duplicates': recorder.duplicates(),
+        }))
+        return response
+
+
+class AuditMiddleware:
+    """
+    Collects the audit records of a request and writes them with one bulk_create
+    once the response is ready (see hospital_hr.audit).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_context() as records:
+            try:
+                return self.get_response(request)
+            finally:
+                # Resolve the user only now: login and logout views change it mid-request
+                flush(records, getattr(request, 'user', None), request.path)
+                records.clear()
+
+
+class PrincipalMiddleware:
+    """
+    Attaches request.principal (see hospital_hr.principal), resolved on first
+    use. Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.principal = SimpleLazyObject(lambda: get_principal(request.user))
+        return self.get_response(request)
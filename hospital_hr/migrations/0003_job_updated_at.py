@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0002_attendance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
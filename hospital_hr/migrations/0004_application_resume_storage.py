@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:17
+
+from django.db import migrations, models
+import hospital_hr.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0003_job_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(storage=hospital_hr.storage.ContentAddressedStorage(), upload_to='resumes/'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0004_application_resume_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', 'status', 'start_date', 'end_date'], name='hospital_hr_employe_f7b7d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['status', 'start_date', 'end_date'], name='hospital_hr_status_d87d68_idx'),
+        ),
+        migrations.AddField(
+            model_name='holiday',
+            name='department',
+            field=models.ForeignKey(blank=True, help_text='Leave empty for a hospital-wide holiday', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='holidays', to='hospital_hr.department'),
+        ),
+        migrations.AddIndex(
+            model_name='holiday',
+            index=models.Index(fields=['date'], name='hospital_hr_date_7c9b89_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='holiday',
+            unique_together={('date', 'department')},
+        ),
+    ]
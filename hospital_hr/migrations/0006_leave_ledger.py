@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0005_leave_indexes_holiday'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('leave_type', models.CharField(choices=[('sick', 'Sick Leave'), ('casual', 'Casual Leave'), ('earned', 'Earned Leave'), ('maternity', 'Maternity Leave'), ('paternity', 'Paternity Leave'), ('emergency', 'Emergency Leave')], max_length=20)),
+                ('accrued', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('consumed', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_balances', to='hospital_hr.employee')),
+            ],
+            options={
+                'ordering': ['leave_type'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaveLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('leave_type', models.CharField(choices=[('sick', 'Sick Leave'), ('casual', 'Casual Leave'), ('earned', 'Earned Leave'), ('maternity', 'Maternity Leave'), ('paternity', 'Paternity Leave'), ('emergency', 'Emergency Leave')], max_length=20)),
+                ('entry_type', models.CharField(choices=[('accrual', 'Accrual'), ('consumption', 'Consumption'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('days', models.DecimalField(decimal_places=2, help_text='Positive for credits, negative for debits', max_digits=6)),
+                ('reference', models.CharField(blank=True, help_text='Idempotency key, e.g. accrual:2026-01', max_length=50)),
+                ('note', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_ledger', to='hospital_hr.employee')),
+                ('leave_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='hospital_hr.leaverequest')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['employee', 'leave_type', 'created_at'], name='hospital_hr_employe_a6f8bc_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaveledger',
+            constraint=models.UniqueConstraint(condition=models.Q(('reference', ''), _negated=True), fields=('employee', 'leave_type', 'reference'), name='unique_leave_ledger_reference'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='leavebalance',
+            unique_together={('employee', 'leave_type')},
+        ),
+    ]
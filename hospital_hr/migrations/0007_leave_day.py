@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+from datetime import timedelta
+
+
+def populate_leave_days(apps, schema_editor):
+    LeaveRequest = apps.get_model('hospital_hr', 'LeaveRequest')
+    LeaveDay = apps.get_model('hospital_hr', 'LeaveDay')
+    
+    batch = []
+    leaves = LeaveRequest.objects.filter(status='approved').values_list(
+        'id', 'employee_id', 'leave_type', 'start_date', 'end_date'
+    )
+    for leave_id, employee_id, leave_type, start, end in leaves.iterator(chunk_size=2000):
+        for offset in range((end - start).days + 1):
+            batch.append(LeaveDay(
+                leave_request_id=leave_id,
+                employee_id=employee_id,
+                leave_type=leave_type,
+                date=start + timedelta(days=offset),
+            ))
+        if len(batch) >= 5000:
+            LeaveDay.objects.bulk_create(batch)
+            batch = []
+    LeaveDay.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0006_leave_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('leave_type', models.CharField(choices=[('sick', 'Sick Leave'), ('casual', 'Casual Leave'), ('earned', 'Earned Leave'), ('maternity', 'Maternity Leave'), ('paternity', 'Paternity Leave'), ('emergency', 'Emergency Leave')], max_length=20)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_days', to='hospital_hr.employee')),
+                ('leave_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_days', to='hospital_hr.leaverequest')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date', 'employee'], name='hospital_hr_date_b40bbb_idx'), models.Index(fields=['employee', 'date'], name='hospital_hr_employe_eadaf2_idx')],
+                'unique_together': {('leave_request', 'date')},
+            },
+        ),
+        migrations.RunPython(populate_leave_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0007_leave_day'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShiftAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('shift', models.CharField(choices=[('morning', 'Morning (6 AM - 2 PM)'), ('afternoon', 'Afternoon (2 PM - 10 PM)'), ('night', 'Night (10 PM - 6 AM)'), ('general', 'General (9 AM - 5 PM)')], max_length=20)),
+                ('source', models.CharField(choices=[('roster', 'Generated Roster'), ('replan', 'Re-planned'), ('manual', 'Manual')], default='roster', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shift_assignments', to='hospital_hr.department')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shift_assignments', to='hospital_hr.employee')),
+            ],
+            options={
+                'ordering': ['date', 'shift'],
+                'indexes': [models.Index(fields=['department', 'date', 'shift'], name='hospital_hr_departm_4a1add_idx')],
+                'unique_together': {('employee', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0008_shift_assignment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department_id', models.BigIntegerField(null=True)),
+                ('date', models.DateField()),
+                ('status', models.CharField(blank=True, choices=[('present', 'Present'), ('absent', 'Absent'), ('late', 'Late'), ('half_day', 'Half Day'), ('on_leave', 'On Leave')], max_length=20)),
+                ('shift', models.CharField(blank=True, choices=[('morning', 'Morning (6 AM - 2 PM)'), ('afternoon', 'Afternoon (2 PM - 10 PM)'), ('night', 'Night (10 PM - 6 AM)'), ('general', 'General (9 AM - 5 PM)'), ('rotating', 'Rotating Shifts')], max_length=20)),
+                ('check_in_time', models.TimeField(blank=True, null=True)),
+                ('check_out_time', models.TimeField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='hospital_hr.employee')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['date', 'id'], name='hospital_hr_date_044943_idx'), models.Index(fields=['created_at'], name='hospital_hr_created_0fdcf3_idx')],
+            },
+        ),
+    ]
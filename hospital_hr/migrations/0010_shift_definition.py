@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:32
+
+from datetime import time
+
+from django.db import migrations, models
+
+
+# The windows advertised in Attendance.SHIFT_CHOICES; rotating staff have no fixed window
+DEFAULT_SHIFTS = [
+    ('morning', time(6), time(14)),
+    ('afternoon', time(14), time(22)),
+    ('night', time(22), time(6)),
+    ('general', time(9), time(17)),
+]
+
+
+def create_shift_definitions(apps, schema_editor):
+    ShiftDefinition = apps.get_model('hospital_hr', 'ShiftDefinition')
+    ShiftDefinition.objects.bulk_create([
+        ShiftDefinition(code=code, start_time=start, end_time=end, crosses_midnight=end <= start)
+        for code, start, end in DEFAULT_SHIFTS
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0009_attendance_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShiftDefinition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(choices=[('morning', 'Morning (6 AM - 2 PM)'), ('afternoon', 'Afternoon (2 PM - 10 PM)'), ('night', 'Night (10 PM - 6 AM)'), ('general', 'General (9 AM - 5 PM)'), ('rotating', 'Rotating Shifts')], max_length=20, unique=True)),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('crosses_midnight', models.BooleanField(default=False, help_text='Set automatically when the shift ends on the next day')),
+                ('grace_minutes', models.PositiveIntegerField(default=10, help_text='Arrivals and departures within this many minutes are on time')),
+                ('half_day_minutes', models.PositiveIntegerField(default=240, help_text='Less time worked than this counts as a half day')),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['start_time'],
+            },
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='early_leave_minutes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='late_minutes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='overtime_minutes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(create_shift_definitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:35
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def _seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def populate_worked_minutes(apps, schema_editor):
+    Attendance = apps.get_model('hospital_hr', 'Attendance')
+
+    # Group ids by result so each distinct value is one UPDATE ... WHERE id IN (...)
+    by_minutes = defaultdict(list)
+    rows = Attendance.objects.filter(
+        check_in_time__isnull=False, check_out_time__isnull=False
+    ).values_list('id', 'check_in_time', 'check_out_time')
+    for attendance_id, check_in, check_out in rows.iterator(chunk_size=5000):
+        by_minutes[(_seconds(check_out) - _seconds(check_in)) % 86400 // 60].append(attendance_id)
+
+    for minutes, ids in by_minutes.items():
+        for offset in range(0, len(ids), 900):
+            Attendance.objects.filter(id__in=ids[offset:offset + 900]).update(worked_minutes=minutes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0010_shift_definition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='worked_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_worked_minutes, migrations.RunPython.noop),
+    ]
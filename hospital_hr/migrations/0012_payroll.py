@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0011_attendance_worked_minutes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('finalized', 'Finalized')], default='draft', max_length=20)),
+                ('days_in_month', models.PositiveIntegerField()),
+                ('employee_count', models.PositiveIntegerField(default=0)),
+                ('total_gross', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_deductions', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_net', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payroll_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-year', '-month', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Payslip',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('monthly_salary', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('payable_days', models.DecimalField(decimal_places=1, max_digits=5)),
+                ('present_days', models.PositiveIntegerField(default=0)),
+                ('half_days', models.PositiveIntegerField(default=0)),
+                ('absent_days', models.PositiveIntegerField(default=0)),
+                ('paid_leave_days', models.PositiveIntegerField(default=0)),
+                ('unpaid_leave_days', models.PositiveIntegerField(default=0)),
+                ('night_shifts', models.PositiveIntegerField(default=0)),
+                ('overtime_minutes', models.PositiveIntegerField(default=0)),
+                ('basic_pay', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('night_allowance', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('overtime_pay', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('deductions', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('gross_pay', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('net_pay', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('department', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payslips', to='hospital_hr.department')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payslips', to='hospital_hr.employee')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payslips', to='hospital_hr.payrollrun')),
+            ],
+            options={
+                'ordering': ['employee__employee_id'],
+                'indexes': [models.Index(fields=['employee', 'run'], name='hospital_hr_employe_cc9d7d_idx')],
+                'unique_together': {('run', 'employee')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payrollrun',
+            index=models.Index(fields=['year', 'month'], name='hospital_hr_year_adb1d1_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:44
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0012_payroll'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['updated_at', 'id'], name='hospital_hr_updated_8b5958_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['updated_at', 'id'], name='hospital_hr_updated_c6f8c3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['updated_at', 'id'], name='hospital_hr_updated_03e573_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['updated_at', 'id'], name='hospital_hr_updated_913eea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['updated_at', 'id'], name='hospital_hr_updated_325631_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['entity', 'deleted_at', 'id'], name='hospital_hr_entity_19a66a_idx'),
+        ),
+    ]
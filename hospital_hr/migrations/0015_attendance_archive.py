@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0014_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(unique=True)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('checksum', models.CharField(max_length=64)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendance',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('shift', models.CharField(choices=[('morning', 'Morning (6 AM - 2 PM)'), ('afternoon', 'Afternoon (2 PM - 10 PM)'), ('night', 'Night (10 PM - 6 AM)'), ('general', 'General (9 AM - 5 PM)'), ('rotating', 'Rotating Shifts')], default='general', max_length=20)),
+                ('check_in_time', models.TimeField(blank=True, null=True)),
+                ('check_out_time', models.TimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('present', 'Present'), ('absent', 'Absent'), ('late', 'Late'), ('half_day', 'Half Day'), ('on_leave', 'On Leave')], default='present', max_length=20)),
+                ('late_minutes', models.PositiveIntegerField(default=0)),
+                ('early_leave_minutes', models.PositiveIntegerField(default=0)),
+                ('overtime_minutes', models.PositiveIntegerField(default=0)),
+                ('worked_minutes', models.PositiveIntegerField(default=0)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='hospital_hr.department')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='hospital_hr.employee')),
+                ('marked_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived Attendance Records',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date', 'department'], name='hospital_hr_date_cb4fd3_idx')],
+                'unique_together': {('employee', 'date')},
+            },
+        ),
+    ]
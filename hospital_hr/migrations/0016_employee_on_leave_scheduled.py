@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:22
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_scheduled_leave(apps, schema_editor):
+    # The scheduler used to return every 'on_leave' employee without a leave day to
+    # 'active', so only those covered by an approved leave today are its own
+    Employee = apps.get_model('hospital_hr', 'Employee')
+    LeaveDay = apps.get_model('hospital_hr', 'LeaveDay')
+    covered = LeaveDay.objects.filter(date=timezone.localdate()).values('employee_id')
+    Employee.objects.filter(status='on_leave', id__in=covered).update(on_leave_scheduled=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hospital_hr', '0015_attendance_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='on_leave_scheduled',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(mark_scheduled_leave, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,27 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, RegexValidator
+from django.utils import timezone
+
+from .storage import resume_storage
+
+
+class AuditedModel(models.Model):
+    """
+    Keeps the values a row was loaded with, for the audit log to diff against on
+    save (see hospital_hr/audit.py). Storing the loaded tuple as-is costs nothing
+    on reads that never save, such as exports and reports.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = (field_names, values)
+        return instance
 
 
 class User(AbstractUser):
@@ -59,6 +80,7 @@ class Department(models.Model):
     
     class Meta:
         ordering = ['name']
+        indexes = [models.Index(fields=['updated_at', 'id'])]  # change feed keyset
     
     def __str__(self):
         return f"{self.name} ({self.code})"
@@ -67,7 +89,7 @@ class Department(models.Model):
         return self.employees.filter(status='active').count()
 
 
-class Employee(models.Model):
+class Employee(AuditedModel):
     CATEGORY_CHOICES = [
         ('medical', 'Medical Staff'),
         ('nursing', 'Nursing Staff'),
@@ -114,16 +136,28 @@ class Employee(models.Model):
     address = models.TextField(blank=True)
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    # Set while 'on_leave' comes from the status scheduler (an approved leave), which
+    # then also ends it; statuses set by hand are never changed by the scheduler
+    on_leave_scheduled = models.BooleanField(default=False, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-date_of_joining']
+        indexes = [models.Index(fields=['updated_at', 'id'])]  # change feed keyset
     
     def __str__(self):
         return f"{self.employee_id} - {self.user.get_full_name()} ({self.designation})"
     
+    def save(self, *args, **kwargs):
+        if self.status != 'on_leave':
+            self.on_leave_scheduled = False
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'on_leave_scheduled'}
+        super().save(*args, **kwargs)
+    
     def get_full_name(self):
         return self.user.get_full_name()
 
@@ -171,6 +205,7 @@ class Job(models.Model):
     posted_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='posted_jobs')
     posted_date = models.DateTimeField(auto_now_add=True)
     closing_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-posted_date']
@@ -211,7 +246,7 @@ class Application(models.Model):
     current_employer = models.CharField(max_length=200, blank=True)
     current_designation = models.CharField(max_length=100, blank=True)
     
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', storage=resume_storage)
     cover_letter = models.TextField(blank=True)
     
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='submitted')
@@ -233,12 +268,13 @@ class Application(models.Model):
     class Meta:
         ordering = ['-applied_date']
         unique_together = ['job', 'email']
+        indexes = [models.Index(fields=['updated_at', 'id'])]  # change feed keyset
     
     def __str__(self):
         return f"{self.applicant_name} - {self.job.title}"
 
 
-class LeaveRequest(models.Model):
+class LeaveRequest(AuditedModel):
     LEAVE_TYPE_CHOICES = [
         ('sick', 'Sick Leave'),
         ('casual', 'Casual Leave'),
@@ -281,12 +317,145 @@ class LeaveRequest(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Overlap checks for one employee and department-wide interval scans
+            models.Index(fields=['employee', 'status', 'start_date', 'end_date']),
+            models.Index(fields=['status', 'start_date', 'end_date']),
+            # Change feed keyset
+            models.Index(fields=['updated_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.employee.get_full_name()} - {self.leave_type} ({self.start_date} to {self.end_date})"
 
 
-class Attendance(models.Model):
+class LeaveLedger(models.Model):
+    """Append-only record of every change to an employee's leave balance."""
+    ENTRY_TYPE_CHOICES = [
+        ('accrual', 'Accrual'),
+        ('consumption', 'Consumption'),
+        ('adjustment', 'Adjustment'),
+    ]
+    
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='leave_ledger')
+    leave_type = models.CharField(max_length=20, choices=LeaveRequest.LEAVE_TYPE_CHOICES)
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPE_CHOICES)
+    days = models.DecimalField(max_digits=6, decimal_places=2, help_text='Positive for credits, negative for debits')
+    leave_request = models.ForeignKey(
+        LeaveRequest,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries'
+    )
+    reference = models.CharField(max_length=50, blank=True, help_text='Idempotency key, e.g. accrual:2026-01')
+    note = models.CharField(max_length=200, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['employee', 'leave_type', 'created_at'])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'leave_type', 'reference'],
+                condition=~models.Q(reference=''),
+                name='unique_leave_ledger_reference',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.leave_type} {self.entry_type} {self.days:+}"
+
+
+class LeaveBalance(models.Model):
+    """Materialized per-employee, per-leave-type sum of LeaveLedger entries."""
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='leave_balances')
+    leave_type = models.CharField(max_length=20, choices=LeaveRequest.LEAVE_TYPE_CHOICES)
+    accrued = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    consumed = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    balance = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['leave_type']
+        unique_together = ['employee', 'leave_type']
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.leave_type}: {self.balance}"
+
+
+class LeaveDay(models.Model):
+    """
+    One row per employee per day of an approved leave, so "who is on leave on X"
+    and month calendars are single indexed lookups instead of range scans.
+    Maintained by hospital_hr.leave_calendar.
+    """
+    date = models.DateField()
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='leave_days')
+    leave_request = models.ForeignKey(LeaveRequest, on_delete=models.CASCADE, related_name='leave_days')
+    leave_type = models.CharField(max_length=20, choices=LeaveRequest.LEAVE_TYPE_CHOICES)
+    
+    class Meta:
+        ordering = ['date']
+        unique_together = ['leave_request', 'date']
+        indexes = [
+            models.Index(fields=['date', 'employee']),
+            models.Index(fields=['employee', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.date} ({self.leave_type})"
+
+
+class Holiday(models.Model):
+    date = models.DateField()
+    name = models.CharField(max_length=100)
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='holidays',
+        help_text='Leave empty for a hospital-wide holiday'
+    )
+    
+    class Meta:
+        ordering = ['date']
+        unique_together = ['date', 'department']
+        indexes = [models.Index(fields=['date'])]
+    
+    def __str__(self):
+        return f"{self.name} ({self.date})"
+
+
+class ShiftAssignment(models.Model):
+    """An employee's scheduled shift on one day, produced by the roster engine or set by hand."""
+    SHIFT_CHOICES = [choice for choice in Employee.SHIFT_CHOICES if choice[0] != 'rotating']
+    
+    SOURCE_CHOICES = [
+        ('roster', 'Generated Roster'),
+        ('replan', 'Re-planned'),
+        ('manual', 'Manual'),
+    ]
+    
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='shift_assignments')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='shift_assignments')
+    date = models.DateField()
+    shift = models.CharField(max_length=20, choices=SHIFT_CHOICES)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='roster')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['date', 'shift']
+        unique_together = ['employee', 'date']
+        indexes = [models.Index(fields=['department', 'date', 'shift'])]
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.date} {self.shift}"
+
+
+class Attendance(AuditedModel):
     STATUS_CHOICES = [
         ('present', 'Present'),
         ('absent', 'Absent'),
@@ -310,6 +479,12 @@ class Attendance(models.Model):
     check_in_time = models.TimeField(null=True, blank=True)
     check_out_time = models.TimeField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='present')
+    # Computed from the shift definition by hospital_hr.shift_compliance
+    late_minutes = models.PositiveIntegerField(default=0)
+    early_leave_minutes = models.PositiveIntegerField(default=0)
+    overtime_minutes = models.PositiveIntegerField(default=0)
+    # Kept in step with the punch times on save so hours can be summed in SQL
+    worked_minutes = models.PositiveIntegerField(default=0, editable=False)
     marked_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='marked_attendance')
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -319,18 +494,231 @@ class Attendance(models.Model):
         ordering = ['-date', 'employee__user__first_name']
         unique_together = ['employee', 'date']
         verbose_name_plural = 'Attendance Records'
+        indexes = [models.Index(fields=['updated_at', 'id'])]  # change feed keyset
     
     def __str__(self):
         return f"{self.employee.get_full_name()} - {self.date} ({self.get_status_display()})"
     
+    @staticmethod
+    def minutes_between(check_in_time, check_out_time):
+        """Minutes worked between two punch times; a check-out before check-in is on the next day."""
+        if not (check_in_time and check_out_time):
+            return 0
+        seconds = (
+            (check_out_time.hour - check_in_time.hour) * 3600
+            + (check_out_time.minute - check_in_time.minute) * 60
+            + (check_out_time.second - check_in_time.second)
+        )
+        if seconds < 0:
+            seconds += 24 * 3600
+        return seconds // 60
+    
+    def save(self, *args, **kwargs):
+        self.worked_minutes = self.minutes_between(self.check_in_time, self.check_out_time)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'check_in_time', 'check_out_time'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'worked_minutes'}
+        super().save(*args, **kwargs)
+    
     def get_working_hours(self):
-        if self.check_in_time and self.check_out_time:
-            from datetime import datetime, timedelta
-            check_in = datetime.combine(self.date, self.check_in_time)
-            check_out = datetime.combine(self.date, self.check_out_time)
-            if check_out < check_in:
-                check_out += timedelta(days=1)
-            diff = check_out - check_in
-            hours = diff.total_seconds() / 3600
-            return round(hours, 2)
-        return 0
+        return round(self.worked_minutes / 60, 2)
+
+
+
+class ArchivedAttendance(models.Model):
+    """
+    Attendance of a closed year, moved out of the live table by
+    hospital_hr.attendance_archive. Same columns and ids as Attendance.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    shift = models.CharField(max_length=20, choices=Attendance.SHIFT_CHOICES, default='general')
+    check_in_time = models.TimeField(null=True, blank=True)
+    check_out_time = models.TimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Attendance.STATUS_CHOICES, default='present')
+    late_minutes = models.PositiveIntegerField(default=0)
+    early_leave_minutes = models.PositiveIntegerField(default=0)
+    overtime_minutes = models.PositiveIntegerField(default=0)
+    worked_minutes = models.PositiveIntegerField(default=0)
+    marked_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['employee', 'date']
+        indexes = [models.Index(fields=['date', 'department'])]
+        verbose_name_plural = 'Archived Attendance Records'
+    
+    def __str__(self):
+        return f"{self.employee_id} - {self.date} ({self.get_status_display()}, archived)"
+    
+    def get_working_hours(self):
+        return round(self.worked_minutes / 60, 2)
+
+
+class AttendanceArchive(models.Model):
+    """One archived year of attendance: how many rows moved and their checksum."""
+    year = models.PositiveIntegerField(unique=True)
+    row_count = models.PositiveIntegerField(default=0)
+    # sha256 over the archived rows in id order (see attendance_archive.checksum)
+    checksum = models.CharField(max_length=64)
+    archived_at = models.DateTimeField(default=timezone.now)
+    verified_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-year']
+    
+    def __str__(self):
+        return f"Attendance {self.year} ({self.row_count} rows)"
+
+class AttendanceEvent(models.Model):
+    """
+    Append-only change log of Attendance rows. The auto-increment id is the cursor
+    live boards resume from (see hospital_hr.attendance_feed).
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='+')
+    department_id = models.BigIntegerField(null=True)
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Attendance.STATUS_CHOICES, blank=True)
+    shift = models.CharField(max_length=20, choices=Attendance.SHIFT_CHOICES, blank=True)
+    check_in_time = models.TimeField(null=True, blank=True)
+    check_out_time = models.TimeField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['date', 'id']),
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.pk} {self.employee_id} {self.date} {self.status or 'deleted'}"
+
+
+class ShiftDefinition(models.Model):
+    """Working window and tolerances of a shift, used to compute late/early/overtime/half day."""
+    code = models.CharField(max_length=20, choices=Attendance.SHIFT_CHOICES, unique=True)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    crosses_midnight = models.BooleanField(default=False, help_text='Set automatically when the shift ends on the next day')
+    grace_minutes = models.PositiveIntegerField(default=10, help_text='Arrivals and departures within this many minutes are on time')
+    half_day_minutes = models.PositiveIntegerField(default=240, help_text='Less time worked than this counts as a half day')
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['start_time']
+    
+    def __str__(self):
+        return f"{self.get_code_display()} ({self.start_time:%H:%M}-{self.end_time:%H:%M})"
+    
+    def save(self, *args, **kwargs):
+        self.crosses_midnight = self.end_time <= self.start_time
+        super().save(*args, **kwargs)
+
+
+class PayrollRun(models.Model):
+    """One month's payroll computation (see hospital_hr.payroll); its payslips hang off it."""
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('finalized', 'Finalized'),
+    ]
+    
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
+    days_in_month = models.PositiveIntegerField()
+    employee_count = models.PositiveIntegerField(default=0)
+    total_gross = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_deductions = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_net = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='payroll_runs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-year', '-month', '-created_at']
+        indexes = [models.Index(fields=['year', 'month'])]
+    
+    def __str__(self):
+        return f"Payroll {self.year}-{self.month:02d} ({self.get_status_display()})"
+
+
+class Payslip(models.Model):
+    run = models.ForeignKey(PayrollRun, on_delete=models.CASCADE, related_name='payslips')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='payslips')
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, related_name='payslips')
+    monthly_salary = models.DecimalField(max_digits=10, decimal_places=2)
+    payable_days = models.DecimalField(max_digits=5, decimal_places=1)
+    present_days = models.PositiveIntegerField(default=0)
+    half_days = models.PositiveIntegerField(default=0)
+    absent_days = models.PositiveIntegerField(default=0)
+    paid_leave_days = models.PositiveIntegerField(default=0)
+    unpaid_leave_days = models.PositiveIntegerField(default=0)
+    night_shifts = models.PositiveIntegerField(default=0)
+    overtime_minutes = models.PositiveIntegerField(default=0)
+    basic_pay = models.DecimalField(max_digits=12, decimal_places=2)
+    night_allowance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overtime_pay = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    deductions = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    gross_pay = models.DecimalField(max_digits=12, decimal_places=2)
+    net_pay = models.DecimalField(max_digits=12, decimal_places=2)
+    
+    class Meta:
+        ordering = ['employee__employee_id']
+        unique_together = ['run', 'employee']
+        indexes = [models.Index(fields=['employee', 'run'])]
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.run.year}-{self.run.month:02d}"
+
+
+class Tombstone(models.Model):
+    """
+    Deleted row of an entity in the change feed (see hospital_hr.change_feed),
+    written by the post_delete signals so pollers learn about deletes. Deleted
+    Jobs are recorded too, for the careers pages' Last-Modified (page_cache).
+    """
+    entity = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [models.Index(fields=['entity', 'deleted_at', 'id'])]
+    
+    def __str__(self):
+        return f"{self.entity} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class AuditLog(models.Model):
+    """Field-level change of an audited record (see hospital_hr.audit)."""
+    ACTION_CHOICES = [
+        ('create', 'Created'),
+        ('update', 'Updated'),
+        ('delete', 'Deleted'),
+    ]
+    
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # {field: [old, new]}; foreign keys by id
+    changes = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    path = models.CharField(max_length=255, blank=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            models.Index(fields=['model', 'object_id', 'timestamp']),
+            models.Index(fields=['timestamp']),
+        ]
+    
+    def __str__(self):
+        return f"{self.model} #{self.object_id} {self.action} {self.timestamp:%Y-%m-%d %H:%M}"
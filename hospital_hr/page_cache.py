@@ -0,0 +1,106 @@
+"""
+Full-page caching for the public careers site (landing page and job listings).
+
+Pages are cached per URL and filter values for anonymous visitors only. The cache
+key, ETag and Last-Modified all derive from the careers "state" (latest Job /
+Department change), so any change to a Job or Department invalidates every page.
+
+Last-Modified is read from the data rather than from the time the state was
+cached: the latest updated_at of Jobs and Departments, or deleted_at of the
+Tombstones of deleted ones. It therefore never moves backwards when the cached state expires
+and is rebuilt, which would make If-Modified-Since answer 304 for stale pages.
+"""
+
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import Department, Job, Tombstone
+
+
+STATE_CACHE_KEY = 'careers:state'
+
+# Tombstone entities of deleted careers data ('departments' is also a change feed entity)
+TOMBSTONE_ENTITIES = ('departments', 'jobs')
+
+# Last-Modified while there has never been any careers data
+EPOCH = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _timeout(name, default):
+    return getattr(settings, name, default)
+
+
+def careers_state():
+    """
+    Return {'last_modified': datetime, 'version': str} describing the careers data.
+    The version also includes row counts so that deletions change it.
+    """
+    state = cache.get(STATE_CACHE_KEY)
+    if state is None:
+        jobs = Job.objects.aggregate(latest=Max('updated_at'), total=Count('id'))
+        departments = Department.objects.aggregate(latest=Max('updated_at'), total=Count('id'))
+        deleted = Tombstone.objects.filter(entity__in=TOMBSTONE_ENTITIES).aggregate(latest=Max('deleted_at'))
+        timestamps = [value for value in (jobs['latest'], departments['latest'], deleted['latest']) if value]
+        last_modified = max(timestamps) if timestamps else EPOCH
+        state = {
+            'last_modified': last_modified,
+            'version': f"{last_modified.timestamp()}:{jobs['total']}:{departments['total']}",
+        }
+        # Bounded lifetime so processes with a local-memory cache converge after a change
+        cache.set(STATE_CACHE_KEY, state, _timeout('CAREERS_STATE_CACHE_TIMEOUT', 60))
+    return state
+
+
+def invalidate_careers_cache():
+    """Called from the Job/Department signals; the state is rebuilt from the changed data."""
+    cache.delete(STATE_CACHE_KEY)
+
+
+def record_job_deletion(job):
+    """Called from the Job post_delete signal so the deletion still counts towards Last-Modified."""
+    Tombstone.objects.create(entity='jobs', object_id=job.pk)
+
+
+def cache_public_page(filters=()):
+    """
+    Cache a public page for anonymous GET/HEAD requests, keyed by path and the given
+    query parameters. Sets ETag/Last-Modified and answers conditional GETs with 304.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            state = careers_state()
+            filter_values = '&'.join(f'{name}={request.GET.get(name, "")}' for name in filters)
+            digest = hashlib.md5(
+                f"{state['version']}|{request.path}|{filter_values}".encode()
+            ).hexdigest()
+            etag = quote_etag(digest)
+            last_modified = int(state['last_modified'].timestamp())
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                cache_key = f'careers:page:{digest}'
+                response = cache.get(cache_key)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    cache.set(cache_key, response, _timeout('CAREERS_CACHE_TIMEOUT', 300))
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+            return response
+
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,227 @@
+"""
+Monthly payroll engine for Amrita Hospital HRMS
+
+A month of attendance and approved leave is loaded into employees x days NumPy
+arrays, and every payslip figure is computed in whole-array passes:
+
+    payable days   = days in month - days before joining - absences
+                     - unpaid leave - 0.5 x half days
+    basic pay      = monthly salary / days in month x payable days
+    night allowance = nights worked x daily rate x night_differential
+    overtime pay   = overtime hours x (daily rate / hours_per_day) x overtime_multiplier
+
+Approved leave (LeaveDay) takes precedence over the attendance mark for that
+day. Unmarked days (weekly offs, unrostered days) are paid. Overtime minutes
+come from the shift compliance engine. Runs are saved as a PayrollRun with one
+Payslip per employee via bulk_create; re-running a month replaces its draft,
+and a finalized month cannot be re-run.
+"""
+
+import calendar
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .attendance_archive import attendance_sources
+from .models import Employee, LeaveDay, PayrollRun, Payslip
+
+
+DEFAULT_PAYROLL_RULES = {
+    'night_differential': 0.10,
+    'overtime_multiplier': 1.5,
+    'hours_per_day': 8,
+    'unpaid_leave_types': (),
+}
+
+PAYABLE_STATUSES = ('active', 'on_leave')
+
+# Day codes in the status matrix
+UNMARKED, WORKED, HALF, ABSENT, LEAVE = range(5)
+STATUS_CODES = {'present': WORKED, 'late': WORKED, 'half_day': HALF, 'absent': ABSENT, 'on_leave': LEAVE}
+
+# Day codes in the leave matrix
+NO_LEAVE, PAID_LEAVE, UNPAID_LEAVE = range(3)
+
+
+def get_rules():
+    return {**DEFAULT_PAYROLL_RULES, **getattr(settings, 'PAYROLL_RULES', {})}
+
+
+class MonthData:
+    """Payable employees and their month of attendance/leave as employees x days arrays."""
+
+    def __init__(self, year, month):
+        self.year, self.month = year, month
+        self.first = date(year, month, 1)
+        self.days = calendar.monthrange(year, month)[1]
+        self.last = self.first.replace(day=self.days)
+
+    def load(self, unpaid_leave_types=()):
+        rows = list(Employee.objects.filter(
+            status__in=PAYABLE_STATUSES, date_of_joining__lte=self.last,
+        ).order_by('id').values_list('id', 'department_id', 'salary', 'date_of_joining'))
+        count = len(rows)
+        ids, department_ids, salaries, joined = zip(*rows) if rows else ((), (), (), ())
+
+        self.ids = np.fromiter(ids, dtype=np.int64, count=count)
+        self.department_ids = list(department_ids)
+        self.salary = np.fromiter(salaries, dtype=np.float64, count=count)
+        self.joined_offset = np.fromiter(
+            (max((joined_on - self.first).days, 0) for joined_on in joined), dtype=np.int32, count=count,
+        )
+
+        self.status = np.zeros((count, self.days), dtype=np.int8)
+        self.night = np.zeros((count, self.days), dtype=bool)
+        self.leave = np.zeros((count, self.days), dtype=np.int8)
+        self.overtime = np.zeros(count, dtype=np.int64)
+
+        attendance = [
+            row
+            for source in attendance_sources(self.first, self.last)
+            for row in source.order_by().values_list('employee_id', 'date', 'status', 'shift', 'overtime_minutes')
+        ]
+        rows, days, (statuses, shifts, overtime) = self._positions(attendance, 5)
+        self.status[rows, days] = np.fromiter((STATUS_CODES.get(s, UNMARKED) for s in statuses), dtype=np.int8)
+        self.night[rows, days] = shifts == 'night'
+        self.overtime = np.bincount(rows, weights=overtime, minlength=count).astype(np.int64)
+
+        leave_days = LeaveDay.objects.filter(date__range=(self.first, self.last)).order_by().values_list(
+            'employee_id', 'date', 'leave_type',
+        )
+        rows, days, (leave_types,) = self._positions(leave_days, 3)
+        self.leave[rows, days] = np.where(np.isin(leave_types, list(unpaid_leave_types)), UNPAID_LEAVE, PAID_LEAVE)
+        return self
+
+    def _positions(self, queryset, width):
+        """
+        Matrix (row, day) positions of values_list rows shaped (employee_id, date, ...),
+        keeping only payable employees, plus their remaining columns as arrays.
+        """
+        rows = list(queryset)
+        columns = list(zip(*rows)) if rows else [()] * width
+        employees = np.array(columns[0], dtype=np.int64)
+        days = np.array([day.day - 1 for day in columns[1]], dtype=np.int64)
+        matrix_rows, keep = self._rows(employees)
+        return matrix_rows, days[keep], [np.array(column)[keep] for column in columns[2:]]
+
+    def _rows(self, employee_ids):
+        """Matrix row of each employee id, and a mask of ids that belong to payable employees."""
+        if not len(self.ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(len(employee_ids), dtype=bool)
+        positions = np.searchsorted(self.ids, employee_ids)
+        clipped = np.minimum(positions, len(self.ids) - 1)
+        keep = self.ids[clipped] == employee_ids
+        return clipped[keep], keep
+
+
+def compute(data, rules=None):
+    """Vectorised payslip figures for every employee in `data`, as a dict of arrays."""
+    rules = rules or get_rules()
+    employed = np.arange(data.days)[None, :] >= data.joined_offset[:, None]
+    no_leave = data.leave == NO_LEAVE
+
+    worked = employed & no_leave & (data.status == WORKED)
+    half = employed & no_leave & (data.status == HALF)
+    absent = employed & no_leave & (data.status == ABSENT)
+    paid_leave = employed & ((data.leave == PAID_LEAVE) | (no_leave & (data.status == LEAVE)))
+    unpaid_leave = employed & (data.leave == UNPAID_LEAVE)
+    nights = data.night & (worked | half)
+
+    absent_days = absent.sum(axis=1)
+    half_days = half.sum(axis=1)
+    unpaid_days = unpaid_leave.sum(axis=1)
+    payable = data.days - data.joined_offset - absent_days - unpaid_days - 0.5 * half_days
+
+    daily_rate = data.salary / data.days
+    basic = daily_rate * payable
+    night_shifts = nights.sum(axis=1)
+    night_allowance = night_shifts * daily_rate * rules['night_differential']
+    overtime_pay = data.overtime / 60 * daily_rate / rules['hours_per_day'] * rules['overtime_multiplier']
+    deductions = data.salary - basic
+    gross = data.salary + night_allowance + overtime_pay
+
+    return {
+        'payable_days': payable,
+        'present_days': worked.sum(axis=1),
+        'half_days': half_days,
+        'absent_days': absent_days,
+        'paid_leave_days': paid_leave.sum(axis=1),
+        'unpaid_leave_days': unpaid_days,
+        'night_shifts': night_shifts,
+        'overtime_minutes': data.overtime,
+        'basic_pay': np.round(basic, 2),
+        'night_allowance': np.round(night_allowance, 2),
+        'overtime_pay': np.round(overtime_pay, 2),
+        'deductions': np.round(deductions, 2),
+        'gross_pay': np.round(gross, 2),
+        'net_pay': np.round(gross - deductions, 2),
+    }
+
+
+def _money(value):
+    return Decimal(f'{value:.2f}')
+
+
+@transaction.atomic
+def run_payroll(year, month, user=None, batch_size=2000):
+    """
+    Compute and save the payroll for a month, replacing its draft run if any.
+    Raises ValueError when the month has already been finalized.
+    """
+    if PayrollRun.objects.filter(year=year, month=month, status='finalized').exists():
+        raise ValueError(f'Payroll for {year}-{month:02d} is already finalized.')
+    drafts = PayrollRun.objects.filter(year=year, month=month, status='draft')
+    Payslip.objects.filter(run__in=drafts).delete()
+    drafts.delete()
+
+    rules = get_rules()
+    data = MonthData(year, month).load(unpaid_leave_types=rules['unpaid_leave_types'])
+    figures = compute(data, rules)
+
+    run = PayrollRun.objects.create(
+        year=year, month=month, days_in_month=data.days, employee_count=len(data.ids),
+        total_gross=_money(figures['gross_pay'].sum()),
+        total_deductions=_money(figures['deductions'].sum()),
+        total_net=_money(figures['net_pay'].sum()),
+        created_by=user,
+    )
+    columns = {name: values.tolist() for name, values in figures.items()}
+    salaries = data.salary.tolist()
+    Payslip.objects.bulk_create([
+        Payslip(
+            run=run,
+            employee_id=int(employee_id),
+            department_id=data.department_ids[i],
+            monthly_salary=_money(salaries[i]),
+            payable_days=Decimal(f"{columns['payable_days'][i]:.1f}"),
+            present_days=columns['present_days'][i],
+            half_days=columns['half_days'][i],
+            absent_days=columns['absent_days'][i],
+            paid_leave_days=columns['paid_leave_days'][i],
+            unpaid_leave_days=columns['unpaid_leave_days'][i],
+            night_shifts=columns['night_shifts'][i],
+            overtime_minutes=columns['overtime_minutes'][i],
+            basic_pay=_money(columns['basic_pay'][i]),
+            night_allowance=_money(columns['night_allowance'][i]),
+            overtime_pay=_money(columns['overtime_pay'][i]),
+            deductions=_money(columns['deductions'][i]),
+            gross_pay=_money(columns['gross_pay'][i]),
+            net_pay=_money(columns['net_pay'][i]),
+        )
+        for i, employee_id in enumerate(data.ids.tolist())
+    ], batch_size=batch_size)
+    return run
+
+
+def finalize_run(run):
+    """Lock a draft run; finalized months cannot be re-run."""
+    if run.status != 'draft':
+        raise ValueError(f'{run} is not a draft.')
+    if PayrollRun.objects.filter(year=run.year, month=run.month, status='finalized').exists():
+        raise ValueError(f'Payroll for {run.year}-{run.month:02d} is already finalized.')
+    run.status = 'finalized'
+    run.save(update_fields=['status'])
+    return run
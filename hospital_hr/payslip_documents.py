@@ -0,0 +1,143 @@
+"""
+Payslip document rendering for Amrita Hospital HRMS
+
+Renders one document per Payslip of a PayrollRun under
+MEDIA_ROOT/payslips/<YYYY-MM>/run-<id>/<department code>/<employee id>.html
+and zips each department folder to <department code>.zip next to it.
+
+All payslip data is fetched up front in a single query; the rows are split into
+chunks and rendered by a process pool whose workers only run the template engine
+(no ORM access). Each file is written to a temporary name and renamed into place,
+so a crashed run leaves no half-written documents, and re-running skips the
+documents that already exist. PDF output needs the optional WeasyPrint package.
+"""
+
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Payslip
+
+
+FORMATS = ('html', 'pdf')
+
+TEMPLATE = 'hospital_hr/payslip_document.html'
+
+SLIP_FIELDS = [
+    'id', 'employee__employee_id', 'employee__user__first_name', 'employee__user__last_name',
+    'employee__designation', 'department__name', 'department__code',
+    'monthly_salary', 'payable_days', 'present_days', 'half_days', 'absent_days', 'paid_leave_days',
+    'unpaid_leave_days', 'night_shifts', 'overtime_minutes', 'basic_pay', 'night_allowance',
+    'overtime_pay', 'deductions', 'gross_pay', 'net_pay',
+]
+
+UNASSIGNED = 'UNASSIGNED'
+
+
+def run_directory(run):
+    return os.path.join(settings.MEDIA_ROOT, 'payslips', f'{run.year}-{run.month:02d}', f'run-{run.pk}')
+
+
+def _department_folder(slip):
+    return slip['department__code'] or UNASSIGNED
+
+
+def _document_path(directory, slip, fmt):
+    return os.path.join(directory, _department_folder(slip), f"{slip['employee__employee_id']}.{fmt}")
+
+
+def _write_atomic(path, content):
+    temp_path = f'{path}.part'
+    with open(temp_path, 'wb') as handle:
+        handle.write(content)
+    os.replace(temp_path, path)
+
+
+def _init_worker():
+    # Spawned workers start without Django configured; forked ones already have it
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def render_chunk(jobs, shared, fmt):
+    """Worker entry point: render (path, slip) jobs; returns the number written."""
+    if fmt == 'pdf':
+        from weasyprint import HTML
+
+    for path, slip in jobs:
+        html = render_to_string(TEMPLATE, {**shared, 'slip': slip})
+        content = HTML(string=html).write_pdf() if fmt == 'pdf' else html.encode('utf-8')
+        _write_atomic(path, content)
+    return len(jobs)
+
+
+def zip_department(folder):
+    """Bundle a department folder's documents into <folder>.zip; returns the archive path."""
+    archive = f'{folder}.zip'
+    temp_path = f'{archive}.part'
+    with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith('.part'):
+                bundle.write(os.path.join(folder, name), arcname=name)
+    os.replace(temp_path, archive)
+    return archive
+
+
+def render_run(run, fmt='html', workers=None, chunk_size=200, progress=None):
+    """
+    Render every missing payslip document of `run` and re-zip the departments
+    that changed. `progress(done, total)` is called as chunks complete.
+    Returns {'total', 'skipped', 'rendered', 'archives'}.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown payslip format {fmt!r}')
+    if fmt == 'pdf':
+        try:
+            import weasyprint  # noqa: F401
+        except ImportError:
+            raise ValueError('PDF payslips need the weasyprint package.')
+
+    directory = run_directory(run)
+    slips = list(Payslip.objects.filter(run=run).order_by('department__code', 'employee__employee_id').values(*SLIP_FIELDS))
+    folders = {os.path.join(directory, _department_folder(slip)) for slip in slips}
+    existing = set()
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+        existing.update(os.path.join(folder, name) for name in os.listdir(folder))
+
+    jobs = [(path, slip) for slip in slips if (path := _document_path(directory, slip, fmt)) not in existing]
+    shared = {
+        'period': f'{run.year}-{run.month:02d}',
+        'status': run.status,
+        'run_id': run.pk,
+        'days_in_month': run.days_in_month,
+        'generated_at': timezone.localtime(),
+    }
+
+    done = 0
+    if progress:
+        progress(done, len(jobs))
+    if jobs:
+        # Workers never touch the database; don't hand them the parent's connections
+        connections.close_all()
+        chunks = [jobs[offset:offset + chunk_size] for offset in range(0, len(jobs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(render_chunk, chunk, shared, fmt) for chunk in chunks]
+            for future in as_completed(futures):
+                done += future.result()
+                if progress:
+                    progress(done, len(jobs))
+
+    changed = {os.path.dirname(path) for path, _ in jobs}
+    archives = [
+        zip_department(folder) for folder in sorted(folders)
+        if folder in changed or not os.path.exists(f'{folder}.zip')
+    ]
+    return {'total': len(slips), 'skipped': len(slips) - len(jobs), 'rendered': done, 'archives': archives}
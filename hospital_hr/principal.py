@@ -0,0 +1,148 @@
+"""
+Request principal for Amrita Hospital HRMS
+
+PrincipalMiddleware (hospital_hr/middleware.py) attaches request.principal:
+the role, employee and department scope of the logged-in user, resolved once
+with a single query and kept in the cache, instead of each view re-deriving it
+(request.user.employee_profile, headed_department.first(), ...).
+
+    request.principal.role
+    request.principal.employee_id              # Employee pk, or None
+    request.principal.department_id            # the employee's own department
+    request.principal.headed_department_ids    # departments this user heads
+    request.principal.permitted_department_ids # None = every department
+    request.principal.scope(queryset, ...)     # restrict a queryset to that scope
+
+Cached principals are dropped by the User/Employee/Department signals. As with
+the careers cache, entries also expire on their own
+(settings.PRINCIPAL_CACHE_TIMEOUT) so processes with a local-memory cache
+converge after a change.
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .models import Department, Employee, User
+
+
+GENERATION_CACHE_KEY = 'principal:generation'
+
+# Roles that see every department
+UNSCOPED_ROLES = ('admin', 'hr')
+
+
+def _timeout():
+    return getattr(settings, 'PRINCIPAL_CACHE_TIMEOUT', 300)
+
+
+class Principal:
+    """Role and department scope of one user. Plain values only, so it can be cached."""
+
+    def __init__(self, user_id, role, is_superuser, employee_id=None, department_id=None, headed_department_ids=()):
+        self.user_id = user_id
+        self.role = role
+        self.is_superuser = is_superuser
+        self.employee_id = employee_id
+        self.department_id = department_id
+        self.headed_department_ids = tuple(headed_department_ids)
+
+    def __getstate__(self):
+        # Loaded model instances stay per request; only the plain values are cached
+        return {key: value for key, value in self.__dict__.items() if key not in ('employee', 'headed_department')}
+
+    @classmethod
+    def resolve(cls, user):
+        """Build the principal of `user` with one query (employee and headed departments joined in)."""
+        rows = User.objects.filter(pk=user.pk).values_list(
+            'employee_profile__id', 'employee_profile__department_id', 'headed_department__id',
+        )
+        rows = list(rows) or [(None, None, None)]
+        return cls(
+            user.pk, user.role, user.is_superuser,
+            employee_id=rows[0][0],
+            department_id=rows[0][1],
+            headed_department_ids=sorted({row[2] for row in rows if row[2] is not None}),
+        )
+
+    def has_role(self, *roles):
+        return self.is_superuser or self.role in roles
+
+    @property
+    def sees_all_departments(self):
+        return self.has_role(*UNSCOPED_ROLES)
+
+    @property
+    def permitted_department_ids(self):
+        """Departments whose data this user may see: None for every department."""
+        if self.sees_all_departments:
+            return None
+        if self.role == 'dept_head':
+            return self.headed_department_ids
+        return ()
+
+    @cached_property
+    def employee(self):
+        """The user's Employee (with user and department), or None."""
+        if self.employee_id is None:
+            return None
+        return Employee.objects.select_related('user', 'department').filter(pk=self.employee_id).first()
+
+    @cached_property
+    def headed_department(self):
+        """The (first) department this user heads, or None."""
+        if not self.headed_department_ids:
+            return None
+        return Department.objects.filter(pk=self.headed_department_ids[0]).first()
+
+    def scope(self, queryset, department_field='department', employee_field=None):
+        """
+        Restrict `queryset` to the permitted departments (via `department_field`),
+        plus the user's own rows via `employee_field` when given. Unscoped roles
+        get the queryset unchanged; users with no scope get an empty one.
+        """
+        permitted = self.permitted_department_ids
+        if permitted is None:
+            return queryset
+        conditions = []
+        if permitted:
+            conditions.append(Q(**{f'{department_field}__in': permitted}))
+        if employee_field and self.employee_id is not None:
+            conditions.append(Q(**{employee_field: self.employee_id}))
+        if not conditions:
+            return queryset.none()
+        return queryset.filter(reduce(or_, conditions))
+
+
+def _cache_key(user_id):
+    return f'principal:{cache.get(GENERATION_CACHE_KEY, 0)}:{user_id}'
+
+
+def get_principal(user):
+    """The cached Principal of `user`; anonymous users get an empty one."""
+    if not user.is_authenticated:
+        return Principal(None, None, False)
+    key = _cache_key(user.pk)
+    principal = cache.get(key)
+    if principal is None:
+        principal = Principal.resolve(user)
+        cache.set(key, principal, _timeout())
+    return principal
+
+
+def invalidate_principal(user_id):
+    """Called from the User/Employee signals when one user's role or department changes."""
+    cache.delete(_cache_key(user_id))
+
+
+def invalidate_all_principals():
+    """Called from the Department signals: any department head may have changed."""
+    try:
+        cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.set(GENERATION_CACHE_KEY, 1, None)
+
@@ -0,0 +1,77 @@
+"""
+Query profiling helpers for Amrita Hospital HRMS
+Records the queries executed while a block of code runs, so the middleware
+and the per-view query budgets can report counts, DB time and duplicates.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.db import connections
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view runs more queries than its declared budget."""
+
+
+# Literals are stripped so that the same statement with different parameters
+# maps to one fingerprint (this is what makes an N+1 show up as a duplicate).
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql):
+    """Normalise a SQL statement into a parameter-free fingerprint."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """
+    Context manager that records every query run on all database connections.
+    Works regardless of DEBUG, as it uses connection execute wrappers.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stack.close()
+        self._stack = None
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 2)
+
+    def duplicates(self):
+        """Return {fingerprint: count} for statements executed more than once."""
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
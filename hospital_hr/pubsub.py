@@ -0,0 +1,77 @@
+"""
+In-process publish/subscribe for Amrita Hospital HRMS
+
+A minimal thread-safe broker used to push live updates (staffing coverage,
+attendance changes) to waiting requests in the same process. Each subscriber
+gets a bounded queue; slow subscribers lose their oldest messages rather than
+blocking publishers. Messages do not cross processes, so consumers must treat a
+timeout as "re-read the current state" rather than "nothing changed".
+"""
+
+import queue
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    def __init__(self, broker, topic, maxsize):
+        self.broker = broker
+        self.topic = topic
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Next message, or None when nothing arrives within timeout seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Broker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, topic, maxsize=100):
+        subscription = Subscription(self, topic, maxsize)
+        with self._lock:
+            self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.topic)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.topic]
+
+    def publish(self, topic, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(topic, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+        return len(subscriptions)
+
+
+broker = Broker()
@@ -0,0 +1,331 @@
+"""
+Shift roster engine for Amrita Hospital HRMS
+
+Generates per-day ShiftAssignment rows for a department. Staff on a fixed shift
+work it on their working days; 'rotating' staff are placed by a greedy
+constraint solver that fills each day's coverage minimums (derived from the
+department's beds) while respecting approved leaves, minimum rest between shifts
+and limits on consecutive working days and nights. A repair pass moves staff
+from over-covered shifts into remaining gaps; anything still unfilled is
+reported as a shortfall.
+
+When someone calls in sick, replan_absence() only re-plans the affected slots:
+it frees the employee's shifts and finds the least loaded eligible colleague for
+each, leaving the rest of the roster untouched.
+"""
+
+import math
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+
+from .leave_engine import DEFAULT_SHIFT_CALENDAR, SHIFT_CALENDARS, daterange, holiday_dates
+from .models import Employee, LeaveDay, ShiftAssignment
+
+
+# Start and end hour of each shift; night runs past midnight
+SHIFT_HOURS = {
+    'morning': (6, 14),
+    'afternoon': (14, 22),
+    'night': (22, 30),
+    'general': (9, 17),
+}
+
+# Ward shifts in the order they are filled (most constrained first)
+WARD_SHIFTS = ('night', 'morning', 'afternoon')
+
+# Beds per staff member on duty, per category and ward shift
+DEFAULT_COVERAGE = {
+    'nursing': {'morning': 6, 'afternoon': 6, 'night': 10},
+    'medical': {'morning': 20, 'afternoon': 25, 'night': 30},
+    'paramedical': {'morning': 15, 'afternoon': 20, 'night': 30},
+}
+
+DEFAULT_RULES = {
+    'min_rest_hours': 11,
+    'max_consecutive_days': 6,
+    'max_consecutive_nights': 3,
+}
+
+# Days of existing assignments loaded on either side of the planned range, so
+# rest and consecutive-day rules hold across roster boundaries
+CONTEXT_DAYS = 7
+
+
+def get_coverage():
+    return {**DEFAULT_COVERAGE, **getattr(settings, 'ROSTER_COVERAGE', {})}
+
+
+def get_rules():
+    return {**DEFAULT_RULES, **getattr(settings, 'ROSTER_RULES', {})}
+
+
+def rest_hours(previous_shift, next_shift):
+    """Hours between the end of previous_shift on one day and the start of next_shift the next day."""
+    return SHIFT_HOURS[next_shift][0] + 24 - SHIFT_HOURS[previous_shift][1]
+
+
+def coverage_requirements(department, headcounts):
+    """
+    Return {(category, shift): staff required per day}. Requirements are scaled
+    down when a category's headcount cannot staff them six days a week.
+    """
+    requirements = {}
+    for category, ratios in get_coverage().items():
+        available = headcounts.get(category, 0)
+        if not available or not department.total_beds:
+            continue
+        needed = {shift: math.ceil(department.total_beds / ratios[shift]) for shift in WARD_SHIFTS if ratios.get(shift)}
+        capacity = available * 6 // 7
+        total = sum(needed.values())
+        if total > capacity:
+            needed = {shift: max(1, capacity * count // total) for shift, count in needed.items()}
+        for shift, count in needed.items():
+            requirements[(category, shift)] = count
+    return requirements
+
+
+class RosterPlanner:
+    """Plans ShiftAssignment rows for one department over [start, end]."""
+
+    def __init__(self, department, start, end):
+        self.department = department
+        self.start = start
+        self.end = end
+        self.rules = get_rules()
+        self.days = list(daterange(start, end))
+
+        self.employees = {
+            employee.pk: employee
+            for employee in Employee.objects.filter(department=department, status__in=['active', 'on_leave'])
+        }
+        self.requirements = coverage_requirements(
+            department, Counter(employee.category for employee in self.employees.values())
+        )
+        self.leave = set(LeaveDay.objects.filter(
+            employee_id__in=self.employees, date__gte=start, date__lte=end
+        ).values_list('employee_id', 'date'))
+        self.holidays = holiday_dates(start, end, department.pk)
+
+        # plan[employee_id][date] = shift, including context days outside the range
+        self.plan = defaultdict(dict)
+        self.locked = set()
+        self.coverage = Counter()
+        self.load = Counter()
+        self.nights = Counter()
+        self.shortfalls = []
+        self.saved = 0
+
+        existing = ShiftAssignment.objects.filter(
+            employee_id__in=self.employees,
+            date__gte=start - timedelta(days=CONTEXT_DAYS),
+            date__lte=end + timedelta(days=CONTEXT_DAYS),
+        ).values_list('employee_id', 'date', 'shift', 'source')
+        for employee_id, day, shift, source in existing:
+            in_range = start <= day <= end
+            # Generated assignments inside the range are re-planned; everything else is fixed context
+            if in_range and source != 'manual':
+                continue
+            self._assign(employee_id, day, shift, in_range)
+            if in_range:
+                self.locked.add((employee_id, day))
+
+    # -- state -------------------------------------------------------------
+
+    def _assign(self, employee_id, day, shift, count=True):
+        self.plan[employee_id][day] = shift
+        if count:
+            self.coverage[(day, self.employees[employee_id].category, shift)] += 1
+            self.load[employee_id] += 1
+            if shift == 'night':
+                self.nights[employee_id] += 1
+
+    def _unassign(self, employee_id, day):
+        shift = self.plan[employee_id].pop(day)
+        self.coverage[(day, self.employees[employee_id].category, shift)] -= 1
+        self.load[employee_id] -= 1
+        if shift == 'night':
+            self.nights[employee_id] -= 1
+        return shift
+
+    def _run_length(self, employee_id, day, step, shift=None):
+        """Consecutive assigned days (optionally of one shift) walking from day in direction step."""
+        days, current = 0, day + timedelta(days=step)
+        schedule = self.plan[employee_id]
+        while current in schedule and (shift is None or schedule[current] == shift):
+            days += 1
+            current += timedelta(days=step)
+        return days
+
+    def is_eligible(self, employee_id, day, shift):
+        schedule = self.plan[employee_id]
+        if day in schedule or (employee_id, day) in self.leave:
+            return False
+
+        min_rest = self.rules['min_rest_hours']
+        previous_shift = schedule.get(day - timedelta(days=1))
+        if previous_shift and rest_hours(previous_shift, shift) < min_rest:
+            return False
+        next_shift = schedule.get(day + timedelta(days=1))
+        if next_shift and rest_hours(shift, next_shift) < min_rest:
+            return False
+
+        worked = self._run_length(employee_id, day, -1) + 1 + self._run_length(employee_id, day, 1)
+        if worked > self.rules['max_consecutive_days']:
+            return False
+        if shift == 'night':
+            nights = self._run_length(employee_id, day, -1, 'night') + 1 + self._run_length(employee_id, day, 1, 'night')
+            if nights > self.rules['max_consecutive_nights']:
+                return False
+        return True
+
+    def _candidates(self, category, day, shift, exclude=()):
+        previous_day = day - timedelta(days=1)
+        candidates = [
+            employee_id for employee_id, employee in self.employees.items()
+            if employee.category == category and employee.shift == 'rotating'
+            and employee_id not in exclude and self.is_eligible(employee_id, day, shift)
+        ]
+        # Least loaded first; keep people on the same shift as yesterday where possible
+        candidates.sort(key=lambda employee_id: (
+            self.load[employee_id],
+            self.nights[employee_id] if shift == 'night' else 0,
+            self.plan[employee_id].get(previous_day) != shift,
+            employee_id,
+        ))
+        return candidates
+
+    def deficit(self, day, category, shift):
+        return self.requirements.get((category, shift), 0) - self.coverage[(day, category, shift)]
+
+    # -- solving -----------------------------------------------------------
+
+    def solve(self):
+        fixed = [employee for employee in self.employees.values() if employee.shift != 'rotating']
+        categories = sorted({category for category, _ in self.requirements})
+
+        for day in self.days:
+            for employee in fixed:
+                calendar = SHIFT_CALENDARS.get(employee.shift, DEFAULT_SHIFT_CALENDAR)
+                if day.weekday() in calendar['weekly_off']:
+                    continue
+                if calendar['observes_holidays'] and day in self.holidays:
+                    continue
+                if self.is_eligible(employee.pk, day, employee.shift):
+                    self._assign(employee.pk, day, employee.shift)
+
+            for category in categories:
+                for shift in WARD_SHIFTS:
+                    needed = self.deficit(day, category, shift)
+                    for employee_id in self._candidates(category, day, shift)[:max(needed, 0)]:
+                        self._assign(employee_id, day, shift)
+
+            for category in categories:
+                for shift in WARD_SHIFTS:
+                    if self.deficit(day, category, shift) > 0:
+                        self._repair(day, category, shift)
+                    if self.deficit(day, category, shift) > 0:
+                        self.shortfalls.append({
+                            'date': day, 'category': category, 'shift': shift,
+                            'missing': self.deficit(day, category, shift),
+                        })
+        return self
+
+    def _repair(self, day, category, shift):
+        """Move rotating staff from over-covered shifts of the same day into the gap."""
+        for donor_shift in WARD_SHIFTS:
+            if donor_shift == shift:
+                continue
+            while self.deficit(day, category, shift) > 0 and self.deficit(day, category, donor_shift) < 0:
+                donors = [
+                    employee_id for employee_id, employee in self.employees.items()
+                    if employee.category == category and employee.shift == 'rotating'
+                    and self.plan[employee_id].get(day) == donor_shift and (employee_id, day) not in self.locked
+                ]
+                for employee_id in donors:
+                    self._unassign(employee_id, day)
+                    if self.is_eligible(employee_id, day, shift):
+                        self._assign(employee_id, day, shift)
+                        break
+                    self._assign(employee_id, day, donor_shift)
+                else:
+                    break
+
+    @transaction.atomic
+    def save(self):
+        """Replace the generated assignments in the range with the plan. Returns the number of rows written."""
+        ShiftAssignment.objects.filter(
+            department=self.department, date__gte=self.start, date__lte=self.end,
+        ).exclude(source='manual').delete()
+        rows = [
+            ShiftAssignment(employee_id=employee_id, department=self.department, date=day, shift=shift)
+            for employee_id, schedule in self.plan.items()
+            for day, shift in schedule.items()
+            if self.start <= day <= self.end and (employee_id, day) not in self.locked
+        ]
+        ShiftAssignment.objects.bulk_create(rows, batch_size=2000)
+        self.saved = len(rows)
+        return self.saved
+
+
+def generate_roster(department, start, end):
+    """Solve and store the roster for a department; returns the planner (with .shortfalls)."""
+    planner = RosterPlanner(department, start, end).solve()
+    planner.save()
+    return planner
+
+
+@transaction.atomic
+def replan_absence(employee, start, end=None):
+    """
+    Free the employee's assignments in [start, end] (e.g. a sick call) and fill each
+    vacated shift with the least loaded eligible colleague of the same category.
+    Returns a list of {'date', 'shift', 'replacement'} (replacement is None when
+    nobody could cover).
+    """
+    end = end or start
+    vacated = list(ShiftAssignment.objects.filter(
+        employee=employee, date__gte=start, date__lte=end
+    ).values_list('date', 'shift'))
+    if not vacated or employee.department is None:
+        ShiftAssignment.objects.filter(employee=employee, date__gte=start, date__lte=end).delete()
+        return []
+
+    planner = RosterPlanner(employee.department, start, end)
+    # Keep the existing roster as it is; only the vacated slots change
+    for assignment in ShiftAssignment.objects.filter(
+        department=employee.department, date__gte=start, date__lte=end
+    ).exclude(employee=employee).values_list('employee_id', 'date', 'shift'):
+        employee_id, day, shift = assignment
+        if employee_id in planner.employees and day not in planner.plan[employee_id]:
+            planner._assign(employee_id, day, shift)
+    for day, _ in vacated:
+        planner.leave.add((employee.pk, day))
+    ShiftAssignment.objects.filter(employee=employee, date__gte=start, date__lte=end).delete()
+
+    changes, replacements = [], []
+    for day, shift in vacated:
+        candidates = planner._candidates(employee.category, day, shift, exclude={employee.pk})
+        replacement = planner.employees[candidates[0]] if candidates else None
+        if replacement:
+            planner._assign(replacement.pk, day, shift)
+            replacements.append(ShiftAssignment(
+                employee=replacement, department=employee.department, date=day, shift=shift, source='replan',
+            ))
+        changes.append({'date': day, 'shift': shift, 'replacement': replacement})
+    ShiftAssignment.objects.bulk_create(replacements)
+    return changes
+
+
+def scheduled_shifts(employees, day):
+    """{employee_id: shift} for the day, falling back to each employee's default shift (one query)."""
+    assigned = dict(ShiftAssignment.objects.filter(
+        employee__in=[employee.pk for employee in employees], date=day
+    ).values_list('employee_id', 'shift'))
+    return {employee.pk: assigned.get(employee.pk, employee.shift) for employee in employees}
+
+
+def scheduled_shift(employee, day):
+    return scheduled_shifts([employee], day)[employee.pk]
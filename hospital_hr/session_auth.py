@@ -0,0 +1,61 @@
+"""
+Sessions and the per-request user lookup for Amrita Hospital HRMS
+
+With the default configuration every authenticated request reads its session
+row from django_session and then the User row, before the view runs. On
+SQLite those reads compete with the writers for the database file. The
+settings therefore use (the first and last only with a shared cache, see
+below):
+
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+        Sessions are read from the cache and only fall back to the table on a
+        miss. They are still written through to the table, so sessions survive
+        a cache restart and logging out still revokes them.
+    MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+        Flash messages (messages.success/error, used after nearly every POST)
+        travel in a signed cookie and never touch the session.
+    AUTHENTICATION_BACKENDS = ['hospital_hr.session_auth.CachedModelBackend']
+        The User row of a logged-in request comes from the cache as well.
+
+Cached users are dropped by the User signals (which includes the last_login
+update on login, password changes and deactivation) and expire after
+settings.AUTH_USER_CACHE_TIMEOUT. That invalidation only reaches every
+process through a shared cache, so the cached session engine and backend are
+only enabled when settings.SHARED_CACHE is set (CACHE_URL configured). With
+per-process local-memory caches a session logged out in one worker would stay
+valid in the others until it expires, so sessions and users are read from
+the database instead.
+
+`manage.py benchmark_sessions` compares the database reads and writes per
+request against the default configuration.
+"""
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def _cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def _timeout():
+    return getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user(), run on every authenticated request, is served from the cache."""
+
+    def get_user(self, user_id):
+        key = _cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, _timeout())
+        return user
+
+
+def invalidate_user(user_id):
+    """Called from the User signals whenever a user row changes or is deleted."""
+    cache.delete(_cache_key(user_id))
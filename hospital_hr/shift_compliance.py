@@ -0,0 +1,175 @@
+"""
+Shift compliance engine for Amrita Hospital HRMS
+
+Computes late arrival, early leave, overtime and half day for attendance rows
+from the ShiftDefinition of their shift. Punch times are wall-clock times on the
+attendance date; they are compared with the shift window on a 24-hour clock, so
+night shifts that cross midnight need no special casing:
+
+    arrived = minutes after shift start, folded into [-12h, +12h)
+    worked  = check-out - check-in (mod 24h)
+    left    = arrived + worked
+
+An arrival later than the grace period is late; leaving more than the grace
+period before the shift ends is early leave, and staying beyond it overtime.
+Checked-out rows with less than half_day_minutes worked become half days.
+
+The same vectorised numpy code serves single check-ins and batch recomputation
+after a shift policy change. Only rows with a check-in and a present / late /
+half day status are re-evaluated; absences and leave are never overridden.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, ShiftDefinition
+
+
+DAY = 24 * 60
+HALF_DAY = DAY // 2
+
+COMPUTED_STATUSES = ('present', 'late', 'half_day')
+METRIC_FIELDS = ['late_minutes', 'early_leave_minutes', 'overtime_minutes']
+
+UPDATE_CHUNK = 900
+
+# Index into COMPUTED_STATUSES returned by ShiftPolicy.evaluate
+PRESENT, LATE, HALF = range(3)
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+class ShiftPolicy:
+    """Active shift definitions laid out as arrays, indexed by shift code position."""
+
+    def __init__(self, definitions):
+        definitions = list(definitions)
+        self.index = {definition.code: position for position, definition in enumerate(definitions)}
+        self.start = np.array([_minutes(d.start_time) for d in definitions], dtype=np.int32)
+        end = np.array([_minutes(d.end_time) for d in definitions], dtype=np.int32)
+        self.length = (end - self.start) % DAY
+        self.length[self.length == 0] = DAY
+        self.grace = np.array([d.grace_minutes for d in definitions], dtype=np.int32)
+        self.half_day = np.array([d.half_day_minutes for d in definitions], dtype=np.int32)
+
+    @classmethod
+    def load(cls):
+        return cls(ShiftDefinition.objects.filter(is_active=True))
+
+    @property
+    def codes(self):
+        return list(self.index)
+
+    def evaluate(self, shift_index, check_in, check_out):
+        """
+        Vectorised computation over parallel arrays: shift positions, check-in
+        minutes and check-out minutes (-1 when not checked out yet). Returns
+        (status, late, early_leave, overtime) arrays; status indexes COMPUTED_STATUSES.
+        """
+        grace = self.grace[shift_index]
+        length = self.length[shift_index]
+
+        arrived = (check_in - self.start[shift_index] + HALF_DAY) % DAY - HALF_DAY
+        late = np.where(arrived > grace, arrived, 0)
+
+        checked_out = check_out >= 0
+        worked = np.where(checked_out, (check_out - check_in) % DAY, 0)
+        left = arrived + worked
+        early = np.where(checked_out & (length - left > grace), length - left, 0)
+        overtime = np.where(checked_out & (left - length > grace), left - length, 0)
+
+        status = np.where(checked_out & (worked < self.half_day[shift_index]), HALF,
+                          np.where(late > 0, LATE, PRESENT))
+        return status, late, early, overtime
+
+
+def apply_compliance(attendance, policy=None, update_status=True):
+    """
+    Fill in the computed fields of one (unsaved) Attendance. Rows without a
+    check-in or a defined shift get zero metrics and keep their status.
+    """
+    policy = policy or ShiftPolicy.load()
+    position = policy.index.get(attendance.shift)
+    if position is None or not attendance.check_in_time:
+        attendance.late_minutes = attendance.early_leave_minutes = attendance.overtime_minutes = 0
+        return attendance
+
+    check_out = _minutes(attendance.check_out_time) if attendance.check_out_time else -1
+    status, late, early, overtime = policy.evaluate(
+        np.array([position]), np.array([_minutes(attendance.check_in_time)]), np.array([check_out]),
+    )
+    attendance.late_minutes = int(late[0])
+    attendance.early_leave_minutes = int(early[0])
+    attendance.overtime_minutes = int(overtime[0])
+    if update_status and attendance.status in COMPUTED_STATUSES:
+        attendance.status = COMPUTED_STATUSES[status[0]]
+    return attendance
+
+
+def recompute(start, end, department_id=None, shifts=None, batch_size=20000):
+    """
+    Re-evaluate every eligible attendance row dated start..end (inclusive) and
+    write back only the rows whose result changed. Returns (evaluated, updated).
+
+    Updates are queryset updates, so attendance signals (live boards, coverage)
+    do not fire; the affected statuses all count as "on the floor" either way.
+    updated_at is set explicitly so the change feed still picks the rows up.
+
+    Rows are read in primary key ranges, each batch loaded in full before it is
+    written: on SQLite, updating a table while a cursor over it is still open
+    can return rows twice or skip them.
+    """
+    policy = ShiftPolicy.load()
+    codes = [code for code in policy.codes if not shifts or code in shifts]
+    rows = Attendance.objects.filter(
+        date__range=(start, end), status__in=COMPUTED_STATUSES, shift__in=codes, check_in_time__isnull=False,
+    )
+    if department_id:
+        rows = rows.filter(department_id=department_id)
+    rows = rows.order_by('id').values_list(
+        'id', 'shift', 'check_in_time', 'check_out_time', 'status', *METRIC_FIELDS
+    )
+
+    evaluated = updated = 0
+    last_id = 0
+    while True:
+        batch = list(rows.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        updated += _recompute_batch(policy, batch)
+        evaluated += len(batch)
+        last_id = batch[-1][0]
+    return evaluated, updated
+
+
+def _recompute_batch(policy, rows):
+    ids, shifts, check_ins, check_outs, statuses, *current = zip(*rows)
+    status, late, early, overtime = policy.evaluate(
+        np.fromiter((policy.index[shift] for shift in shifts), dtype=np.int32, count=len(rows)),
+        np.fromiter((_minutes(value) for value in check_ins), dtype=np.int32, count=len(rows)),
+        np.fromiter((_minutes(value) if value else -1 for value in check_outs), dtype=np.int32, count=len(rows)),
+    )
+    current_status = np.fromiter((COMPUTED_STATUSES.index(value) for value in statuses), dtype=np.int32, count=len(rows))
+    changed = (status != current_status) | (late != np.array(current[0])) \
+        | (early != np.array(current[1])) | (overtime != np.array(current[2]))
+
+    # Rows sharing a result are written with one UPDATE ... WHERE id IN (...),
+    # which is far cheaper than a per-row CASE expression on large batches
+    groups = defaultdict(list)
+    for i in np.flatnonzero(changed):
+        groups[(int(status[i]), int(late[i]), int(early[i]), int(overtime[i]))].append(ids[i])
+    now = timezone.now()
+    with transaction.atomic():
+        for (status_index, late_minutes, early_minutes, overtime_minutes), group in groups.items():
+            for offset in range(0, len(group), UPDATE_CHUNK):
+                Attendance.objects.filter(id__in=group[offset:offset + UPDATE_CHUNK]).update(
+                    status=COMPUTED_STATUSES[status_index], late_minutes=late_minutes,
+                    early_leave_minutes=early_minutes, overtime_minutes=overtime_minutes,
+                    updated_at=now,
+                )
+    return int(changed.sum())
@@ -1,6 +1,15 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import User, Employee
+from .models import User, Employee, Department, Job, LeaveRequest, Attendance, Application
+from .attendance_feed import record_changes
+from . import audit
+from .change_feed import record_tombstone
+from .coverage import record_attendance
+from .leave_calendar import invalidate_calendar, sync_leave_days
+from .page_cache import invalidate_careers_cache, record_job_deletion
+from .principal import invalidate_all_principals, invalidate_principal
+from .session_auth import invalidate_user
 
 
 @receiver(post_save, sender=User)
@@ -8,3 +17,96 @@ def create_employee_profile(sender, instance, created, **kwargs):
     if created and instance.role == 'staff' and instance.employee_id:
         if not hasattr(instance, 'employee_profile'):
             pass
+
+
+@receiver(post_delete, sender=Job)
+def log_job_delete(sender, instance, **kwargs):
+    record_job_deletion(instance)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_public_pages(sender, **kwargs):
+    invalidate_careers_cache()
+
+
+@receiver(post_save, sender=LeaveRequest)
+def update_leave_calendar(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_leave_days([instance])
+
+
+@receiver(post_delete, sender=LeaveRequest)
+def drop_leave_calendar(sender, instance, **kwargs):
+    invalidate_calendar([instance])
+
+
+@receiver(post_save, sender=Attendance)
+def update_live_coverage(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: record_attendance(instance))
+
+
+@receiver(post_delete, sender=Attendance)
+def drop_live_coverage(sender, instance, **kwargs):
+    transaction.on_commit(lambda: record_attendance(instance, deleted=True))
+
+
+@receiver(post_save, sender=Attendance)
+def log_attendance_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: record_changes([instance]))
+
+
+@receiver(post_delete, sender=Attendance)
+def log_attendance_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: record_changes([instance], deleted=True))
+
+
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Application)
+@receiver(post_delete, sender=LeaveRequest)
+@receiver(post_delete, sender=Attendance)
+def log_change_feed_delete(sender, instance, **kwargs):
+    record_tombstone(instance)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_save, sender=Attendance)
+def audit_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        audit.capture(instance, 'create' if created else 'update')
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=LeaveRequest)
+@receiver(post_delete, sender=Attendance)
+def audit_delete(sender, instance, **kwargs):
+    audit.capture(instance, 'delete')
+
+
+@receiver(post_save, sender=User)
+def refresh_user_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def refresh_employee_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.user_id)
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def refresh_department_principals(sender, **kwargs):
+    invalidate_all_principals()
@@ -0,0 +1,52 @@
+/**
+ * Amrita Hospital HRMS - Live Attendance Board
+ * Patches attendance rows and counters in place from the server-sent events stream
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    const table = document.querySelector('[data-attendance-stream]');
+    if (!table || !window.EventSource) return;
+
+    const badgeClasses = {
+        present: 'bg-success',
+        absent: 'bg-danger',
+        late: 'bg-warning text-dark',
+        half_day: 'bg-info',
+        on_leave: 'bg-secondary'
+    };
+    const emptyCell = '<span class="text-muted">-</span>';
+
+    function adjustStat(status, delta) {
+        const counter = document.querySelector(`[data-stat="${status || 'unmarked'}"]`);
+        if (counter) counter.textContent = parseInt(counter.textContent, 10) + delta;
+    }
+
+    function applyChange(change) {
+        const row = table.querySelector(`tr[data-employee-id="${change.employee_id}"]`);
+        if (!row) return;
+
+        const previous = row.dataset.status || '';
+        const current = change.deleted ? '' : change.status;
+        if (previous !== current) {
+            adjustStat(previous, -1);
+            adjustStat(current, 1);
+            row.dataset.status = current;
+        }
+
+        row.querySelector('.att-status').innerHTML = change.deleted
+            ? '<span class="badge bg-light text-dark">Not Marked</span>'
+            : `<span class="badge ${badgeClasses[change.status] || 'bg-light text-dark'}">${change.status_display}</span>`;
+        if (!change.deleted) row.querySelector('.att-shift').textContent = change.shift_display;
+        row.querySelector('.att-in').innerHTML = change.check_in || emptyCell;
+        row.querySelector('.att-out').innerHTML = change.check_out || emptyCell;
+
+        row.classList.add('table-info');
+        setTimeout(() => row.classList.remove('table-info'), 1500);
+    }
+
+    // EventSource reconnects on its own and resumes from Last-Event-ID
+    const source = new EventSource(table.dataset.attendanceStream);
+    source.addEventListener('attendance', function(event) {
+        applyChange(JSON.parse(event.data));
+    });
+});
@@ -0,0 +1,174 @@
+"""
+Effective-dated employee status transitions for Amrita Hospital HRMS
+
+Approved leaves only take effect on the days they cover: on each run the
+scheduler marks active employees whose leave covers the day as 'on_leave',
+returns the employees it put on leave to 'active' once no approved leave covers
+them (Employee.on_leave_scheduled), and pre-creates their 'on_leave' Attendance
+rows. An 'on_leave' status set by hand (e.g. long sick leave without a leave
+request) is never ended by the scheduler. Every step is a set-based query, so a
+run costs a handful of queries regardless of headcount, and re-running for the
+same day is a no-op. Status changes are recorded in the audit log.
+
+Runs from `manage.py apply_status_transitions` (cron, shortly after midnight)
+or from the optional in-process ticker (settings.STATUS_SCHEDULER_INTERVAL).
+"""
+
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import audit
+from .attendance_feed import record_changes
+from .models import Attendance, Employee, LeaveDay
+from .principal import invalidate_principal
+
+
+logger = logging.getLogger(__name__)
+
+# Marks the attendance rows created here, so they can be withdrawn again when a
+# leave is rejected or cancelled after the fact
+SCHEDULED_NOTE = 'Approved leave'
+
+
+def _on_leave_ids(day, employee_ids=None):
+    leave_days = LeaveDay.objects.filter(date=day)
+    if employee_ids is not None:
+        leave_days = leave_days.filter(employee_id__in=employee_ids)
+    return set(leave_days.values_list('employee_id', flat=True))
+
+
+@transaction.atomic
+def apply_transitions(day=None, employee_ids=None):
+    """
+    Bring employee statuses and leave attendance in line with the approved
+    leaves covering `day` (default: today). Limit to `employee_ids` when given.
+    Returns a dict with the number of rows changed per step.
+    """
+    day = day or timezone.localdate()
+    on_leave_ids = _on_leave_ids(day, employee_ids)
+
+    employees = Employee.objects.all()
+    if employee_ids is not None:
+        employees = employees.filter(id__in=employee_ids)
+
+    starting = employees.filter(status='active', id__in=on_leave_ids)
+    ending = employees.filter(status='on_leave', on_leave_scheduled=True).exclude(id__in=on_leave_ids)
+    started = _set_status(starting, 'on_leave', scheduled=True)
+    ended = _set_status(ending, 'active', scheduled=False)
+    attendance = sync_leave_attendance(day, on_leave_ids, employee_ids)
+
+    return {'date': day, 'leave_started': started, 'leave_ended': ended, **attendance}
+
+
+def _set_status(employees, status, scheduled):
+    """
+    Set `status` on the employees with one queryset update and record each
+    change in the audit log, as save() would have. Returns the number changed.
+    """
+    changed = list(employees.select_for_update().only('id', 'user_id', 'status'))
+    if not changed:
+        return 0
+    # Queryset updates skip auto_now; set updated_at so the change feed sees them
+    Employee.objects.filter(id__in=[employee.pk for employee in changed]).update(
+        status=status, on_leave_scheduled=scheduled, updated_at=timezone.now(),
+    )
+    for employee in changed:
+        employee.status = status
+        audit.capture(employee)
+        invalidate_principal(employee.user_id)
+    return len(changed)
+
+
+def sync_leave_attendance(day, on_leave_ids=None, employee_ids=None):
+    """
+    Create the missing 'on_leave' Attendance rows for `day` in one bulk insert and
+    withdraw scheduler-created rows that no approved leave covers any more.
+    """
+    if on_leave_ids is None:
+        on_leave_ids = _on_leave_ids(day, employee_ids)
+
+    stale = Attendance.objects.filter(
+        date=day, status='on_leave', marked_by__isnull=True, notes=SCHEDULED_NOTE
+    ).exclude(employee_id__in=on_leave_ids)
+    if employee_ids is not None:
+        stale = stale.filter(employee_id__in=employee_ids)
+    withdrawn, _ = stale.delete()
+
+    marked = set(Attendance.objects.filter(
+        date=day, employee_id__in=on_leave_ids
+    ).values_list('employee_id', flat=True))
+    missing = Employee.objects.filter(
+        id__in=on_leave_ids - marked, department__isnull=False
+    ).values_list('id', 'department_id', 'shift')
+    created = Attendance.objects.bulk_create([
+        Attendance(
+            employee_id=employee_id,
+            department_id=department_id,
+            date=day,
+            shift=shift,
+            status='on_leave',
+            notes=SCHEDULED_NOTE,
+        )
+        for employee_id, department_id, shift in missing
+    ], batch_size=1000, ignore_conflicts=True)
+    # bulk_create sends no post_save, so log the new rows for live boards here
+    transaction.on_commit(lambda: record_changes(created))
+
+    return {'attendance_created': len(created), 'attendance_withdrawn': withdrawn}
+
+
+def catch_up(since, until=None):
+    """Create leave attendance for every day in [since, until] (e.g. after downtime), then apply today's statuses."""
+    until = until or timezone.localdate()
+    results = []
+    day = since
+    while day < until:
+        with transaction.atomic():
+            results.append({'date': day, **sync_leave_attendance(day)})
+        day += timedelta(days=1)
+    results.append(apply_transitions(until))
+    return results
+
+
+class StatusTicker(threading.Thread):
+    """
+    Background thread that applies the day's transitions every `interval`
+    seconds. Meant for single-process deployments without cron; with several
+    worker processes prefer the management command.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name='status-scheduler', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                with audit.audit_context(path='status-scheduler'):
+                    result = apply_transitions()
+                if result['leave_started'] or result['leave_ended'] or result['attendance_created']:
+                    logger.info('Applied status transitions: %s', result)
+            except Exception:
+                logger.exception('Status transition run failed')
+
+    def stop(self):
+        self.stopped.set()
+
+
+_ticker = None
+
+
+def start_ticker():
+    """Start the in-process ticker once, if settings.STATUS_SCHEDULER_INTERVAL is set."""
+    global _ticker
+    interval = getattr(settings, 'STATUS_SCHEDULER_INTERVAL', None)
+    if interval and _ticker is None:
+        _ticker = StatusTicker(interval)
+        _ticker.start()
+    return _ticker
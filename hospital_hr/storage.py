@@ -0,0 +1,123 @@
+"""
+File storage and download helpers for Amrita Hospital HRMS.
+
+Resumes are stored content-addressed: the file name is the SHA-256 of its content,
+so the same resume uploaded for several jobs is kept on disk only once.
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.deconstruct import deconstructible
+from django.utils.http import content_disposition_header
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names files by the SHA-256 of their content.
+
+    Uploads are streamed chunk by chunk into a temporary file next to the final
+    location while being hashed, then moved into place (or discarded when an
+    identical file is already stored).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Identical names mean identical content, so there is nothing to de-duplicate
+        return name
+
+    def _save(self, name, content):
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1].lower()
+
+        os.makedirs(self.path(directory), exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.path(directory), suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            hexdigest = digest.hexdigest()
+            name = os.path.join(directory, hexdigest[:2], f'{hexdigest}{extension}').replace('\\', '/')
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(temp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+
+resume_storage = ContentAddressedStorage()
+
+
+_RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def ranged_file_response(request, field_file, filename=None):
+    """
+    Serve a stored file with FileResponse, honouring a single HTTP Range request
+    (bytes=start-end) with a 206 Partial Content response.
+    """
+    size = field_file.size
+    filename = filename or os.path.basename(field_file.name)
+    match = _RANGE_HEADER.match(request.headers.get('Range', '').strip())
+
+    if not match or not any(match.groups()):
+        response = FileResponse(field_file.open('rb'), as_attachment=False, filename=filename)
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    start, end = match.groups()
+    if start:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(end), 0)
+        end = size - 1
+
+    if start >= size or start > end:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _read_range(field_file, start, length),
+        status=206,
+        content_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    # The name comes from the applicant: quote it the way FileResponse does
+    response['Content-Disposition'] = content_disposition_header(False, filename)
+    return response
+
+
+def _read_range(field_file, start, length, chunk_size=64 * 1024):
+    with field_file.open('rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
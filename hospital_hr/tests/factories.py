@@ -0,0 +1,40 @@
+"""
+Minimal model factories for the hospital_hr tests.
+"""
+
+from datetime import date
+from itertools import count
+
+from hospital_hr.models import Department, Employee, User
+
+
+_sequence = count(1)
+
+
+def make_department(**fields):
+    n = next(_sequence)
+    fields.setdefault('name', f'Department {n}')
+    fields.setdefault('code', f'D{n}')
+    fields.setdefault('location', 'main_building')
+    return Department.objects.create(**fields)
+
+
+def make_user(role='staff', password='secret123', **fields):
+    n = next(_sequence)
+    fields.setdefault('username', f'user{n}')
+    fields.setdefault('first_name', 'Test')
+    fields.setdefault('last_name', f'User {n}')
+    user = User(role=role, **fields)
+    user.set_password(password)
+    user.save()
+    return user
+
+
+def make_employee(department=None, user=None, **fields):
+    user = user or make_user()
+    fields.setdefault('employee_id', f'EMP{next(_sequence):05d}')
+    fields.setdefault('category', 'nursing')
+    fields.setdefault('designation', 'Staff Nurse')
+    fields.setdefault('date_of_joining', date(2020, 1, 1))
+    fields.setdefault('salary', 40000)
+    return Employee.objects.create(user=user, department=department or make_department(), **fields)
@@ -0,0 +1,67 @@
+from datetime import date, time
+
+from django.test import TestCase
+
+from hospital_hr.attendance_archive import archive_year, attendance_sources, restore_year, verify
+from hospital_hr.models import ArchivedAttendance, Attendance
+
+from .factories import make_employee
+
+
+YEAR = date.today().year - 2
+
+
+class AttendanceArchiveTests(TestCase):
+    def setUp(self):
+        self.employee = make_employee()
+        self.days = [date(YEAR, 3, day) for day in (2, 3, 4)]
+        for day in self.days:
+            Attendance.objects.create(
+                employee=self.employee, department=self.employee.department, date=day,
+                check_in_time=time(9), check_out_time=time(17),
+            )
+
+    def _rows(self):
+        start, end = date(YEAR, 1, 1), date(YEAR, 12, 31)
+        return [row for source in attendance_sources(start, end)
+                for row in source.values_list('date', 'status')]
+
+    def _correct(self, day, status='absent'):
+        # A late correction for an archived date creates a new live row
+        return Attendance.objects.create(
+            employee=self.employee, department=self.employee.department, date=day, status=status,
+        )
+
+    def test_archive_moves_the_year(self):
+        archive = archive_year(YEAR)
+        self.assertEqual(archive.moved, 3)
+        self.assertFalse(Attendance.objects.filter(date__year=YEAR).exists())
+        self.assertEqual(len(self._rows()), 3)
+        self.assertTrue(verify(YEAR)[0])
+
+    def test_correction_after_archiving_is_counted_once(self):
+        archive_year(YEAR)
+        self._correct(self.days[0])
+        rows = self._rows()
+        self.assertEqual(len(rows), 3)
+        self.assertIn((self.days[0], 'absent'), rows)
+
+    def test_archive_correct_rearchive(self):
+        archive_year(YEAR)
+        self._correct(self.days[0])
+
+        archive = archive_year(YEAR)
+        self.assertEqual(archive.moved, 1)
+        self.assertEqual(archive.row_count, 3)
+        self.assertEqual(ArchivedAttendance.objects.get(date=self.days[0]).status, 'absent')
+        self.assertFalse(Attendance.objects.filter(date__year=YEAR).exists())
+        self.assertTrue(verify(YEAR)[0])
+
+    def test_restore_keeps_newer_live_rows(self):
+        archive_year(YEAR)
+        self._correct(self.days[0])
+
+        self.assertEqual(restore_year(YEAR), 2)
+        self.assertEqual(Attendance.objects.filter(date__year=YEAR).count(), 3)
+        self.assertEqual(Attendance.objects.get(date=self.days[0]).status, 'absent')
+        self.assertFalse(ArchivedAttendance.objects.exists())
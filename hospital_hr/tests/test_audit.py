@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from hospital_hr import audit
+from hospital_hr.models import AuditLog, Employee
+
+from .factories import make_employee
+
+
+class AuditCaptureTests(TestCase):
+    def test_save_of_a_loaded_instance_records_the_change(self):
+        employee = make_employee(designation='Staff Nurse')
+        AuditLog.objects.all().delete()
+
+        loaded = Employee.objects.get(pk=employee.pk)
+        loaded.designation = 'Charge Nurse'
+        with self.captureOnCommitCallbacks(execute=True):
+            loaded.save()
+
+        record = AuditLog.objects.get()
+        self.assertEqual(record.changes, {'designation': ['Staff Nurse', 'Charge Nurse']})
+
+    def test_unchanged_save_records_nothing(self):
+        employee = make_employee()
+        AuditLog.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Employee.objects.get(pk=employee.pk).save()
+
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_deferred_fields_are_not_reported(self):
+        employee = make_employee(salary=40000)
+        AuditLog.objects.all().delete()
+
+        loaded = Employee.objects.only('id', 'status').get(pk=employee.pk)
+        loaded.salary = 50000
+        with self.captureOnCommitCallbacks(execute=True):
+            loaded.save(update_fields=['salary'])
+
+        self.assertFalse(AuditLog.objects.exists())
+
+
+class AuditCompactionTests(TestCase):
+    def setUp(self):
+        self.old = timezone.now() - timedelta(days=200)
+
+    def log(self, object_id, changes, minutes):
+        return AuditLog.objects.create(
+            model='employee', object_id=object_id, action='update', changes=changes,
+            timestamp=self.old + timedelta(minutes=minutes),
+        )
+
+    def test_changes_that_cancel_out_leave_no_record(self):
+        self.log(1, {'salary': [40000, 45000]}, 0)
+        self.log(1, {'salary': [45000, 40000]}, 5)
+
+        deleted, merged_away = audit.compact(retention_days=730, compact_after_days=90)
+
+        self.assertEqual((deleted, merged_away), (0, 2))
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_updates_merge_into_the_last_record(self):
+        self.log(2, {'salary': [40000, 45000]}, 0)
+        last = self.log(2, {'salary': [45000, 50000], 'status': ['active', 'on_leave']}, 5)
+
+        audit.compact(retention_days=730, compact_after_days=90)
+
+        record = AuditLog.objects.get()
+        self.assertEqual(record.pk, last.pk)
+        self.assertEqual(record.changes, {'salary': [40000, 50000], 'status': ['active', 'on_leave']})
@@ -0,0 +1,66 @@
+from datetime import time
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from hospital_hr import coverage
+from hospital_hr.models import Attendance
+
+from .factories import make_department, make_employee
+
+
+class CoverageVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.department = make_department(total_beds=20)
+        self.nurses = [make_employee(department=self.department) for _ in range(2)]
+
+    def check_in(self, employee):
+        return Attendance.objects.create(
+            employee=employee, department=self.department, date=timezone.localdate(),
+            check_in_time=time(7, 0), status='present', shift='morning',
+        )
+
+    def on_floor(self):
+        return sum(row['on_floor'] for row in coverage.department_coverage(self.department)['rows'])
+
+    def test_racing_punches_are_not_lost(self):
+        coverage.department_coverage(self.department)
+        key = coverage._cache_key(self.department.pk, timezone.localdate())
+        stale = cache.get(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.check_in(self.nurses[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.check_in(self.nurses[1])
+        # The first punch writes its state last, over the second one
+        stale['on_floor'][str(self.nurses[0].pk)] = ['nursing', 'morning']
+        stale['version'] += 1
+        cache.set(key, stale)
+
+        self.assertEqual(self.on_floor(), 2)
+
+    def test_version_moves_forward_after_the_counter_expires(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.check_in(self.nurses[0])
+        before = coverage.department_coverage(self.department)['version']
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.check_in(self.nurses[1])
+
+        self.assertGreater(coverage.department_coverage(self.department)['version'], before)
+
+    def test_version_ahead_of_current_is_answered_at_once(self):
+        current = coverage.department_coverage(self.department)['version']
+        answer = coverage.wait_for_coverage(self.department, current + 5, timeout=5)
+        self.assertEqual(answer['version'], current)
+
+    def test_deleting_a_department_with_attendance_today(self):
+        self.check_in(self.nurses[0])
+        department_id = self.department.pk
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department.delete()
+
+        self.assertIsNone(cache.get(coverage._cache_key(department_id, timezone.localdate())))
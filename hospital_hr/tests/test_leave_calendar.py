@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from hospital_hr.ai_assistant import HRQueryProcessor
+from hospital_hr.leave_calendar import department_month
+from hospital_hr.models import LeaveRequest
+
+from .factories import make_department, make_employee, make_user
+
+
+def make_leave(employee, start, end, status='approved'):
+    return LeaveRequest.objects.create(
+        employee=employee, leave_type='casual', start_date=start, end_date=end,
+        total_days=(end - start).days + 1, reason='Family', status=status,
+    )
+
+
+def leave_names(weeks):
+    return {leave['employee_id'] for week in weeks for cell in week for leave in cell['leaves']}
+
+
+class LeaveCalendarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.head = make_user(role='dept_head')
+        self.department = make_department(head=self.head)
+        self.employee = make_employee(self.department)
+
+    def test_overlapping_leaves_count_one_employee(self):
+        today = timezone.localdate()
+        make_leave(self.employee, today, today + timedelta(days=1))
+        make_leave(self.employee, today - timedelta(days=1), today)
+        make_employee(self.department)
+
+        self.client.force_login(self.head)
+        response = self.client.get(reverse('hospital_hr:dashboard'))
+        self.assertEqual(response.context['on_leave'], 1)
+        self.assertEqual(response.context['on_duty'], 1)
+
+    def test_assistant_answers_agree_on_overlapping_leaves(self):
+        today = timezone.localdate()
+        make_leave(self.employee, today, today + timedelta(days=1))
+        make_leave(self.employee, today - timedelta(days=1), today)
+
+        assistant = HRQueryProcessor(make_user(role='hr'))
+        self.assertEqual(assistant._get_leave_today_data()['total_on_leave'], 1)
+        self.assertEqual(assistant._get_general_summary()['leave_requests']['on_leave_today'], 1)
+
+    def test_moving_a_leave_invalidates_its_old_month(self):
+        leave = make_leave(self.employee, date(2026, 3, 10), date(2026, 3, 12))
+        self.assertEqual(leave_names(department_month(self.department.pk, 2026, 3)), {self.employee.employee_id})
+
+        leave.start_date, leave.end_date = date(2026, 5, 4), date(2026, 5, 6)
+        leave.save()
+        self.assertEqual(leave_names(department_month(self.department.pk, 2026, 3)), set())
+        self.assertEqual(leave_names(department_month(None, 2026, 3)), set())
+        self.assertEqual(leave_names(department_month(self.department.pk, 2026, 5)), {self.employee.employee_id})
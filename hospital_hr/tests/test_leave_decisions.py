@@ -0,0 +1,37 @@
+import json
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hospital_hr.models import LeaveRequest
+
+from .factories import make_employee, make_user
+
+
+class BulkDecideTests(TestCase):
+    def setUp(self):
+        self.client.force_login(make_user(role='hr'))
+        self.leave = LeaveRequest.objects.create(
+            employee=make_employee(), leave_type='casual', start_date=date(2026, 3, 2), end_date=date(2026, 3, 3),
+            total_days=2, reason='Family',
+        )
+
+    def post(self, body):
+        return self.client.post(
+            reverse('hospital_hr:leave_request_bulk_decide'), json.dumps(body), content_type='application/json',
+        )
+
+    def test_null_rejection_reason(self):
+        response = self.post({'ids': [self.leave.pk], 'decision': 'rejected', 'rejection_reason': None})
+        self.assertEqual(response.status_code, 200)
+        self.leave.refresh_from_db()
+        self.assertEqual((self.leave.status, self.leave.rejection_reason), ('rejected', ''))
+
+    def test_malformed_bodies_are_rejected(self):
+        for body in ([self.leave.pk], 'approved', {'ids': str(self.leave.pk), 'decision': 'approved'},
+                     {'ids': [{'id': 1}], 'decision': 'approved'}, {'ids': [self.leave.pk], 'decision': ['approved']}):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+        self.leave.refresh_from_db()
+        self.assertEqual(self.leave.status, 'pending')
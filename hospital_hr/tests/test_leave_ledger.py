@@ -0,0 +1,71 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hospital_hr.leave_ledger import get_balances, rebuild_balances, settle_leave
+from hospital_hr.models import LeaveLedger, LeaveRequest
+
+from .factories import make_employee, make_user
+
+
+class LeaveSettlementTests(TestCase):
+    def setUp(self):
+        self.hr = make_user(role='hr')
+        self.employee = make_employee()
+        self.leave = LeaveRequest.objects.create(
+            employee=self.employee, leave_type='casual', start_date=date(2026, 3, 2), end_date=date(2026, 3, 4),
+            total_days=3, reason='Family',
+        )
+        self.client.force_login(self.hr)
+
+    def decide(self, status):
+        response = self.client.post(
+            reverse('hospital_hr:leave_request_approve', args=[self.leave.pk]),
+            {'status': status, 'rejection_reason': 'Short staffed' if status == 'rejected' else ''},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def balance(self):
+        balance = get_balances(self.employee).get('casual')
+        return balance.balance if balance else Decimal('0')
+
+    def test_approve_then_reject_restores_the_balance(self):
+        self.decide('approved')
+        self.assertEqual(self.balance(), Decimal('-3'))
+
+        self.decide('rejected')
+        self.assertEqual(self.balance(), Decimal('0'))
+        self.assertEqual(
+            list(self.leave.ledger_entries.order_by('id').values_list('entry_type', 'days')),
+            [('consumption', Decimal('-3')), ('adjustment', Decimal('3'))],
+        )
+
+    def test_approve_then_reject_leaves_nothing_accrued_or_used(self):
+        self.decide('approved')
+        self.decide('rejected')
+
+        balance = get_balances(self.employee)['casual']
+        self.assertEqual((balance.accrued, balance.consumed, balance.balance), (0, 0, 0))
+
+        rebuild_balances()
+        rebuilt = get_balances(self.employee)['casual']
+        self.assertEqual((rebuilt.accrued, rebuilt.consumed, rebuilt.balance), (0, 0, 0))
+
+    def test_reapproval_debits_again_once(self):
+        self.decide('approved')
+        self.decide('rejected')
+        self.decide('approved')
+        self.decide('approved')
+        self.assertEqual(self.balance(), Decimal('-3'))
+        self.assertEqual(self.leave.ledger_entries.count(), 3)
+
+    def test_cancelled_leave_is_credited_back(self):
+        self.decide('approved')
+        self.leave.refresh_from_db()
+        self.leave.status = 'cancelled'
+        self.leave.save()
+        settle_leave(self.leave)
+        self.assertEqual(self.balance(), Decimal('0'))
+        self.assertFalse(LeaveLedger.objects.filter(days=0).exists())
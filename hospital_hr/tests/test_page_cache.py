@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import parse_http_date
+
+from hospital_hr.models import Department, Job
+
+from .factories import make_department
+
+
+class CareersLastModifiedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.department = make_department()
+        self.jobs = [self.make_job(title) for title in ('Staff Nurse', 'Radiographer')]
+        self.url = reverse('hospital_hr:job_public_list')
+
+    def make_job(self, title):
+        return Job.objects.create(
+            title=title, department=self.department, category='nursing', description='-',
+            requirements='-', min_qualification='B.Sc', salary_min=30000, salary_max=40000,
+        )
+
+    def last_modified(self):
+        return self.client.get(self.url)['Last-Modified']
+
+    def test_survives_the_state_expiring(self):
+        before = self.last_modified()
+        cache.clear()
+        self.assertEqual(self.last_modified(), before)
+
+    def test_deletion_moves_it_forward(self):
+        # The remaining rows were last changed well before the deletion
+        earlier = self.jobs[0].updated_at - timedelta(days=1)
+        Job.objects.update(updated_at=earlier)
+        Department.objects.update(updated_at=earlier)
+        cache.clear()
+        before = parse_http_date(self.last_modified())
+
+        self.jobs[1].delete()
+        after = self.last_modified()
+        cache.clear()
+
+        self.assertGreater(parse_http_date(after), before)
+        self.assertEqual(self.last_modified(), after)
+
+    def test_not_modified_since_the_deletion_is_answered_304(self):
+        self.jobs[1].delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=self.last_modified())
+        self.assertEqual(response.status_code, 304)
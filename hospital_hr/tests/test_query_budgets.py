@@ -0,0 +1,92 @@
+"""
+Every view with a @query_budget runs here with QUERY_BUDGET_STRICT on, against
+enough rows that an N+1 shows up as duplicate queries.
+"""
+
+from datetime import time, timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, get_resolver, reverse
+from django.utils import timezone
+
+from hospital_hr.models import Attendance, AuditLog, Job, LeaveRequest
+
+from .factories import make_department, make_employee, make_user
+
+
+def budgeted_views():
+    """URL names of the views that declare a query budget."""
+    names = set()
+
+    def walk(patterns, namespace):
+        for pattern in patterns:
+            if isinstance(pattern, URLPattern):
+                if hasattr(pattern.callback, 'query_budget'):
+                    names.add(f'{namespace}:{pattern.name}')
+            else:
+                walk(pattern.url_patterns, pattern.namespace or namespace)
+
+    walk(get_resolver().url_patterns, None)
+    return names
+
+
+# URL name -> (role of the requesting user, URL args) for each request made
+CASES = {
+    'hospital_hr:dashboard': [('admin', ()), ('hr', ()), ('dept_head', ()), ('staff', ())],
+    'hospital_hr:department_list': [('hr', ())],
+    'hospital_hr:employee_list': [('hr', ())],
+    'hospital_hr:leave_calendar': [('hr', ()), ('dept_head', ())],
+    'hospital_hr:change_feed': [('hr', ('employees',))],
+    'hospital_hr:audit_log': [('hr', ())],
+    'hospital_hr:attendance_dashboard': [('hr', ())],
+    'hospital_hr:attendance_department': [('dept_head', ()), ('admin', ())],
+    'hospital_hr:attendance_report': [('hr', ())],
+}
+
+
+@override_settings(QUERY_BUDGET_STRICT=True, QUERY_PROFILING_ENABLED=False)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.admin = make_user(role='admin', is_superuser=True, is_staff=True)
+        cls.hr = make_user(role='hr')
+        cls.head = make_user(role='dept_head')
+        departments = [make_department(head=cls.head)] + [make_department() for _ in range(2)]
+        employees = [make_employee(department) for department in departments for _ in range(3)]
+        cls.staff = employees[0].user
+        for employee in employees:
+            Attendance.objects.create(
+                employee=employee, department=employee.department, date=today,
+                check_in_time=time(9), check_out_time=time(17),
+            )
+            LeaveRequest.objects.create(
+                employee=employee, leave_type='casual', start_date=today + timedelta(days=1),
+                end_date=today + timedelta(days=2), total_days=2, reason='Family', status='approved',
+            )
+            LeaveRequest.objects.create(
+                employee=employee, leave_type='sick', start_date=today + timedelta(days=5),
+                end_date=today + timedelta(days=5), total_days=1, reason='Fever',
+            )
+            AuditLog.objects.create(
+                model='employee', object_id=employee.pk, action='update',
+                changes={'salary': ['40000', '45000']}, timestamp=timezone.now(), user=cls.hr,
+            )
+        for department in departments:
+            Job.objects.create(
+                title=f'Staff Nurse {department.code}', department=department, category='nursing',
+                description='Ward duty', requirements='BSc Nursing', min_qualification='BSc Nursing',
+                salary_min=30000, salary_max=45000, closing_date=today + timedelta(days=30), posted_by=cls.hr,
+            )
+
+    def test_every_budgeted_view_has_a_case(self):
+        self.assertEqual(budgeted_views(), set(CASES))
+
+    def test_views_stay_within_budget(self):
+        users = {'admin': self.admin, 'hr': self.hr, 'dept_head': self.head, 'staff': self.staff}
+        for name, requests in CASES.items():
+            for role, args in requests:
+                with self.subTest(view=name, role=role):
+                    self.client.force_login(users[role])
+                    response = self.client.get(reverse(name, args=args))
+                    self.assertEqual(response.status_code, 200)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from hospital_hr.models import AuditLog, Employee, LeaveRequest
+from hospital_hr.status_scheduler import apply_transitions
+
+from .factories import make_employee
+
+
+class StatusSchedulerTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.employee = make_employee()
+
+    def approve_leave(self, start, end):
+        return LeaveRequest.objects.create(
+            employee=self.employee, leave_type='casual', start_date=start, end_date=end,
+            total_days=(end - start).days + 1, reason='Family', status='approved',
+        )
+
+    def status(self, employee=None):
+        return Employee.objects.get(pk=(employee or self.employee).pk).status
+
+    def test_leave_starts_and_ends(self):
+        self.approve_leave(self.today, self.today + timedelta(days=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            result = apply_transitions(self.today)
+        self.assertEqual(result['leave_started'], 1)
+        self.assertEqual(self.status(), 'on_leave')
+        self.assertTrue(AuditLog.objects.filter(model='employee', object_id=self.employee.pk).exists())
+
+        result = apply_transitions(self.today + timedelta(days=2))
+        self.assertEqual(result['leave_ended'], 1)
+        self.assertEqual(self.status(), 'active')
+
+    def test_rejected_leave_ends_the_status(self):
+        leave = self.approve_leave(self.today, self.today + timedelta(days=3))
+        apply_transitions(self.today)
+        leave.status = 'rejected'
+        leave.save()
+        apply_transitions(self.today)
+        self.assertEqual(self.status(), 'active')
+
+    def test_manual_on_leave_is_left_alone(self):
+        self.employee.status = 'on_leave'
+        self.employee.save()
+        result = apply_transitions(self.today)
+        self.assertEqual(result['leave_ended'], 0)
+        self.assertEqual(self.status(), 'on_leave')
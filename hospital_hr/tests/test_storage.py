@@ -0,0 +1,23 @@
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase
+
+from hospital_hr.storage import ranged_file_response
+
+
+class RangedFileResponseTests(SimpleTestCase):
+    def get(self, filename, range_header='bytes=0-3'):
+        request = RequestFactory().get('/', HTTP_RANGE=range_header)
+        return ranged_file_response(request, ContentFile(b'%PDF-1.4 resume', name='resume.pdf'), filename)
+
+    def test_partial_content(self):
+        response = self.get('resume.pdf')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="resume.pdf"')
+
+    def test_applicant_file_names_are_quoted(self):
+        response = self.get('cv"; filename*=evil.exe.pdf')
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="cv\\"; filename*=evil.exe.pdf"')
+
+        response = self.get('Résumé Lakshmi.pdf')
+        self.assertEqual(response['Content-Disposition'], "inline; filename*=utf-8''R%C3%A9sum%C3%A9%20Lakshmi.pdf")
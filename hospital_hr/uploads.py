@@ -0,0 +1,61 @@
+"""
+Upload handling for Amrita Hospital HRMS.
+
+Files are always streamed to a temporary file on disk (never buffered in memory)
+and the per-field size and type limits from settings.UPLOAD_LIMITS are enforced
+while the request body is still being read.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+
+
+def get_upload_limits(field_name):
+    limits = getattr(settings, 'UPLOAD_LIMITS', {})
+    return limits.get(field_name, limits.get('default', {}))
+
+
+def check_upload_type(field_name, file_name):
+    """Return an error message if the file extension is not allowed for the field."""
+    extensions = get_upload_limits(field_name).get('extensions')
+    extension = os.path.splitext(file_name or '')[1].lower().lstrip('.')
+    if extensions and extension not in extensions:
+        return f"Unsupported file type '.{extension}'. Allowed: {', '.join(extensions)}."
+    return None
+
+
+def check_upload_size(field_name, size):
+    """Return an error message if the file is larger than allowed for the field."""
+    max_size = get_upload_limits(field_name).get('max_size')
+    if max_size and size > max_size:
+        return f'File is too large. Maximum size is {filesizeformat(max_size)}.'
+    return None
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploads to disk and skips files that break the field's limits as soon
+    as the offending header or chunk arrives. Rejections are recorded on
+    request.upload_errors so forms can report them.
+    """
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        self.received = 0
+        self.request.upload_errors = getattr(self.request, 'upload_errors', {})
+        error = check_upload_type(field_name, file_name)
+        if error:
+            self.request.upload_errors[field_name] = error
+            raise SkipFile(error)
+        super().new_file(field_name, file_name, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        error = check_upload_size(self.field_name, self.received)
+        if error:
+            self.request.upload_errors[self.field_name] = error
+            self.file.close()
+            raise SkipFile(error)
+        return super().receive_data_chunk(raw_data, start)
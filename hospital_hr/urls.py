@@ -21,6 +21,8 @@ urlpatterns = [
     
     path('employees/', views.employee_list, name='employee_list'),
     path('employees/create/', views.employee_create, name='employee_create'),
+    path('employees/import/', views.employee_import, name='employee_import'),
+    path('employees/export/', views.employee_directory_export, name='employee_directory_export'),
     path('employees/<int:pk>/', views.employee_detail, name='employee_detail'),
     path('employees/<int:pk>/edit/', views.employee_edit, name='employee_edit'),
     path('employees/<int:pk>/delete/', views.employee_delete, name='employee_delete'),
@@ -37,13 +39,18 @@ urlpatterns = [
     
     path('applications/', views.application_list, name='application_list'),
     path('applications/<int:pk>/', views.application_detail, name='application_detail'),
+    path('applications/<int:pk>/resume/', views.application_resume, name='application_resume'),
     
     path('leave-requests/', views.leave_request_list, name='leave_request_list'),
     path('leave-requests/create/', views.leave_request_create, name='leave_request_create'),
+    path('leave-calendar/', views.leave_calendar, name='leave_calendar'),
+    path('leave-requests/bulk-decide/', views.leave_request_bulk_decide, name='leave_request_bulk_decide'),
     path('leave-requests/<int:pk>/approve/', views.leave_request_approve, name='leave_request_approve'),
     
     # Attendance Management
     path('attendance/', views.attendance_dashboard, name='attendance_dashboard'),
+    path('attendance/coverage/', views.department_coverage_poll, name='department_coverage_poll'),
+    path('attendance/stream/', views.attendance_stream, name='attendance_stream'),
     path('attendance/mark/<int:employee_id>/', views.attendance_mark, name='attendance_mark'),
     path('attendance/bulk-mark/', views.attendance_bulk_mark, name='attendance_bulk_mark'),
     path('attendance/department/', views.attendance_department, name='attendance_department'),
@@ -53,6 +60,12 @@ urlpatterns = [
     path('attendance/report/', views.attendance_report, name='attendance_report'),
     path('attendance/export/', views.attendance_export_csv, name='attendance_export_csv'),
     
+    # Change feed
+    path('api/changes/<str:entity>/', views.change_feed, name='change_feed'),
+    
+    # Audit log
+    path('audit/', views.audit_log, name='audit_log'),
+    
     # AI Assistant
     path('ai-assistant/', views.ai_assistant_view, name='ai_assistant'),
     path('ai-assistant/query/', views.ai_assistant_query, name='ai_assistant_query'),
@@ -2,26 +2,45 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
 from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from datetime import datetime, timedelta
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 import csv
 import json
-from .models import User, Department, Employee, Job, Application, LeaveRequest, Attendance
+from .models import User, Department, Employee, Job, Application, LeaveRequest, Attendance, AuditLog
 from .forms import (
-    UserLoginForm, UserRegistrationForm, DepartmentForm, EmployeeForm,
+    UserLoginForm, UserRegistrationForm, DepartmentForm, EmployeeForm, EmployeeImportForm,
     JobForm, ApplicationForm, ApplicationReviewForm, LeaveRequestForm, LeaveApprovalForm,
     AttendanceForm, AttendanceFilterForm, AttendanceReportForm
 )
 from .decorators import (
     role_required, admin_required, hr_or_admin_required,
-    dept_head_or_admin_required, staff_required
+    dept_head_or_admin_required, staff_required, query_budget
 )
 from .ai_assistant import HRQueryProcessor, GroqAIClient
-
-
+from .page_cache import cache_public_page
+from .storage import ranged_file_response
+from .leave_engine import LeaveCheck
+from .leave_calendar import department_month, leave_days_on
+from .leave_ledger import settle_leave
+from .roster import scheduled_shift, scheduled_shifts
+from .coverage import department_coverage, wait_for_coverage
+from .attendance_feed import AttendanceStream
+from .leave_decisions import DECISIONS, MAX_BULK_DECISIONS, decide_leaves
+from .status_scheduler import apply_transitions
+from .shift_compliance import apply_compliance
+from .directory_export import FORMATS as EXPORT_FORMATS, directory_rows, export_chunks, filter_employees, parse_columns
+from .employee_import import COLUMNS, REQUIRED_COLUMNS, WEB_MAX_PASSWORDS, error_report_csv, import_employees
+from .change_feed import ENTITIES as FEED_ENTITIES, changes_since
+from .audit import AUDITED_FIELDS
+from .attendance_archive import attendance_sources
+
+
+@cache_public_page()
 def landing_view(request):
     if request.user.is_authenticated:
         return redirect('hospital_hr:dashboard')
@@ -72,6 +91,7 @@ def logout_view(request):
 
 
 @login_required
+@query_budget(20)
 def dashboard_view(request):
     user = request.user
     
@@ -175,16 +195,14 @@ def hr_dashboard(request):
 
 
 def dept_head_dashboard(request):
-    try:
-        department = request.user.headed_department.first()
-    except:
-        department = None
+    department = request.principal.headed_department
     
     if department:
-        dept_employees = Employee.objects.filter(department=department, status='active')
+        dept_employees = Employee.objects.filter(department=department, status__in=['active', 'on_leave'])
         total_dept_staff = dept_employees.count()
-        on_duty = dept_employees.exclude(status='on_leave').count()
-        on_leave = dept_employees.filter(status='on_leave').count()
+        # Employees, not leave days: overlapping approved leaves must not count twice
+        on_leave = leave_days_on(timezone.localdate(), department.pk).values('employee_id').distinct().count()
+        on_duty = total_dept_staff - on_leave
         
         dept_employees_list = dept_employees.select_related('user')[:10]
         pending_leaves = LeaveRequest.objects.filter(
@@ -200,6 +218,7 @@ def dept_head_dashboard(request):
     
     context = {
         'department': department,
+        'coverage': department_coverage(department) if department else None,
         'total_dept_staff': total_dept_staff,
         'on_duty': on_duty,
         'on_leave': on_leave,
@@ -210,10 +229,7 @@ def dept_head_dashboard(request):
 
 
 def staff_dashboard(request):
-    try:
-        employee = request.user.employee_profile
-    except:
-        employee = None
+    employee = request.principal.employee
     
     if employee:
         # Get all leaves for counting
@@ -224,8 +240,10 @@ def staff_dashboard(request):
         
         # Get recent leaves for display (slice at the end)
         my_leaves = all_leaves.order_by('-created_at')[:10]
+        leave_balances = employee.leave_balances.all()
     else:
         my_leaves = []
+        leave_balances = []
         approved_leaves = 0
         pending_leaves = 0
         rejected_leaves = 0
@@ -236,13 +254,17 @@ def staff_dashboard(request):
         'approved_leaves': approved_leaves,
         'pending_leaves': pending_leaves,
         'rejected_leaves': rejected_leaves,
+        'leave_balances': leave_balances,
     }
     return render(request, 'hospital_hr/dashboard_staff.html', context)
 
 
 @hr_or_admin_required
+@query_budget(5, max_duplicates=0)
 def department_list(request):
-    departments = Department.objects.all().select_related('head')
+    departments = Department.objects.all().select_related('head').annotate(
+        staff_count=Count('employees', filter=Q(employees__status='active'))
+    )
     
     context = {
         'departments': departments,
@@ -304,27 +326,9 @@ def department_delete(request, pk):
 
 
 @hr_or_admin_required
+@query_budget(5, max_duplicates=0)
 def employee_list(request):
-    employees = Employee.objects.all().select_related('user', 'department')
-    
-    category = request.GET.get('category')
-    department = request.GET.get('department')
-    status = request.GET.get('status')
-    search = request.GET.get('search')
-    
-    if category:
-        employees = employees.filter(category=category)
-    if department:
-        employees = employees.filter(department_id=department)
-    if status:
-        employees = employees.filter(status=status)
-    if search:
-        employees = employees.filter(
-            Q(employee_id__icontains=search) |
-            Q(user__first_name__icontains=search) |
-            Q(user__last_name__icontains=search) |
-            Q(designation__icontains=search)
-        )
+    employees = filter_employees(Employee.objects.all().select_related('user', 'department'), request.GET)
     
     departments = Department.objects.filter(is_active=True)
     
@@ -335,6 +339,24 @@ def employee_list(request):
     return render(request, 'hospital_hr/employee_list.html', context)
 
 
+@hr_or_admin_required
+def employee_directory_export(request):
+    """Stream the staff directory (with the employee list filters) as CSV, JSON Lines or columnar JSON"""
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponse(f"Unknown format. Use one of: {', '.join(EXPORT_FORMATS)}.", status=400)
+    try:
+        columns = parse_columns(request.GET.getlist('columns'))
+    except ValueError as exc:
+        return HttpResponse(str(exc), status=400)
+    
+    content_type, extension = EXPORT_FORMATS[fmt]
+    rows = directory_rows(request.GET, columns)
+    response = StreamingHttpResponse(export_chunks(rows, columns, fmt), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="staff_directory_{timezone.localdate()}.{extension}"'
+    return response
+
+
 @hr_or_admin_required
 def employee_create(request):
     if request.method == 'POST':
@@ -374,6 +396,44 @@ def employee_create(request):
     return render(request, 'hospital_hr/employee_form.html', context)
 
 
+@hr_or_admin_required
+def employee_import(request):
+    """Bulk-create employees from a CSV/XLSX upload, with a per-row error report"""
+    result = None
+    if request.method == 'POST':
+        form = EmployeeImportForm(request.POST, request.FILES, upload_errors=getattr(request, 'upload_errors', {}))
+        if form.is_valid():
+            upload = form.cleaned_data['employee_file']
+            try:
+                # Hashes in-process: no process pool inside the web server
+                result = import_employees(
+                    upload, upload.name, dry_run=form.cleaned_data['dry_run'], max_passwords=WEB_MAX_PASSWORDS,
+                )
+            except ValueError as exc:
+                messages.error(request, str(exc))
+            else:
+                if result.dry_run:
+                    messages.info(request, f'{result.valid} of {result.total} rows are valid. Nothing was created.')
+                elif result.created:
+                    messages.success(request, f'Imported {result.created} employees.')
+                if result.errors and request.POST.get('download_errors'):
+                    response = HttpResponse(error_report_csv(result), content_type='text/csv')
+                    response['Content-Disposition'] = 'attachment; filename="employee_import_errors.csv"'
+                    return response
+    else:
+        form = EmployeeImportForm()
+    
+    context = {
+        'form': form,
+        'result': result,
+        'errors': result.errors[:500] if result else [],
+        'columns': COLUMNS,
+        'required_columns': REQUIRED_COLUMNS,
+        'max_passwords': WEB_MAX_PASSWORDS,
+    }
+    return render(request, 'hospital_hr/employee_import.html', context)
+
+
 @hr_or_admin_required
 def employee_edit(request, pk):
     employee = get_object_or_404(Employee, pk=pk)
@@ -555,7 +615,7 @@ def job_apply(request, pk):
     job = get_object_or_404(Job, pk=pk, status='open')
     
     if request.method == 'POST':
-        form = ApplicationForm(request.POST, request.FILES)
+        form = ApplicationForm(request.POST, request.FILES, upload_errors=getattr(request, 'upload_errors', {}))
         if form.is_valid():
             application = form.save(commit=False)
             application.job = job
@@ -572,6 +632,7 @@ def job_apply(request, pk):
     return render(request, 'hospital_hr/job_apply.html', context)
 
 
+@cache_public_page(filters=('category', 'department'))
 def job_public_list(request):
     jobs = Job.objects.filter(status='open').select_related('department')
     
@@ -592,6 +653,7 @@ def job_public_list(request):
     return render(request, 'hospital_hr/job_public_list.html', context)
 
 
+@cache_public_page()
 def job_public_detail(request, pk):
     job = get_object_or_404(Job, pk=pk, status='open')
     
@@ -622,6 +684,16 @@ def application_list(request):
     return render(request, 'hospital_hr/application_list.html', context)
 
 
+@hr_or_admin_required
+def application_resume(request, pk):
+    application = get_object_or_404(Application, pk=pk)
+    if not application.resume:
+        return HttpResponse(status=404)
+    extension = application.resume.name.rsplit('.', 1)[-1]
+    filename = f"{application.applicant_name.replace(' ', '_')}_resume.{extension}"
+    return ranged_file_response(request, application.resume, filename=filename)
+
+
 @hr_or_admin_required
 def application_detail(request, pk):
     application = get_object_or_404(Application, pk=pk)
@@ -646,22 +718,23 @@ def application_detail(request, pk):
 
 @staff_required
 def leave_request_create(request):
-    try:
-        employee = request.user.employee_profile
-    except:
+    employee = request.principal.employee
+    if employee is None:
         messages.error(request, 'You must be an employee to request leave.')
         return redirect('hospital_hr:dashboard')
     
     if request.method == 'POST':
-        form = LeaveRequestForm(request.POST)
+        form = LeaveRequestForm(request.POST, employee=employee)
         if form.is_valid():
             leave_request = form.save(commit=False)
             leave_request.employee = employee
             leave_request.save()
-            messages.success(request, 'Leave request submitted successfully!')
+            messages.success(request, f'Leave request for {leave_request.total_days} working day(s) submitted successfully!')
+            if form.leave_check.conflicts:
+                messages.warning(request, f'Staffing note: {form.leave_check.conflict_summary}')
             return redirect('hospital_hr:dashboard')
     else:
-        form = LeaveRequestForm()
+        form = LeaveRequestForm(employee=employee)
     
     context = {
         'form': form,
@@ -671,7 +744,11 @@ def leave_request_create(request):
 
 @hr_or_admin_required
 def leave_request_list(request):
-    leave_requests = LeaveRequest.objects.all().select_related('employee__user', 'approved_by')
+    from django.core.paginator import Paginator
+    
+    leave_requests = LeaveRequest.objects.all().select_related(
+        'employee__user', 'employee__department', 'approved_by'
+    )
     
     status = request.GET.get('status')
     department = request.GET.get('department')
@@ -683,13 +760,88 @@ def leave_request_list(request):
     
     departments = Department.objects.filter(is_active=True)
     
+    # A page is also the unit of "select all" for bulk decisions
+    paginator = Paginator(leave_requests, 500)
+    page = paginator.get_page(request.GET.get('page'))
+    query = request.GET.copy()
+    query.pop('page', None)
+    
     context = {
-        'leave_requests': leave_requests,
+        'leave_requests': page,
         'departments': departments,
+        'filter_query': query.urlencode(),
     }
     return render(request, 'hospital_hr/leave_request_list.html', context)
 
 
+@hr_or_admin_required
+@require_POST
+def leave_request_bulk_decide(request):
+    """Approve or reject the selected pending leave requests in one transaction (AJAX)."""
+    try:
+        data = json.loads(request.body)
+        if not isinstance(data, dict) or not isinstance(data.get('ids', []), list):
+            raise ValueError('Expected an object with a list of ids.')
+        leave_ids = list(dict.fromkeys(int(pk) for pk in data.get('ids', [])))
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return JsonResponse({'success': False, 'error': 'Invalid request format.'}, status=400)
+    
+    decision = data.get('decision')
+    if decision not in DECISIONS:
+        return JsonResponse({'success': False, 'error': 'Decision must be approved or rejected.'}, status=400)
+    if not leave_ids:
+        return JsonResponse({'success': False, 'error': 'No leave requests selected.'}, status=400)
+    if len(leave_ids) > MAX_BULK_DECISIONS:
+        return JsonResponse({
+            'success': False,
+            'error': f'At most {MAX_BULK_DECISIONS} leave requests can be processed at once.'
+        }, status=400)
+    
+    rejection_reason = str(data.get('rejection_reason') or '').strip()
+    results = decide_leaves(leave_ids, decision, request.user, rejection_reason)
+    processed = sum(1 for result in results if result['ok'])
+    return JsonResponse({
+        'success': True,
+        'processed': processed,
+        'skipped': len(results) - processed,
+        'results': results,
+    })
+
+
+@role_required('admin', 'hr', 'dept_head')
+@query_budget(6, max_duplicates=0)
+def leave_calendar(request):
+    """Month view of who is on leave, per department (dept heads see their own)."""
+    today = timezone.localdate()
+    try:
+        month_start = datetime.strptime(request.GET.get('month', ''), '%Y-%m').date()
+    except ValueError:
+        month_start = today.replace(day=1)
+    
+    departments = request.principal.scope(Department.objects.filter(is_active=True), department_field='id')
+    if request.principal.sees_all_departments:
+        department = departments.filter(pk=request.GET.get('department') or None).first()
+    else:
+        department = departments.first()
+        if department is None:
+            return redirect('hospital_hr:access_denied')
+    
+    weeks = department_month(department.pk if department else None, month_start.year, month_start.month)
+    previous_month = (month_start - timedelta(days=1)).replace(day=1)
+    next_month = (month_start + timedelta(days=31)).replace(day=1)
+    
+    context = {
+        'weeks': weeks,
+        'month_start': month_start,
+        'previous_month': previous_month,
+        'next_month': next_month,
+        'today': today,
+        'department': department,
+        'departments': departments,
+    }
+    return render(request, 'hospital_hr/leave_calendar.html', context)
+
+
 @hr_or_admin_required
 def leave_request_approve(request, pk):
     leave_request = get_object_or_404(LeaveRequest, pk=pk)
@@ -697,27 +849,143 @@ def leave_request_approve(request, pk):
     if request.method == 'POST':
         form = LeaveApprovalForm(request.POST, instance=leave_request)
         if form.is_valid():
-            leave = form.save(commit=False)
-            leave.approved_by = request.user
-            leave.approval_date = timezone.now()
-            leave.save()
-            
-            if leave.status == 'approved':
-                leave.employee.status = 'on_leave'
-                leave.employee.save()
+            with transaction.atomic():
+                leave = form.save(commit=False)
+                leave.approved_by = request.user
+                leave.approval_date = timezone.now()
+                leave.save()
+                
+                # Debits an approval; credits it back when an approved leave is rejected or cancelled
+                settle_leave(leave, request.user)
+                
+                # Status only changes while the leave is in effect; future leaves
+                # are picked up by the status scheduler on their start date
+                apply_transitions(employee_ids=[leave.employee_id])
             
             messages.success(request, 'Leave request processed successfully!')
             return redirect('hospital_hr:leave_request_list')
     else:
         form = LeaveApprovalForm(instance=leave_request)
     
+    leave_check = None
+    if leave_request.status == 'pending':
+        leave_check = LeaveCheck(
+            leave_request.employee, leave_request.start_date, leave_request.end_date, exclude_pk=leave_request.pk
+        )
+    
     context = {
         'form': form,
         'leave_request': leave_request,
+        'leave_check': leave_check,
     }
     return render(request, 'hospital_hr/leave_request_approve.html', context)
 
 
+@role_required('admin', 'hr', 'dept_head')
+def attendance_stream(request):
+    """Server-sent events stream of attendance changes for a date (and department)."""
+    try:
+        day = datetime.strptime(request.GET.get('date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        day = timezone.localdate()
+    
+    if request.principal.sees_all_departments:
+        department_id = request.GET.get('department') or None
+    elif request.principal.headed_department_ids:
+        department_id = request.principal.headed_department_ids[0]
+    else:
+        return HttpResponse(status=403)
+    
+    cursor = request.headers.get('Last-Event-ID') or request.GET.get('cursor')
+    stream = AttendanceStream(day, department_id, int(cursor) if cursor and cursor.isdigit() else None)
+    
+    # Under ASGI the stream is consumed asynchronously and does not hold a worker thread
+    content = stream.__aiter__() if isinstance(request, ASGIRequest) else iter(stream)
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@role_required('admin', 'hr', 'dept_head')
+def department_coverage_poll(request):
+    """Long-poll for live staffing coverage: answers as soon as the version differs from ?version=."""
+    if request.principal.sees_all_departments:
+        department = Department.objects.filter(pk=request.GET.get('department') or None).first()
+    else:
+        department = request.principal.headed_department
+    if department is None:
+        return JsonResponse({'success': False, 'error': 'Department not found.'}, status=404)
+    
+    try:
+        since_version = int(request.GET.get('version', -1))
+    except ValueError:
+        since_version = -1
+    return JsonResponse({'success': True, 'coverage': wait_for_coverage(department, since_version)})
+
+
+@hr_or_admin_required
+@query_budget(2)
+def change_feed(request, entity):
+    """Rows of `entity` changed (and ids deleted) since ?cursor=, one keyset page at a time."""
+    if entity not in FEED_ENTITIES:
+        return JsonResponse({
+            'success': False, 'error': f"Unknown entity. Available: {', '.join(FEED_ENTITIES)}."
+        }, status=404)
+    
+    try:
+        limit = int(request.GET.get('limit') or 0) or None
+        page = changes_since(entity, request.GET.get('cursor'), limit)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid cursor or limit.'}, status=400)
+    return JsonResponse({'success': True, **page})
+
+
+@hr_or_admin_required
+@query_budget(4)
+def audit_log(request):
+    """Audit trail of sensitive changes, filtered by record, action, user and date."""
+    from django.core.paginator import Paginator
+    
+    entries = AuditLog.objects.select_related('user')
+    
+    model = request.GET.get('model')
+    object_id = request.GET.get('object_id')
+    action = request.GET.get('action')
+    username = request.GET.get('user')
+    date_from = request.GET.get('date_from')
+    date_to = request.GET.get('date_to')
+    
+    if model:
+        entries = entries.filter(model=model)
+    if object_id and object_id.isdigit():
+        entries = entries.filter(object_id=object_id)
+    if action:
+        entries = entries.filter(action=action)
+    if username:
+        entries = entries.filter(user__username=username)
+    try:
+        if date_from:
+            entries = entries.filter(timestamp__date__gte=datetime.strptime(date_from, '%Y-%m-%d').date())
+        if date_to:
+            entries = entries.filter(timestamp__date__lte=datetime.strptime(date_to, '%Y-%m-%d').date())
+    except ValueError:
+        messages.error(request, 'Dates must be in YYYY-MM-DD format.')
+    
+    paginator = Paginator(entries, 100)
+    page = paginator.get_page(request.GET.get('page'))
+    query = request.GET.copy()
+    query.pop('page', None)
+    
+    context = {
+        'entries': page,
+        'models': [(m._meta.model_name, m._meta.verbose_name.title()) for m in AUDITED_FIELDS],
+        'actions': AuditLog.ACTION_CHOICES,
+        'filter_query': query.urlencode(),
+    }
+    return render(request, 'hospital_hr/audit_log.html', context)
+
+
 @login_required
 def access_denied(request):
     return render(request, 'hospital_hr/access_denied.html')
@@ -727,8 +995,26 @@ def access_denied(request):
 # ATTENDANCE MANAGEMENT VIEWS
 # ============================================
 
+def _attendance_for_date(employees, date):
+    """
+    Load the attendance of the employees (a queryset, used as a subquery so no
+    id list is bound) on a date in one query, keyed by employee id
+    """
+    records = Attendance.objects.filter(employee__in=employees, date=date)
+    return {att.employee_id: att for att in records}
+
+
+def _attendance_stats(total, records):
+    stats = {'total': total, 'present': 0, 'absent': 0, 'late': 0, 'half_day': 0, 'on_leave': 0}
+    for att in records:
+        stats[att.status] += 1
+    stats['unmarked'] = stats['total'] - (stats['present'] + stats['absent'] + stats['late'] + stats['half_day'] + stats['on_leave'])
+    return stats
+
+
 @login_required
 @hr_or_admin_required
+@query_budget(8, max_duplicates=0)
 def attendance_dashboard(request):
     """HR/Admin attendance dashboard - mark and view attendance for all departments"""
     today = timezone.now().date()
@@ -745,25 +1031,21 @@ def attendance_dashboard(request):
     employees = Employee.objects.filter(status='active').select_related('user', 'department')
     if selected_department:
         employees = employees.filter(department_id=selected_department)
+    attendance_by_employee = _attendance_for_date(employees, selected_date)
+    employees = list(employees)
+    
+    shifts = scheduled_shifts(employees, selected_date)
     
     employee_attendance = []
     for emp in employees:
-        attendance = Attendance.objects.filter(employee=emp, date=selected_date).first()
+        attendance = attendance_by_employee.get(emp.id)
         employee_attendance.append({
             'employee': emp,
             'attendance': attendance,
-            'form': AttendanceForm(instance=attendance) if attendance else AttendanceForm(initial={'shift': emp.shift})
+            'form': AttendanceForm(instance=attendance) if attendance else AttendanceForm(initial={'shift': shifts[emp.id]})
         })
     
-    stats = {
-        'total': employees.count(),
-        'present': Attendance.objects.filter(date=selected_date, status='present', employee__in=employees).count(),
-        'absent': Attendance.objects.filter(date=selected_date, status='absent', employee__in=employees).count(),
-        'late': Attendance.objects.filter(date=selected_date, status='late', employee__in=employees).count(),
-        'half_day': Attendance.objects.filter(date=selected_date, status='half_day', employee__in=employees).count(),
-        'on_leave': Attendance.objects.filter(date=selected_date, status='on_leave', employee__in=employees).count(),
-    }
-    stats['unmarked'] = stats['total'] - (stats['present'] + stats['absent'] + stats['late'] + stats['half_day'] + stats['on_leave'])
+    stats = _attendance_stats(len(employees), attendance_by_employee.values())
     
     context = {
         'employee_attendance': employee_attendance,
@@ -793,7 +1075,7 @@ def attendance_mark(request, employee_id):
         date=date,
         defaults={
             'department': employee.department,
-            'shift': employee.shift,
+            'shift': scheduled_shift(employee, date),
             'marked_by': request.user
         }
     )
@@ -804,6 +1086,8 @@ def attendance_mark(request, employee_id):
             att = form.save(commit=False)
             att.marked_by = request.user
             att.department = employee.department
+            # Keep the status HR chose, but derive the late/early/overtime minutes
+            apply_compliance(att, update_status=False)
             att.save()
             messages.success(request, f'Attendance marked for {employee.get_full_name()}')
             return redirect(f"{request.META.get('HTTP_REFERER', 'hospital_hr:attendance_dashboard')}?date={date}")
@@ -860,6 +1144,7 @@ def attendance_bulk_mark(request):
 
 @login_required
 @dept_head_or_admin_required
+@query_budget(8, max_duplicates=0)
 def attendance_department(request):
     """Department Head view - READ ONLY - only see their department"""
     today = timezone.now().date()
@@ -872,7 +1157,7 @@ def attendance_department(request):
     
     user_department = None
     if request.user.role == 'dept_head':
-        user_department = Department.objects.filter(head=request.user).first()
+        user_department = request.principal.headed_department
         if not user_department:
             messages.error(request, 'You are not assigned as head of any department.')
             return redirect('hospital_hr:dashboard')
@@ -881,23 +1166,17 @@ def attendance_department(request):
         employees = Employee.objects.filter(status='active')
         user_department = Department.objects.filter(is_active=True).first()
     
+    attendance_by_employee = _attendance_for_date(employees, selected_date)
+    employees = list(employees.select_related('user'))
+    
     employee_attendance = []
     for emp in employees:
-        attendance = Attendance.objects.filter(employee=emp, date=selected_date).first()
         employee_attendance.append({
             'employee': emp,
-            'attendance': attendance,
+            'attendance': attendance_by_employee.get(emp.id),
         })
     
-    stats = {
-        'total': employees.count(),
-        'present': Attendance.objects.filter(date=selected_date, status='present', employee__in=employees).count(),
-        'absent': Attendance.objects.filter(date=selected_date, status='absent', employee__in=employees).count(),
-        'late': Attendance.objects.filter(date=selected_date, status='late', employee__in=employees).count(),
-        'half_day': Attendance.objects.filter(date=selected_date, status='half_day', employee__in=employees).count(),
-        'on_leave': Attendance.objects.filter(date=selected_date, status='on_leave', employee__in=employees).count(),
-    }
-    stats['unmarked'] = stats['total'] - (stats['present'] + stats['absent'] + stats['late'] + stats['half_day'] + stats['on_leave'])
+    stats = _attendance_stats(len(employees), attendance_by_employee.values())
     
     context = {
         'employee_attendance': employee_attendance,
@@ -915,9 +1194,8 @@ def attendance_department(request):
 @login_required
 def attendance_my_view(request):
     """Staff mark their own attendance with Check In/Check Out"""
-    try:
-        employee = request.user.employee_profile
-    except Employee.DoesNotExist:
+    employee = request.principal.employee
+    if employee is None:
         messages.error(request, 'No employee profile found for your account.')
         return redirect('hospital_hr:dashboard')
     
@@ -935,14 +1213,16 @@ def attendance_my_view(request):
         date__lte=today
     ).order_by('-date')
     
-    stats = {
-        'present': attendance_records.filter(status='present').count(),
-        'absent': attendance_records.filter(status='absent').count(),
-        'late': attendance_records.filter(status='late').count(),
-        'half_day': attendance_records.filter(status='half_day').count(),
-        'on_leave': attendance_records.filter(status='on_leave').count(),
-    }
+    stats = attendance_records.aggregate(
+        present=Count('id', filter=Q(status='present')),
+        absent=Count('id', filter=Q(status='absent')),
+        late=Count('id', filter=Q(status='late')),
+        half_day=Count('id', filter=Q(status='half_day')),
+        on_leave=Count('id', filter=Q(status='on_leave')),
+        worked_minutes=Sum('worked_minutes', default=0),
+    )
     stats['total_working_days'] = stats['present'] + stats['late'] + stats['half_day']
+    stats['hours_worked'] = round(stats['worked_minutes'] / 60, 1)
     
     context = {
         'employee': employee,
@@ -958,14 +1238,13 @@ def attendance_my_view(request):
 @login_required
 def attendance_check_in(request):
     """Staff check in"""
-    try:
-        employee = request.user.employee_profile
-    except Employee.DoesNotExist:
+    employee = request.principal.employee
+    if employee is None:
         messages.error(request, 'No employee profile found for your account.')
         return redirect('hospital_hr:dashboard')
     
-    today = timezone.now().date()
-    now = timezone.now()
+    now = timezone.localtime()
+    today = now.date()
     
     # Check if already checked in today
     attendance = Attendance.objects.filter(employee=employee, date=today).first()
@@ -975,20 +1254,20 @@ def attendance_check_in(request):
     
     # Create or update attendance
     if not attendance:
-        attendance = Attendance.objects.create(
+        attendance = Attendance(
             employee=employee,
             department=employee.department,
             date=today,
-            shift=employee.shift,
-            check_in_time=now.time(),
-            status='present',
+            shift=scheduled_shift(employee, today),
             marked_by=request.user
         )
-        messages.success(request, f'Checked in successfully at {now.strftime("%H:%M")}')
+    attendance.check_in_time = now.time()
+    attendance.status = 'present'
+    apply_compliance(attendance)
+    attendance.save()
+    if attendance.late_minutes:
+        messages.warning(request, f'Checked in at {now.strftime("%H:%M")} - {attendance.late_minutes} minutes late')
     else:
-        attendance.check_in_time = now.time()
-        attendance.status = 'present'
-        attendance.save()
         messages.success(request, f'Checked in successfully at {now.strftime("%H:%M")}')
     
     return redirect('hospital_hr:attendance_my_view')
@@ -997,14 +1276,13 @@ def attendance_check_in(request):
 @login_required
 def attendance_check_out(request):
     """Staff check out"""
-    try:
-        employee = request.user.employee_profile
-    except Employee.DoesNotExist:
+    employee = request.principal.employee
+    if employee is None:
         messages.error(request, 'No employee profile found for your account.')
         return redirect('hospital_hr:dashboard')
     
-    today = timezone.now().date()
-    now = timezone.now()
+    now = timezone.localtime()
+    today = now.date()
     
     # Get today's attendance
     attendance = Attendance.objects.filter(employee=employee, date=today).first()
@@ -1018,6 +1296,7 @@ def attendance_check_out(request):
     
     # Update check out time
     attendance.check_out_time = now.time()
+    apply_compliance(attendance)
     attendance.save()
     messages.success(request, f'Checked out successfully at {now.strftime("%H:%M")}')
     
@@ -1026,6 +1305,7 @@ def attendance_check_out(request):
 
 @login_required
 @hr_or_admin_required
+@query_budget(8, max_duplicates=0)
 def attendance_report(request):
     """Attendance reports with filters and export"""
     today = timezone.now().date()
@@ -1041,35 +1321,49 @@ def attendance_report(request):
         start_date = today - timedelta(days=30)
         end_date = today
     
-    attendance_qs = Attendance.objects.filter(date__gte=start_date, date__lte=end_date)
-    
+    # The live table, plus the archive when the range reaches an archived year
+    sources = attendance_sources(start_date, end_date)
     if department_id:
-        attendance_qs = attendance_qs.filter(department_id=department_id)
+        sources = [qs.filter(department_id=department_id) for qs in sources]
     if employee_id:
-        attendance_qs = attendance_qs.filter(employee_id=employee_id)
-    
-    attendance_qs = attendance_qs.select_related('employee', 'employee__user', 'department', 'marked_by')
-    
-    stats = {
-        'total_records': attendance_qs.count(),
-        'present': attendance_qs.filter(status='present').count(),
-        'absent': attendance_qs.filter(status='absent').count(),
-        'late': attendance_qs.filter(status='late').count(),
-        'half_day': attendance_qs.filter(status='half_day').count(),
-        'on_leave': attendance_qs.filter(status='on_leave').count(),
-    }
+        sources = [qs.filter(employee_id=employee_id) for qs in sources]
+    sources = [qs.select_related('employee', 'employee__user', 'department', 'marked_by') for qs in sources]
+    
+    stats = {}
+    dept_totals = {}
+    for attendance_qs in sources:
+        part = attendance_qs.aggregate(
+            total_records=Count('id'),
+            present=Count('id', filter=Q(status='present')),
+            absent=Count('id', filter=Q(status='absent')),
+            late=Count('id', filter=Q(status='late')),
+            half_day=Count('id', filter=Q(status='half_day')),
+            on_leave=Count('id', filter=Q(status='on_leave')),
+            worked_minutes=Sum('worked_minutes', default=0),
+        )
+        for key, value in part.items():
+            stats[key] = stats.get(key, 0) + value
+        
+        for row in attendance_qs.values('department__name').annotate(
+            total=Count('id'),
+            present=Count('id', filter=Q(status='present')),
+            absent=Count('id', filter=Q(status='absent')),
+            late=Count('id', filter=Q(status='late')),
+            worked_minutes=Sum('worked_minutes', default=0),
+        ):
+            totals = dept_totals.setdefault(row['department__name'], dict.fromkeys(row, 0))
+            for key, value in row.items():
+                totals[key] = value if key == 'department__name' else totals[key] + value
+    stats['hours_worked'] = round(stats['worked_minutes'] / 60, 1)
     
     if stats['total_records'] > 0:
         stats['attendance_rate'] = round((stats['present'] + stats['late'] + stats['half_day']) / stats['total_records'] * 100, 1)
     else:
         stats['attendance_rate'] = 0
     
-    dept_stats = attendance_qs.values('department__name').annotate(
-        total=Count('id'),
-        present=Count('id', filter=Q(status='present')),
-        absent=Count('id', filter=Q(status='absent')),
-        late=Count('id', filter=Q(status='late')),
-    ).order_by('department__name')
+    dept_stats = [dept_totals[name] for name in sorted(dept_totals, key=lambda name: name or '')]
+    for row in dept_stats:
+        row['hours_worked'] = round(row['worked_minutes'] / 60, 1)
     
     form = AttendanceReportForm(initial={
         'start_date': start_date,
@@ -1078,8 +1372,15 @@ def attendance_report(request):
         'employee': employee_id if employee_id else None,
     })
     
+    # Newest first: the live rows, then archived ones if there is room
+    attendance_records = []
+    for attendance_qs in reversed(sources):
+        remaining = 500 - len(attendance_records)
+        if remaining > 0:
+            attendance_records += attendance_qs.order_by('-date', 'employee__user__first_name')[:remaining]
+    
     context = {
-        'attendance_records': attendance_qs.order_by('-date', 'employee__user__first_name')[:500],
+        'attendance_records': attendance_records,
         'stats': stats,
         'dept_stats': dept_stats,
         'form': form,
@@ -1105,13 +1406,12 @@ def attendance_export_csv(request):
         start_date = timezone.now().date() - timedelta(days=30)
         end_date = timezone.now().date()
     
-    attendance_qs = Attendance.objects.filter(
-        date__gte=start_date,
-        date__lte=end_date
-    ).select_related('employee', 'employee__user', 'department', 'marked_by')
-    
+    sources = [
+        qs.select_related('employee', 'employee__user', 'department', 'marked_by')
+        for qs in attendance_sources(start_date, end_date)
+    ]
     if department_id:
-        attendance_qs = attendance_qs.filter(department_id=department_id)
+        sources = [qs.filter(department_id=department_id) for qs in sources]
     
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="attendance_{start_date}_{end_date}.csv"'
@@ -1122,7 +1422,9 @@ def attendance_export_csv(request):
         'Status', 'Check In', 'Check Out', 'Working Hours', 'Marked By', 'Notes'
     ])
     
-    for att in attendance_qs.order_by('date', 'employee__user__first_name'):
+    # Sources are oldest first, so archived years come before the live rows
+    records = (att for qs in sources for att in qs.order_by('date', 'employee__user__first_name'))
+    for att in records:
         writer.writerow([
             att.date.strftime('%Y-%m-%d'),
             att.employee.employee_id,
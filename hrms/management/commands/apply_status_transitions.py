@@ -0,0 +1,51 @@
+"""
+Apply effective-dated employee status transitions for approved leaves.
+
+Run daily shortly after midnight (safe to re-run at any time):
+    python manage.py apply_status_transitions
+    python manage.py apply_status_transitions --since 2026-01-01   # catch up after downtime
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.audit import audit_context
+from hospital_hr.status_scheduler import apply_transitions, catch_up
+
+
+class Command(BaseCommand):
+    help = "Flip employee status for leaves starting/ending and create their 'on_leave' attendance"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Apply transitions as of this date (YYYY-MM-DD, default today)')
+        parser.add_argument('--since', help='Also create leave attendance for every day from this date')
+
+    def handle(self, *args, **options):
+        as_of = self._parse_date(options['date'], '--date')
+        since = self._parse_date(options['since'], '--since')
+
+        # Status changes go to the audit log in one write
+        with audit_context(path='apply_status_transitions'):
+            if since:
+                results = catch_up(since, as_of)
+            else:
+                results = [apply_transitions(as_of)]
+
+        for result in results:
+            self.stdout.write(
+                f"{result['date']}: {result.get('leave_started', 0)} started leave, "
+                f"{result.get('leave_ended', 0)} returned, "
+                f"{result['attendance_created']} attendance created, "
+                f"{result['attendance_withdrawn']} withdrawn"
+            )
+        self.stdout.write(self.style.SUCCESS('Status transitions applied.'))
+
+    @staticmethod
+    def _parse_date(value, option):
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'{option} expects a date as YYYY-MM-DD.')
@@ -0,0 +1,56 @@
+"""
+Move closed years of attendance into the archive table, verify or restore them.
+
+Example:
+    python manage.py archive_attendance 2024
+    python manage.py archive_attendance 2024 --verify
+    python manage.py archive_attendance 2024 --restore
+    python manage.py archive_attendance --list
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from hospital_hr.attendance_archive import archive_year, restore_year, verify
+from hospital_hr.models import AttendanceArchive
+
+
+class Command(BaseCommand):
+    help = 'Archive a closed year of attendance (checksummed), or verify/restore an archived year'
+
+    def add_arguments(self, parser):
+        parser.add_argument('year', type=int, nargs='?')
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument('--verify', action='store_true', help='Recompute and compare the checksum')
+        action.add_argument('--restore', action='store_true', help='Move the year back into the live table')
+        action.add_argument('--list', action='store_true', help='List archived years')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for archive in AttendanceArchive.objects.all():
+                verified = f'{archive.verified_at:%Y-%m-%d %H:%M}' if archive.verified_at else 'never'
+                self.stdout.write(
+                    f'{archive.year}  {archive.row_count:>9} rows  sha256 {archive.checksum[:16]}…  verified {verified}'
+                )
+            return
+        if options['year'] is None:
+            raise CommandError('Give a year, or --list.')
+
+        year = options['year']
+        started = time.perf_counter()
+        try:
+            if options['verify']:
+                ok, archive = verify(year)
+                if not ok:
+                    raise CommandError(f'Archive of {year} does NOT match its checksum ({archive.row_count} rows expected).')
+                summary = f'Archive of {year} verified: {archive.row_count} rows, checksum matches'
+            elif options['restore']:
+                summary = f'Restored {restore_year(year)} rows of {year} to the live table'
+            else:
+                archive = archive_year(year)
+                summary = f'Archived {archive.moved} rows of {year} ({archive.row_count} in the archive, sha256 {archive.checksum[:16]}…)'
+        except (ValueError, IntegrityError) as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'{summary} in {time.perf_counter() - started:.2f}s.'))
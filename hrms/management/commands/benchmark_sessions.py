@@ -0,0 +1,144 @@
+"""
+Compare the database reads and writes per request of the cached session,
+message and authentication configuration (hospital_hr/session_auth.py, enabled
+in settings when a shared cache is configured) against Django's defaults
+(database sessions, session-fallback messages, uncached ModelBackend).
+
+Each iteration browses like a logged-in HR user: two pages, a request that
+adds a flash message and redirects, and the page that shows the message.
+
+Example:
+    python manage.py benchmark_sessions --iterations 20
+    python manage.py benchmark_sessions --output benchmarks/sessions.json
+"""
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from hospital_hr.models import User
+from hospital_hr.profiling import QueryRecorder
+
+
+CONFIGURATIONS = {
+    'django_defaults': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+        'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    },
+    # What amrita_hrms/settings.py enables with a shared cache (see hospital_hr/session_auth.py)
+    'cached': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+        'AUTHENTICATION_BACKENDS': ['hospital_hr.session_auth.CachedModelBackend'],
+    },
+}
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class Command(BaseCommand):
+    help = 'Database reads/writes per request: cached sessions/messages/auth vs Django defaults'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--username', help='User to browse as (default: the first HR user)')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['username']) if options['username'] else User.objects.filter(role='hr')
+        user = users.first()
+        if user is None:
+            raise CommandError('No user to browse as; pass --username.')
+
+        self.stdout.write(
+            f"Configured: {settings.SESSION_ENGINE}, {settings.MESSAGE_STORAGE}, "
+            f"{', '.join(settings.AUTHENTICATION_BACKENDS)}"
+        )
+        results = {}
+        with override_settings(QUERY_PROFILING_ENABLED=False, QUERY_BUDGET_STRICT=False):
+            for name, overrides in CONFIGURATIONS.items():
+                with override_settings(**overrides):
+                    results[name] = self._run(user, options['iterations'], options['warmup'])
+                self._print_result(name, results[name])
+
+        before, after = results['django_defaults'], results['cached']
+        self.stdout.write(self.style.SUCCESS(
+            f"Per request: {before['reads']:.2f} -> {after['reads']:.2f} reads, "
+            f"{before['writes']:.2f} -> {after['writes']:.2f} writes "
+            f"({before['session_queries']:.2f} -> {after['session_queries']:.2f} on django_session, "
+            f"{before['user_queries']:.2f} -> {after['user_queries']:.2f} user lookups)."
+        ))
+
+        if options['output']:
+            path = Path(options['output'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({'user': user.username, 'results': results}, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Results written to {path}'))
+
+    def _steps(self):
+        dashboard = reverse('hospital_hr:dashboard')
+        return [
+            dashboard,
+            reverse('hospital_hr:employee_list'),
+            # Adds a flash message for users without an employee profile and redirects
+            reverse('hospital_hr:attendance_my_view'),
+            dashboard,
+        ]
+
+    def _run(self, user, iterations, warmup):
+        # A new client per configuration: the session middleware picks its engine when it is loaded
+        client = Client()
+        client.force_login(user)
+        steps = self._steps()
+        for _ in range(warmup):
+            for url in steps:
+                client.get(url)
+
+        reads = writes = session_queries = user_queries = 0
+        timings = []
+        for _ in range(iterations):
+            for url in steps:
+                with QueryRecorder() as recorder:
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code not in (200, 302):
+                    raise CommandError(f'{url} returned HTTP {response.status_code}')
+                for sql, count in recorder.fingerprints.items():
+                    statement = sql.split(' ', 1)[0].upper()
+                    if statement == 'SELECT':
+                        reads += count
+                        if 'FROM "hospital_hr_user"' in sql:
+                            user_queries += count
+                    elif statement in WRITE_STATEMENTS:
+                        writes += count
+                    if '"django_session"' in sql:
+                        session_queries += count
+        client.logout()
+
+        requests = iterations * len(steps)
+        return {
+            'requests': requests,
+            'reads': round(reads / requests, 2),
+            'writes': round(writes / requests, 2),
+            'session_queries': round(session_queries / requests, 2),
+            'user_queries': round(user_queries / requests, 2),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'p50_ms': round(statistics.median(timings), 2),
+        }
+
+    def _print_result(self, name, result):
+        self.stdout.write(
+            f"  {name:16} {result['reads']:6.2f} reads   {result['writes']:5.2f} writes   "
+            f"{result['session_queries']:5.2f} session   {result['user_queries']:5.2f} user   "
+            f"p50 {result['p50_ms']:8.2f} ms   ({result['requests']} requests)"
+        )
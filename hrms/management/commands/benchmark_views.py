@@ -0,0 +1,221 @@
+"""
+End-to-end view benchmarks against the current database (usually the synthetic
+dataset from generate_hospital_data).
+
+Example:
+    python manage.py benchmark_views --iterations 20 --output benchmarks/baseline.json
+    python manage.py benchmark_views --compare benchmarks/baseline.json --max-regression 20
+"""
+
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from hospital_hr.ai_assistant import GroqAIClient
+from hospital_hr.models import User, Department, Employee, Job, Attendance, LeaveRequest, Application
+from hospital_hr.profiling import QueryRecorder
+
+
+STUB_LLM_RESPONSE = 'Benchmark stub response.'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the main hospital_hr views (p50/p95 latency, queries, peak memory)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--only', nargs='*', help='Run only the named scenarios')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Compare against a previously written JSON baseline')
+        parser.add_argument('--max-regression', type=float, default=None,
+                            help='Fail if p95 latency regresses by more than this percentage')
+
+    def handle(self, *args, **options):
+        scenarios = self._scenarios()
+        if options['only']:
+            scenarios = [s for s in scenarios if s['name'] in options['only']]
+
+        results = {}
+        # Profiling middleware logging would distort the timings; stub the LLM call
+        with override_settings(QUERY_PROFILING_ENABLED=False, QUERY_BUDGET_STRICT=False), \
+                mock.patch.object(GroqAIClient, 'generate_response', return_value=STUB_LLM_RESPONSE):
+            for scenario in scenarios:
+                if scenario.get('skip'):
+                    self.stdout.write(self.style.WARNING(f"  {scenario['name']}: skipped ({scenario['skip']})"))
+                    continue
+                results[scenario['name']] = self._run(scenario, options['iterations'], options['warmup'])
+                self._print_result(scenario['name'], results[scenario['name']])
+
+        report = {
+            'meta': self._meta(),
+            'results': results,
+        }
+
+        if options['output']:
+            path = Path(options['output'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Results written to {path}'))
+
+        if options['compare']:
+            self._compare(report, options['compare'], options['max_regression'])
+
+    def _scenarios(self):
+        users = {
+            'admin': User.objects.filter(role='admin').first() or User.objects.filter(is_superuser=True).first(),
+            'hr': User.objects.filter(role='hr').first(),
+            'dept_head': User.objects.filter(role='dept_head', headed_department__isnull=False).first(),
+            'staff': User.objects.filter(role='staff', employee_profile__isnull=False).first(),
+        }
+        job = Job.objects.filter(status='open').first()
+        department = Department.objects.filter(is_active=True).first()
+        today = timezone.now().date()
+
+        def scenario(name, role, url, method='get', data=None, content_type=None):
+            item = {'name': name, 'user': users.get(role) if role else None, 'url': url,
+                    'method': method, 'data': data, 'content_type': content_type}
+            if role and item['user'] is None:
+                item['skip'] = f'no {role} user in the database'
+            return item
+
+        scenarios = [
+            scenario(f'dashboard_{role}', role, reverse('hospital_hr:dashboard'))
+            for role in ('admin', 'hr', 'dept_head', 'staff')
+        ]
+        scenarios += [
+            scenario('employee_list', 'hr', reverse('hospital_hr:employee_list')),
+            scenario('attendance_dashboard', 'hr', reverse('hospital_hr:attendance_dashboard'),
+                     data={'date': today.isoformat(), 'department': department.pk if department else ''}),
+            scenario('attendance_report', 'hr', reverse('hospital_hr:attendance_report')),
+            scenario('attendance_export_csv', 'hr', reverse('hospital_hr:attendance_export_csv')),
+            scenario('job_public_list', None, reverse('hospital_hr:job_public_list')),
+            scenario('ai_assistant_query', 'hr', reverse('hospital_hr:ai_assistant_query'), method='post',
+                     data=json.dumps({'query': 'Show attendance summary for today'}),
+                     content_type='application/json'),
+        ]
+        if job is None:
+            scenarios[-2]['skip'] = 'no open jobs in the database'
+        return scenarios
+
+    def _request(self, client, scenario):
+        kwargs = {'data': scenario['data']} if scenario['data'] is not None else {}
+        if scenario['content_type']:
+            kwargs['content_type'] = scenario['content_type']
+        response = getattr(client, scenario['method'])(scenario['url'], **kwargs)
+        # Consume streamed bodies so their cost is included
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        if response.status_code != 200:
+            raise CommandError(f"{scenario['name']} returned HTTP {response.status_code}")
+        return len(body)
+
+    def _run(self, scenario, iterations, warmup):
+        client = Client()
+        if scenario['user'] is not None:
+            client.force_login(scenario['user'])
+
+        for _ in range(warmup):
+            self._request(client, scenario)
+
+        timings = []
+        query_counts = []
+        size = 0
+        for _ in range(iterations):
+            with QueryRecorder() as recorder:
+                start = time.perf_counter()
+                size = self._request(client, scenario)
+                timings.append((time.perf_counter() - start) * 1000)
+            query_counts.append(recorder.count)
+
+        # Memory is measured on a separate request, tracemalloc slows everything down
+        tracemalloc.start()
+        try:
+            self._request(client, scenario)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            'url': scenario['url'],
+            'iterations': iterations,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(_percentile(timings, 95), 2),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'queries': max(query_counts),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'response_bytes': size,
+        }
+
+    def _print_result(self, name, result):
+        self.stdout.write(
+            f"  {name:28} p50 {result['p50_ms']:9.2f} ms   p95 {result['p95_ms']:9.2f} ms   "
+            f"{result['queries']:4d} queries   {result['peak_memory_kb']:10.1f} KB peak"
+        )
+
+    def _meta(self):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'timestamp': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'dataset': {
+                'departments': Department.objects.count(),
+                'employees': Employee.objects.count(),
+                'attendance': Attendance.objects.count(),
+                'leave_requests': LeaveRequest.objects.count(),
+                'applications': Application.objects.count(),
+            },
+        }
+
+    def _compare(self, report, baseline_path, max_regression):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read baseline {baseline_path}: {e}')
+
+        self.stdout.write(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+        regressions = []
+        for name, current in report['results'].items():
+            previous = baseline['results'].get(name)
+            if not previous:
+                continue
+            change = (current['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100 if previous['p95_ms'] else 0
+            self.stdout.write(
+                f"  {name:28} p95 {previous['p95_ms']:9.2f} -> {current['p95_ms']:9.2f} ms ({change:+.1f}%)   "
+                f"queries {previous['queries']} -> {current['queries']}"
+            )
+            if max_regression is not None and change > max_regression:
+                regressions.append(name)
+            if current['queries'] > previous['queries']:
+                regressions.append(f'{name} (queries)')
+
+        if regressions and max_regression is not None:
+            raise CommandError(f"Performance regressions: {', '.join(regressions)}")
+
+
+def _percentile(sorted_values, percentile):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    index = (len(sorted_values) - 1) * percentile / 100
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (index - lower)
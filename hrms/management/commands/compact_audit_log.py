@@ -0,0 +1,30 @@
+"""
+Apply the audit log retention policy (settings.AUDIT_LOG).
+
+Deletes records older than the retention period and merges older updates into
+one record per object, user and day. Run weekly:
+    python manage.py compact_audit_log
+    python manage.py compact_audit_log --retention-days 365 --compact-after-days 30
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.audit import compact
+
+
+class Command(BaseCommand):
+    help = 'Delete expired audit log records and merge old updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, help='Override AUDIT_LOG retention_days')
+        parser.add_argument('--compact-after-days', type=int, help='Override AUDIT_LOG compact_after_days')
+
+    def handle(self, *args, **options):
+        for name in ('retention_days', 'compact_after_days'):
+            if options[name] is not None and options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+
+        deleted, merged = compact(options['retention_days'], options['compact_after_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired audit records and merged away {merged} old updates.'
+        ))
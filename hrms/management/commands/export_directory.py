@@ -0,0 +1,43 @@
+"""
+Export the staff directory (Employee + User + Department) with flat memory use.
+
+Example:
+    python manage.py export_directory --output staff.csv
+    python manage.py export_directory --format jsonl --status active --department 3
+    python manage.py export_directory --format columnar --columns employee_id,email,salary > staff.jsonl
+"""
+
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.directory_export import FORMATS, directory_rows, export_chunks, parse_columns
+
+
+class Command(BaseCommand):
+    help = 'Stream the staff directory as CSV, JSON Lines or columnar JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--columns', help='Comma-separated column names (default: a standard set)')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--category')
+        parser.add_argument('--department', help='Department id')
+        parser.add_argument('--status')
+        parser.add_argument('--search')
+
+    def handle(self, *args, **options):
+        try:
+            columns = parse_columns(options['columns'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        filters = {name: options[name] for name in ('category', 'department', 'status', 'search')}
+        chunks = export_chunks(directory_rows(filters, columns), columns, options['format'])
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"Directory written to {options['output']}."))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
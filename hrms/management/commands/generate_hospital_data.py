@@ -0,0 +1,420 @@
+"""
+Generate a synthetic hospital at realistic scale for benchmarking.
+
+Everything is written with bulk_create in batches, except attendance which is
+inserted as plain tuples (see _RowInserter) because it is by far the largest table.
+Those tuples carry worked_minutes themselves, as Attendance.save() would, and
+the shift compliance fields are computed afterwards for the whole range.
+
+Example:
+    python manage.py generate_hospital_data --departments 50 --employees 20000 \
+        --attendance-days 1095 --leave-requests 100000 --applications 500000 --workers 4
+"""
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, time as dt_time, timedelta
+from decimal import Decimal
+import multiprocessing
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, models, transaction
+from django.utils import timezone
+
+from hospital_hr.leave_calendar import sync_leave_days
+from hospital_hr.models import (
+    User, Department, Employee, Job, Application, LeaveRequest, Attendance, ArchivedAttendance, AttendanceEvent,
+    LeaveBalance, LeaveDay, LeaveLedger, Payslip, ShiftAssignment, Holiday,
+)
+from hospital_hr.shift_compliance import recompute
+
+
+USERNAME_PREFIX = 'syn_'
+DEPARTMENT_CODE_PREFIX = 'SYN'
+SYNTHETIC_PASSWORD = 'synthetic123'
+
+DEPARTMENT_NAMES = [
+    'Cardiology', 'Oncology', 'ICU', 'Neurosciences', 'Emergency Medicine', 'General Surgery',
+    'Pediatrics', 'Orthopedics', 'Nephrology', 'Gastroenterology', 'Pulmonology', 'Radiology',
+    'Dermatology', 'Psychiatry', 'Obstetrics', 'Urology', 'ENT', 'Ophthalmology',
+]
+
+FIRST_NAMES = [
+    'Arun', 'Lakshmi', 'Priya', 'Rahul', 'Anjali', 'Vivek', 'Meera', 'Suresh', 'Divya', 'Kiran',
+    'Deepa', 'Ravi', 'Sneha', 'Ajay', 'Kavya', 'Manoj', 'Nisha', 'Gopal', 'Asha', 'Hari',
+]
+LAST_NAMES = [
+    'Nair', 'Menon', 'Pillai', 'Kumar', 'Iyer', 'Sharma', 'Reddy', 'Das', 'Varma', 'Krishnan',
+]
+
+DESIGNATIONS = {
+    'medical': ['Consultant', 'Senior Resident', 'Junior Resident'],
+    'nursing': ['Staff Nurse', 'Head Nurse', 'Nursing Assistant'],
+    'paramedical': ['Lab Technician', 'Radiographer', 'Pharmacist'],
+    'admin_support': ['Clerk', 'Receptionist', 'Housekeeping Supervisor'],
+}
+CATEGORY_WEIGHTS = {'medical': 15, 'nursing': 45, 'paramedical': 20, 'admin_support': 20}
+SHIFT_WEIGHTS = {'morning': 30, 'afternoon': 25, 'night': 20, 'general': 20, 'rotating': 5}
+ATTENDANCE_STATUS_WEIGHTS = {'present': 85, 'late': 6, 'half_day': 3, 'absent': 3, 'on_leave': 3}
+SHIFT_HOURS = {
+    'morning': (6, 14), 'afternoon': (14, 22), 'night': (22, 6), 'general': (9, 17), 'rotating': (9, 17),
+}
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic hospital (departments, employees, attendance, leaves, jobs, applications)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--departments', type=int, default=50)
+        parser.add_argument('--employees', type=int, default=20000)
+        parser.add_argument('--attendance-days', type=int, default=365 * 3,
+                            help='Number of days of daily attendance ending today')
+        parser.add_argument('--leave-requests', type=int, default=100000)
+        parser.add_argument('--jobs', type=int, default=500)
+        parser.add_argument('--applications', type=int, default=500000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes used for attendance generation (server databases only)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated synthetic data first')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.rng = random.Random(options['seed'])
+        workers = options['workers']
+
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite allows a single writer at a time; generating attendance in one process.'
+            ))
+            workers = 1
+
+        if connection.vendor == 'sqlite':
+            # Durability is irrelevant for throwaway benchmark data
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=OFF')
+
+        if options['clear']:
+            self._clear()
+        elif Department.objects.filter(code__startswith=DEPARTMENT_CODE_PREFIX).exists():
+            raise CommandError('Synthetic data already exists. Re-run with --clear to regenerate it.')
+
+        started = time.perf_counter()
+        departments = self._timed('departments', self._create_departments, options['departments'])
+        employee_ids = self._timed('employees', self._create_employees, options['employees'], departments)
+        self._timed('leave requests', self._create_leave_requests, options['leave_requests'], employee_ids)
+        jobs = self._timed('jobs', self._create_jobs, options['jobs'], departments)
+        self._timed('applications', self._create_applications, options['applications'], jobs)
+        self._timed('attendance', self._create_attendance, options['attendance_days'], workers, options['seed'])
+        self._timed('shift compliance', self._apply_shift_compliance, options['attendance_days'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Synthetic hospital generated in {time.perf_counter() - started:.1f}s '
+            f'(password for all synthetic users: {SYNTHETIC_PASSWORD})'
+        ))
+
+    def _timed(self, label, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        count = len(result) if isinstance(result, (list, dict)) else result
+        self.stdout.write(f'  {label}: {count} rows in {time.perf_counter() - started:.1f}s')
+        return result
+
+    def _clear(self):
+        """
+        Delete the synthetic rows child-first with _raw_delete, which skips the ORM
+        collector and the per-row post_delete signals (change feed tombstones, audit
+        log, live coverage). Those would write a record for every deleted row and
+        make clearing far slower than generating.
+        """
+        self.stdout.write('Clearing previous synthetic data...')
+        started = time.perf_counter()
+        users = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        departments = Department.objects.filter(code__startswith=DEPARTMENT_CODE_PREFIX)
+        employees = Employee.objects.filter(user__in=users)
+        jobs = Job.objects.filter(department__in=departments)
+        by_employee = models.Q(employee__in=employees)
+        by_employee_or_department = by_employee | models.Q(department__in=departments)
+
+        with transaction.atomic():
+            # Rows kept (real data) that point at synthetic users or departments lose the reference
+            for parent, queryset in ((User, users), (Department, departments)):
+                for relation in parent._meta.get_fields(include_hidden=True):
+                    if relation.one_to_many and relation.auto_created and relation.on_delete is models.SET_NULL:
+                        relation.related_model._base_manager.filter(
+                            **{f'{relation.field.name}__in': queryset}
+                        ).update(**{relation.field.name: None})
+
+            deleted = 0
+            for queryset in (
+                Attendance.objects.filter(by_employee_or_department),
+                ArchivedAttendance.objects.filter(by_employee_or_department),
+                AttendanceEvent.objects.filter(by_employee),
+                ShiftAssignment.objects.filter(by_employee_or_department),
+                Payslip.objects.filter(by_employee),
+                LeaveDay.objects.filter(by_employee),
+                LeaveLedger.objects.filter(by_employee),
+                LeaveBalance.objects.filter(by_employee),
+                LeaveRequest.objects.filter(by_employee),
+                Holiday.objects.filter(department__in=departments),
+                Application.objects.filter(job__in=jobs),
+                jobs,
+                employees,
+                User.groups.through.objects.filter(user__in=users),
+                User.user_permissions.through.objects.filter(user__in=users),
+                LogEntry.objects.filter(user__in=users),
+                users,
+                departments,
+            ):
+                deleted += queryset._raw_delete(queryset.db)
+        self.stdout.write(f'  cleared: {deleted} rows in {time.perf_counter() - started:.1f}s')
+
+    def _create_departments(self, count):
+        locations = [choice[0] for choice in Department.LOCATION_CHOICES]
+        departments = []
+        for i in range(count):
+            base_name = DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]
+            departments.append(Department(
+                name=f'{base_name} {i // len(DEPARTMENT_NAMES) + 1} (Synthetic)',
+                code=f'{DEPARTMENT_CODE_PREFIX}{i:04d}',
+                location=self.rng.choice(locations),
+                total_beds=self.rng.randint(10, 80),
+            ))
+        Department.objects.bulk_create(departments, batch_size=self.batch_size)
+        return list(Department.objects.filter(code__startswith=DEPARTMENT_CODE_PREFIX).values_list('id', flat=True))
+
+    def _create_employees(self, count, departments):
+        # Hashing is deliberately slow; hash once and share it across all synthetic users
+        password_hash = make_password(SYNTHETIC_PASSWORD)
+        categories = self.rng.choices(list(CATEGORY_WEIGHTS), weights=list(CATEGORY_WEIGHTS.values()), k=count)
+        shifts = self.rng.choices(list(SHIFT_WEIGHTS), weights=list(SHIFT_WEIGHTS.values()), k=count)
+        today = date.today()
+
+        for offset in range(0, count, self.batch_size):
+            stop = min(offset + self.batch_size, count)
+            users = []
+            for i in range(offset, stop):
+                users.append(User(
+                    username=f'{USERNAME_PREFIX}{i:06d}',
+                    password=password_hash,
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    email=f'{USERNAME_PREFIX}{i:06d}@amrita-hospital.com',
+                    role='staff',
+                    employee_id=f'SYN{i:06d}',
+                ))
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                user_ids = dict(User.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list('username', 'id'))
+
+                employees = []
+                for i, user in zip(range(offset, stop), users):
+                    category = categories[i]
+                    employees.append(Employee(
+                        user_id=user_ids[user.username],
+                        employee_id=user.employee_id,
+                        department_id=self.rng.choice(departments),
+                        category=category,
+                        designation=self.rng.choice(DESIGNATIONS[category]),
+                        shift=shifts[i],
+                        date_of_joining=today - timedelta(days=self.rng.randint(30, 365 * 10)),
+                        experience_years=self.rng.randint(0, 30),
+                        salary=Decimal(self.rng.randrange(25000, 250000, 500)),
+                    ))
+                Employee.objects.bulk_create(employees)
+
+        self._assign_department_heads(departments)
+        return dict(Employee.objects.filter(
+            employee_id__startswith='SYN'
+        ).values_list('id', 'department_id'))
+
+    def _assign_department_heads(self, departments):
+        heads = {}
+        for user_id, department_id in Employee.objects.filter(
+            department_id__in=departments, category='medical'
+        ).order_by('id').values_list('user_id', 'department_id'):
+            heads.setdefault(department_id, user_id)
+
+        with transaction.atomic():
+            User.objects.filter(pk__in=heads.values()).update(role='dept_head')
+            department_objects = list(Department.objects.filter(pk__in=heads))
+            for department in department_objects:
+                department.head_id = heads[department.pk]
+            Department.objects.bulk_update(department_objects, ['head'], batch_size=self.batch_size)
+
+    def _create_leave_requests(self, count, employee_ids):
+        ids = list(employee_ids)
+        leave_types = [choice[0] for choice in LeaveRequest.LEAVE_TYPE_CHOICES]
+        statuses = self.rng.choices(['approved', 'pending', 'rejected', 'cancelled'], weights=[70, 15, 10, 5], k=count)
+        today = date.today()
+
+        created = 0
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for i in range(offset, min(offset + self.batch_size, count)):
+                start = today - timedelta(days=self.rng.randint(-60, 365 * 3))
+                days = self.rng.randint(1, 10)
+                batch.append(LeaveRequest(
+                    employee_id=self.rng.choice(ids),
+                    leave_type=self.rng.choice(leave_types),
+                    start_date=start,
+                    end_date=start + timedelta(days=days - 1),
+                    total_days=days,
+                    reason='Synthetic leave request',
+                    status=statuses[i],
+                ))
+            LeaveRequest.objects.bulk_create(batch)
+            sync_leave_days(batch)
+            created += len(batch)
+        return created
+
+    def _create_jobs(self, count, departments):
+        categories = list(CATEGORY_WEIGHTS)
+        jobs = []
+        for i in range(count):
+            category = self.rng.choice(categories)
+            salary_min = self.rng.randrange(25000, 150000, 1000)
+            jobs.append(Job(
+                title=f'{self.rng.choice(DESIGNATIONS[category])} (Synthetic {i})',
+                department_id=self.rng.choice(departments),
+                category=category,
+                vacancies=self.rng.randint(1, 10),
+                description='Synthetic job posting',
+                requirements='Synthetic requirements',
+                min_qualification='Graduate',
+                salary_min=Decimal(salary_min),
+                salary_max=Decimal(salary_min + self.rng.randrange(5000, 50000, 1000)),
+                status=self.rng.choice(['open', 'open', 'closed', 'on_hold']),
+            ))
+        Job.objects.bulk_create(jobs, batch_size=self.batch_size)
+        return list(Job.objects.filter(department_id__in=departments).values_list('id', flat=True))
+
+    def _create_applications(self, count, jobs):
+        statuses = [choice[0] for choice in Application.STATUS_CHOICES]
+        created = 0
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for i in range(offset, min(offset + self.batch_size, count)):
+                batch.append(Application(
+                    job_id=self.rng.choice(jobs),
+                    applicant_name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                    # Unique per application, so (job, email) never collides
+                    email=f'applicant{i:07d}@example.com',
+                    phone=f'9{i:09d}',
+                    qualification='Graduate',
+                    experience_years=self.rng.randint(0, 25),
+                    resume='resumes/synthetic.pdf',
+                    status=self.rng.choice(statuses),
+                ))
+            Application.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    def _create_attendance(self, days, workers, seed):
+        employees = list(Employee.objects.filter(
+            employee_id__startswith='SYN'
+        ).values_list('id', 'department_id', 'shift', 'date_of_joining').order_by('id'))
+        partitions = [
+            (employees[i::workers], days, self.batch_size, seed + i)
+            for i in range(workers)
+        ]
+
+        if workers == 1:
+            return _generate_attendance_partition(partitions[0])
+
+        # Each forked worker must open its own database connection
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            return sum(executor.map(_generate_attendance_partition, partitions))
+
+    def _apply_shift_compliance(self, days):
+        # Late / early leave / overtime, and the status they imply, as a check-in would set them
+        today = date.today()
+        return recompute(today - timedelta(days=days - 1), today, batch_size=self.batch_size)[1]
+
+
+class _RowInserter:
+    """
+    Inserts plain tuples with executemany, bypassing model instantiation.
+
+    bulk_create spends most of its time building model instances and preparing each
+    value; for tens of millions of attendance rows that overhead dominates. Columns
+    that are not supplied get the field default, so new model fields keep working.
+    """
+
+    def __init__(self, model, field_names):
+        self.field_names = field_names
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        supplied = [model._meta.get_field(name) for name in field_names]
+        self.defaults = [
+            field.get_db_prep_save(self._default(field), connection)
+            for field in fields if field not in supplied
+        ]
+        columns = [field.column for field in supplied] + [
+            field.column for field in fields if field not in supplied
+        ]
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(column) for column in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+
+    @staticmethod
+    def _default(field):
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            return timezone.now()
+        return field.get_default()
+
+    def insert(self, rows):
+        defaults = tuple(self.defaults)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(self.sql, [row + defaults for row in rows])
+        return len(rows)
+
+
+def _generate_attendance_partition(args):
+    """Insert daily attendance for a slice of employees; runs in worker processes too."""
+    employees, days, batch_size, seed = args
+    rng = random.Random(seed)
+    statuses = list(ATTENDANCE_STATUS_WEIGHTS)
+    weights = list(ATTENDANCE_STATUS_WEIGHTS.values())
+    today = date.today()
+    first_day = today - timedelta(days=days - 1)
+    inserter = _RowInserter(Attendance, [
+        'employee', 'department', 'date', 'shift', 'status', 'check_in_time', 'check_out_time', 'worked_minutes',
+    ])
+    adapt_date = connection.ops.adapt_datefield_value
+    adapt_time = connection.ops.adapt_timefield_value
+
+    created = 0
+    batch = []
+    for day_offset in range(days):
+        day = first_day + timedelta(days=day_offset)
+        db_day = adapt_date(day)
+        day_statuses = rng.choices(statuses, weights=weights, k=len(employees))
+        for (employee_id, department_id, shift, joined), status in zip(employees, day_statuses):
+            if joined > day or department_id is None:
+                continue
+            check_in = check_out = None
+            worked = 0
+            if status in ('present', 'late', 'half_day'):
+                start_hour, end_hour = SHIFT_HOURS[shift]
+                late_by = rng.randint(10, 50) if status == 'late' else rng.randint(0, 9)
+                check_in = dt_time(start_hour % 24, late_by)
+                check_out = dt_time((start_hour + 4) % 24 if status == 'half_day' else end_hour, rng.randint(0, 20))
+                worked = Attendance.minutes_between(check_in, check_out)
+                check_in, check_out = adapt_time(check_in), adapt_time(check_out)
+            batch.append((employee_id, department_id, db_day, shift, status, check_in, check_out, worked))
+            if len(batch) >= batch_size:
+                created += inserter.insert(batch)
+                batch = []
+    if batch:
+        created += inserter.insert(batch)
+    return created
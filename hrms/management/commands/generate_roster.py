@@ -0,0 +1,89 @@
+"""
+Generate shift rosters, or re-plan around a sick call.
+
+Example:
+    python manage.py generate_roster --start 2026-02-01 --weeks 4
+    python manage.py generate_roster --department ICU --start 2026-02-01 --month
+    python manage.py generate_roster --replan EMP0042 --start 2026-02-10 --end 2026-02-11
+"""
+
+import calendar
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.models import Department, Employee
+from hospital_hr.roster import generate_roster, replan_absence
+
+
+class Command(BaseCommand):
+    help = 'Generate department shift rosters (ShiftAssignment) or re-plan an absence'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--department', action='append', help='Department code (repeatable; default all active)')
+        parser.add_argument('--start', required=True, help='First day (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day (YYYY-MM-DD)')
+        parser.add_argument('--weeks', type=int, help='Plan this many weeks from --start')
+        parser.add_argument('--month', action='store_true', help='Plan until the end of the month of --start')
+        parser.add_argument('--replan', metavar='EMPLOYEE_ID',
+                            help='Free this employee\'s shifts in the range and find cover')
+
+    def handle(self, *args, **options):
+        start = self._parse_date(options['start'], '--start')
+        if options['end']:
+            end = self._parse_date(options['end'], '--end')
+        elif options['weeks']:
+            end = start + timedelta(weeks=options['weeks'], days=-1)
+        elif options['month']:
+            end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+        else:
+            end = start if options['replan'] else start + timedelta(days=6)
+        if end < start:
+            raise CommandError('--end must not be before --start.')
+
+        if options['replan']:
+            self._replan(options['replan'], start, end)
+            return
+
+        departments = Department.objects.filter(is_active=True)
+        if options['department']:
+            departments = departments.filter(code__in=options['department'])
+            if not departments:
+                raise CommandError('No active department matches the given codes.')
+
+        for department in departments:
+            started = time.perf_counter()
+            planner = generate_roster(department, start, end)
+            self.stdout.write(
+                f'{department.code}: {planner.saved} assignments for {len(planner.employees)} staff '
+                f'in {time.perf_counter() - started:.2f}s'
+            )
+            for gap in planner.shortfalls[:10]:
+                self.stdout.write(self.style.WARNING(
+                    f"  short {gap['missing']} {gap['category']} on {gap['date']} {gap['shift']}"
+                ))
+            if len(planner.shortfalls) > 10:
+                self.stdout.write(self.style.WARNING(f'  ... {len(planner.shortfalls) - 10} more shortfalls'))
+        self.stdout.write(self.style.SUCCESS(f'Rosters generated for {start} to {end}.'))
+
+    def _replan(self, employee_id, start, end):
+        try:
+            employee = Employee.objects.select_related('department').get(employee_id=employee_id)
+        except Employee.DoesNotExist:
+            raise CommandError(f'Employee {employee_id} does not exist.')
+
+        changes = replan_absence(employee, start, end)
+        if not changes:
+            self.stdout.write(f'{employee_id} has no assignments between {start} and {end}.')
+        for change in changes:
+            replacement = change['replacement']
+            cover = f'{replacement.employee_id} ({replacement.get_full_name()})' if replacement else 'NO COVER'
+            self.stdout.write(f"{change['date']} {change['shift']}: {cover}")
+
+    @staticmethod
+    def _parse_date(value, option):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'{option} expects a date as YYYY-MM-DD.')
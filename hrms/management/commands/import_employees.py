@@ -0,0 +1,50 @@
+"""
+Bulk-create employees (and their user accounts) from a CSV or XLSX file.
+
+Example:
+    python manage.py import_employees nursing_batch.csv --dry-run
+    python manage.py import_employees nursing_batch.xlsx --errors errors.csv
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.employee_import import COLUMNS, REQUIRED_COLUMNS, error_report_csv, import_employees
+
+
+class Command(BaseCommand):
+    help = 'Import employees from a CSV/XLSX file; invalid rows are skipped and reported'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, create nothing')
+        parser.add_argument('--errors', metavar='CSV', help='Write the per-row error report to this file')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: CPU count)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as upload:
+                result = import_employees(upload, options['path'], dry_run=options['dry_run'], workers=options['workers'])
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except ValueError as exc:
+            raise CommandError(f'{exc}\nColumns: {", ".join(COLUMNS)} (required: {", ".join(REQUIRED_COLUMNS)})')
+
+        for error in result.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"  row {error['row']}: {'; '.join(error['messages'])}"))
+        if len(result.errors) > 20:
+            self.stdout.write(self.style.WARNING(f'  ... {len(result.errors) - 20} more rows with errors'))
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', newline='') as report:
+                report.write(error_report_csv(result))
+            self.stdout.write(f"Error report written to {options['errors']}.")
+
+        if result.dry_run:
+            summary = f'{result.valid} of {result.total} rows are valid (dry run, nothing created)'
+        else:
+            summary = f'Created {result.created} employees from {result.total} rows'
+            if result.without_password:
+                summary += f'; {result.without_password} accounts have no password yet'
+        self.stdout.write(self.style.SUCCESS(f'{summary} in {time.perf_counter() - started:.2f}s.'))
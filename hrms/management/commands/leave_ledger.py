@@ -0,0 +1,72 @@
+"""
+Maintain the leave ledger: post monthly accruals, backfill consumption entries
+for leaves approved before the ledger existed, and rebuild balances.
+
+Example:
+    python manage.py leave_ledger --backfill
+    python manage.py leave_ledger --accrue 2026-01
+    python manage.py leave_ledger --rebuild
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.leave_ledger import accrue_month, consumption_entry, post_entries, rebuild_balances
+from hospital_hr.models import LeaveLedger, LeaveRequest
+
+
+class Command(BaseCommand):
+    help = 'Post leave accruals, backfill consumption entries and rebuild leave balances'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accrue', metavar='YYYY-MM',
+                            help='Credit one month of entitlement to all active employees (safe to re-run)')
+        parser.add_argument('--backfill', action='store_true',
+                            help='Post consumption entries for approved leaves that have none')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute LeaveBalance rows from the ledger')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if not (options['accrue'] or options['backfill'] or options['rebuild']):
+            raise CommandError('Nothing to do: pass --accrue, --backfill and/or --rebuild.')
+
+        if options['backfill']:
+            self._backfill(options['batch_size'])
+
+        if options['accrue']:
+            try:
+                month = date.fromisoformat(f"{options['accrue']}-01")
+            except ValueError:
+                raise CommandError('--accrue expects a month as YYYY-MM.')
+            entries = accrue_month(month.year, month.month)
+            self.stdout.write(f"Posted {len(entries)} accrual entries for {options['accrue']}.")
+
+        if options['rebuild']:
+            rows = rebuild_balances()
+            self.stdout.write(f'Rebuilt {rows} leave balances.')
+
+        self.stdout.write(self.style.SUCCESS('Leave ledger is up to date.'))
+
+    def _backfill(self, batch_size):
+        posted = set(LeaveLedger.objects.filter(
+            entry_type='consumption', leave_request__isnull=False
+        ).values_list('leave_request_id', flat=True))
+        leaves = LeaveRequest.objects.filter(status='approved').only(
+            'id', 'employee_id', 'leave_type', 'total_days', 'start_date', 'end_date', 'approved_by_id'
+        ).order_by('id')
+
+        batch, total = [], 0
+        for leave in leaves.iterator(chunk_size=batch_size):
+            if leave.id in posted:
+                continue
+            entry = consumption_entry(leave)
+            entry.created_by_id = leave.approved_by_id
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                total += len(post_entries(batch))
+                batch = []
+        if batch:
+            total += len(post_entries(batch))
+        self.stdout.write(f'Backfilled {total} consumption entries.')
@@ -0,0 +1,24 @@
+"""
+Delete old attendance change events used by the live attendance boards.
+
+Run daily (boards only replay the current day):
+    python manage.py prune_attendance_events
+    python manage.py prune_attendance_events --days 30
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.attendance_feed import prune_events
+
+
+class Command(BaseCommand):
+    help = 'Delete AttendanceEvent rows older than --days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Keep events from the last N days (default 7)')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1.')
+        deleted = prune_events(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} attendance events.'))
@@ -0,0 +1,55 @@
+"""
+Re-evaluate late / early leave / overtime / half day after a shift policy change.
+
+Example:
+    python manage.py recompute_attendance --start 2026-01-01 --end 2026-12-31
+    python manage.py recompute_attendance --start 2026-10-01 --shift night --department ICU
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hospital_hr.models import Department
+from hospital_hr.shift_compliance import recompute
+
+
+class Command(BaseCommand):
+    help = 'Recompute shift compliance fields and statuses for attendance in a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='First day (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day (YYYY-MM-DD, default today)')
+        parser.add_argument('--department', help='Department code')
+        parser.add_argument('--shift', action='append', help='Only this shift code (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        start = self._parse_date(options['start'], '--start')
+        end = self._parse_date(options['end'], '--end') if options['end'] else timezone.localdate()
+        if end < start:
+            raise CommandError('--end must not be before --start.')
+
+        department_id = None
+        if options['department']:
+            department_id = Department.objects.filter(code=options['department']).values_list('id', flat=True).first()
+            if department_id is None:
+                raise CommandError(f"Department {options['department']} does not exist.")
+
+        started = time.perf_counter()
+        evaluated, updated = recompute(
+            start, end, department_id=department_id, shifts=options['shift'], batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Evaluated {evaluated} attendance records, updated {updated} '
+            f'in {time.perf_counter() - started:.2f}s.'
+        ))
+
+    @staticmethod
+    def _parse_date(value, option):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'{option} expects a date as YYYY-MM-DD.')
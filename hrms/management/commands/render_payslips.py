@@ -0,0 +1,57 @@
+"""
+Render payslip documents for a payroll run and zip them per department.
+
+Safe to re-run after an interruption: existing documents are skipped.
+
+Example:
+    python manage.py render_payslips 2026-09
+    python manage.py render_payslips 2026-09 --workers 8 --format pdf
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.models import PayrollRun
+from hospital_hr.payslip_documents import FORMATS, render_run
+
+
+class Command(BaseCommand):
+    help = 'Render payslip documents for a month into MEDIA_ROOT using a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('month', metavar='YYYY-MM')
+        parser.add_argument('--format', choices=FORMATS, default='html')
+        parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Payslips per worker task')
+
+    def handle(self, *args, **options):
+        try:
+            month = date.fromisoformat(f"{options['month']}-01")
+        except ValueError:
+            raise CommandError('month expects YYYY-MM.')
+
+        # Prefer the finalized run, otherwise the current draft
+        run = PayrollRun.objects.filter(year=month.year, month=month.month).order_by('-status', '-created_at').first()
+        if run is None:
+            raise CommandError(f"No payroll run for {options['month']}; run run_payroll first.")
+
+        started = time.perf_counter()
+        try:
+            result = render_run(
+                run, fmt=options['format'], workers=options['workers'],
+                chunk_size=options['chunk_size'], progress=self._progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"{run}: {result['rendered']} rendered, {result['skipped']} already present, "
+            f"{len(result['archives'])} department archives written"
+        )
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.perf_counter() - started:.2f}s.'))
+
+    def _progress(self, done, total):
+        if total:
+            self.stdout.write(f'  {done}/{total} payslips ({done * 100 // total}%)')
@@ -0,0 +1,51 @@
+"""
+Compute a month's payroll into a draft PayrollRun, or finalize it.
+
+Example:
+    python manage.py run_payroll 2026-09
+    python manage.py run_payroll 2026-09 --finalize
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hospital_hr.models import PayrollRun
+from hospital_hr.payroll import finalize_run, run_payroll
+
+
+class Command(BaseCommand):
+    help = 'Compute payslips for every payable employee for a month (replaces the draft run)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('month', metavar='YYYY-MM')
+        parser.add_argument('--finalize', action='store_true',
+                            help='Finalize the existing draft run instead of recomputing it')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            month = date.fromisoformat(f"{options['month']}-01")
+        except ValueError:
+            raise CommandError('month expects YYYY-MM.')
+
+        try:
+            if options['finalize']:
+                run = PayrollRun.objects.filter(year=month.year, month=month.month, status='draft').first()
+                if run is None:
+                    raise CommandError(f"No draft payroll run for {options['month']}.")
+                finalize_run(run)
+                self.stdout.write(self.style.SUCCESS(f'{run} finalized.'))
+                return
+
+            started = time.perf_counter()
+            run = run_payroll(month.year, month.month, batch_size=options['batch_size'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f'{run.employee_count} payslips: gross {run.total_gross}, '
+            f'deductions {run.total_deductions}, net {run.total_net}'
+        )
+        self.stdout.write(self.style.SUCCESS(f'{run} computed in {time.perf_counter() - started:.2f}s.'))